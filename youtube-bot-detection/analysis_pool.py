@@ -0,0 +1,124 @@
+"""
+Analysis Pool - YouTube Bot Detection System
+Warm process pool that runs CPU-bound analyses off the API's event loop
+"""
+
+import os
+import io
+import sys
+import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+from bot_detection_engine import BotDetectionEngine
+from event_table import EventTable
+
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def _init_worker():
+    """Silence engine console output; imports above are already loaded in the worker"""
+    sys.stdout = open(os.devnull, 'w')
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _load_csv(channel_name, csv_bytes):
+    """Detector loaded with a CSV export (Date parsed when present)"""
+    df = pd.read_csv(io.BytesIO(csv_bytes))
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'])
+    
+    detector = BotDetectionEngine(channel_name)
+    detector.data = df
+    detector._identify_metrics()
+    return detector
+
+
+def full_analysis(channel_name, csv_bytes, spike_threshold=3.0, z_threshold=3.0):
+    """run_full_analysis of a CSV with custom thresholds"""
+    detector = _load_csv(channel_name, csv_bytes)
+    detector.spike_threshold = spike_threshold
+    detector.z_threshold = z_threshold
+    return detector.run_full_analysis()
+
+
+def threshold_sweep(channel_name, csv_bytes, **grid):
+    """sweep_thresholds of a CSV, plus its row count"""
+    detector = _load_csv(channel_name, csv_bytes)
+    return len(detector.data), detector.sweep_thresholds(**grid)
+
+
+def staged_counts(channel_name, csv_bytes):
+    """Spike and anomaly counts and the authenticity score, as streamed over the WebSocket"""
+    detector = _load_csv(channel_name, csv_bytes)
+    columns = detector.view_cols + detector.sub_cols
+    spikes = EventTable.concat([detector.detect_spikes(col) for col in columns], kind='spike')
+    anomalies = EventTable.concat([detector.detect_statistical_anomalies(col) for col in columns], kind='anomaly')
+    return len(spikes), len(anomalies), detector.generate_authenticity_score()
+
+
+class AnalysisPool:
+    """
+    Process pool for analysis functions, awaited from async handlers
+    start() spawns every worker up front so the first request doesn't pay for it;
+    a worker that dies (e.g. out of memory) fails only the calls in flight and
+    the pool is replaced for the next ones
+    """
+    
+    def __init__(self, workers=ANALYSIS_WORKERS):
+        self.workers = workers
+        self._executor = None
+    
+    def start(self, warm=True):
+        """Create the executor and (with `warm`) bring all workers up"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            if warm:
+                for future in [self._executor.submit(_warm_up) for _ in range(self.workers)]:
+                    future.result()
+        return self
+    
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) evaluated in a worker process"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        executor = self.start()._executor
+        try:
+            future = loop.run_in_executor(executor, call)
+        except BrokenProcessPool:
+            # Broken by an earlier call before this one ran, so it is safe to submit again
+            executor = self._restart(executor)
+            future = loop.run_in_executor(executor, call)
+        try:
+            return await future
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+    
+    def _restart(self, broken):
+        """Replace a broken executor once, however many calls saw it fail; workers spawn on demand"""
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.start(warm=False)
+        return self._executor
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+_default_pool = None
+
+
+def get_pool():
+    """Process-wide pool of ANALYSIS_WORKERS workers"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = AnalysisPool()
+    return _default_pool
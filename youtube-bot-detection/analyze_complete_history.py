@@ -7,24 +7,7 @@ Focus on October 2024 bot period for MMA GURU
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-
-def parse_number(value):
-    """Parse numbers with K/M suffixes"""
-    if pd.isna(value):
-        return 0
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    value_str = str(value).strip()
-    if value_str.endswith('K'):
-        return float(value_str[:-1]) * 1000
-    elif value_str.endswith('M'):
-        return float(value_str[:-1]) * 1000000
-    else:
-        try:
-            return float(value_str.replace(',', ''))
-        except:
-            return 0
+from export_cache import read_video_export
 
 def analyze_complete_channel(csv_path, channel_name):
     """Analyze COMPLETE channel history"""
@@ -33,14 +16,9 @@ def analyze_complete_channel(csv_path, channel_name):
     print(f"{'='*70}")
     
     # Load ALL data
-    df = pd.read_csv(csv_path)
+    df = read_video_export(csv_path)
     print(f"Total Videos: {len(df)}")
     
-    # Parse numeric columns
-    for col in ['VIEWS', 'YT LIKES', 'YT COMMENTS']:
-        if col in df.columns:
-            df[col] = df[col].apply(parse_number)
-    
     # Parse dates
     df['DATE'] = pd.to_datetime(df['DATE PUBLISHED'], dayfirst=True, errors='coerce')
     df = df[df['DATE'].notna()]
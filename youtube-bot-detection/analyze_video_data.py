@@ -10,6 +10,7 @@ from datetime import datetime
 from video_data_adapter import VideoDataAdapter, convert_video_data_for_analysis
 from bot_detection_engine import BotDetectionEngine
 from data_processor import ComparativeAnalyzer
+from export_cache import read_video_export
 
 def main():
     print("""
@@ -100,23 +101,7 @@ def main():
     print("="*60)
     
     # Load raw video data for detailed analysis
-    jesse_videos = pd.read_csv(jesse_csv)
-    jesse_videos['DATE PUBLISHED'] = pd.to_datetime(jesse_videos['DATE PUBLISHED'], format='%d/%m/%Y', errors='coerce')
-    jesse_videos['VIEWS'] = pd.to_numeric(jesse_videos['VIEWS'], errors='coerce')
-    
-    # Parse likes with K notation
-    def parse_likes(val):
-        if pd.isna(val):
-            return 0
-        val_str = str(val)
-        if 'K' in val_str:
-            return float(val_str.replace('K', '')) * 1000
-        try:
-            return float(val_str.replace(',', ''))
-        except:
-            return 0
-    
-    jesse_videos['YT LIKES'] = jesse_videos['YT LIKES'].apply(parse_likes)
+    jesse_videos = read_video_export(jesse_csv)
     
     # Find top performing videos
     top_videos = jesse_videos.nlargest(10, 'VIEWS')[['TITLE', 'DATE PUBLISHED', 'VIEWS', 'YT LIKES', 'ENGAGEMENT RATE']]
@@ -174,9 +159,7 @@ def main():
                 print(f"     Likely Bot Activity: YES")
     
     # Load MMA GURU videos
-    mma_videos = pd.read_csv(mma_csv)
-    mma_videos['DATE PUBLISHED'] = pd.to_datetime(mma_videos['DATE PUBLISHED'], format='%d/%m/%Y', errors='coerce')
-    mma_videos['VIEWS'] = pd.to_numeric(mma_videos['VIEWS'], errors='coerce')
+    mma_videos = read_video_export(mma_csv)
     
     # Check for October 2024 spike (MMA GURU)
     print("\n📅 OCTOBER 2024 ANALYSIS - THE MMA GURU")
@@ -3,19 +3,30 @@ FastAPI Endpoint for Real-time YouTube Bot Detection
 RESTful API for analyzing YouTube channels on-demand
 """
 
-from fastapi import FastAPI, HTTPException, File, UploadFile, BackgroundTasks
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Dict, Literal
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import io
 import json
 import asyncio
+import base64
+import contextlib
+import tempfile
+import time
+import zlib
 from bot_detection_engine import BotDetectionEngine
-from data_processor import DataProcessor, ComparativeAnalyzer
+from data_processor import ComparativeAnalyzer
+from event_table import EventTable
+from result_cache import ResultCache, result_key
+from analysis_pool import get_pool, full_analysis, threshold_sweep, staged_counts, ANALYSIS_WORKERS
+from job_store import get_job_store
+from stream_session import StreamingSession, MAX_BATCH_ROWS, MAX_PENDING_BATCHES
+from fleet_runner import channel_name_from_path
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -42,9 +53,14 @@ class ChannelAnalysisRequest(BaseModel):
 
 class QuickAnalysisRequest(BaseModel):
     channel_name: str
-    recent_views: List[int]
-    recent_subscribers: List[int]
-    dates: List[str]
+    recent_views: List[int] = []
+    recent_subscribers: List[int] = []
+    dates: List[str] = []
+    # Packed alternative to the lists: base64 of little-endian buffers
+    views_packed: Optional[str] = None  # int64 or float64 (see dtype)
+    subscribers_packed: Optional[str] = None  # int64 or float64 (see dtype)
+    dates_packed: Optional[str] = None  # int32 days since 1970-01-01
+    dtype: Literal['int64', 'float64'] = 'int64'
 
 class AnalysisResponse(BaseModel):
     channel: str
@@ -56,12 +72,238 @@ class AnalysisResponse(BaseModel):
     key_findings: List[str]
     timestamp: str
 
+class ThresholdSweepRequest(BaseModel):
+    channel_name: str
+    csv_data: str  # Base64 encoded CSV
+    spike_thresholds: List[float] = [5.0, 3.0, 2.0]
+    prominences: List[float] = [2.0]
+    z_thresholds: List[float] = [4.0, 3.0, 2.0]
+    drop_thresholds: List[float] = [0.7, 0.5, 0.3]
+
 class ComparativeAnalysisRequest(BaseModel):
     channels: List[ChannelAnalysisRequest]
     find_synchronized_events: bool = True
+    max_concurrency: Optional[int] = Field(None, ge=1, le=ANALYSIS_WORKERS)  # channels analyzed at once (default and cap: analysis pool size)
+
+# Results keyed by CSV content + parameters + engine version, shared by every endpoint
+result_cache = ResultCache(max_entries=256, max_bytes=64 * 1024 * 1024, ttl=3600)
+
+def decode_csv(csv_data):
+    """Raw CSV bytes of a base64 payload"""
+    return base64.b64decode(csv_data)
+
+# Largest (decompressed) CSV body accepted by /analyze; also caps gzip bombs
+MAX_CSV_BYTES = 1024 * 1024 * 1024
+GZIP_TYPES = ('application/gzip', 'application/x-gzip')
+
+async def upload_chunks(upload, size=1024 * 1024):
+    """Chunks of a multipart UploadFile (already spooled by Starlette)"""
+    while chunk := await upload.read(size):
+        yield chunk
+
+async def read_csv_stream(chunks, gzipped=False):
+    """
+    CSV bytes of a raw request body, gathered chunk by chunk into one buffer
+    and gunzipped on the fly, so the whole payload is held only once
+    """
+    csv_bytes = bytearray()
+    inflater = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16) if gzipped else None
+    async for chunk in chunks:
+        if inflater is not None:
+            chunk = inflater.decompress(chunk, MAX_CSV_BYTES + 1 - len(csv_bytes))
+        csv_bytes += chunk
+        if len(csv_bytes) > MAX_CSV_BYTES:
+            raise HTTPException(status_code=413, detail=f"CSV exceeds {MAX_CSV_BYTES} bytes")
+    if inflater is not None and not inflater.eof:
+        raise HTTPException(status_code=400, detail="Truncated gzip body")
+    return csv_bytes
+
+async def read_analysis_request(request, channel_name, spike_threshold, z_threshold):
+    """
+    (ChannelAnalysisRequest, csv_bytes) for an /analyze body, which is either
+    - JSON with base64 csv_data (the original API)
+    - a raw CSV (text/csv, gzip with Content-Encoding: gzip or application/gzip)
+    - multipart/form-data with a 'file' field and optional channel_name /
+      threshold fields
+    Settings of raw and multipart bodies come from the query string
+    """
+    content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    fields = {'channel_name': channel_name, 'spike_threshold': spike_threshold, 'z_threshold': z_threshold}
+    try:
+        if content_type in ('', 'application/json'):
+            params = ChannelAnalysisRequest(**await request.json())
+            return params, decode_csv(params.csv_data) if params.csv_data else None
+        
+        if content_type == 'multipart/form-data':
+            form = await request.form()
+            upload = form.get('file')
+            if not hasattr(upload, 'filename'):
+                raise HTTPException(status_code=400, detail="Multipart body needs a 'file' field")
+            fields.update({name: value for name, value in form.items() if name in fields and isinstance(value, str)})
+            fields['channel_name'] = fields['channel_name'] or channel_name_from_path(
+                (upload.filename or 'Unknown Channel').removesuffix('.gz'))
+            gzipped = (upload.filename or '').endswith('.gz') or upload.content_type in GZIP_TYPES
+            try:
+                csv_bytes = await read_csv_stream(upload_chunks(upload), gzipped)
+            finally:
+                await form.close()
+        else:
+            gzipped = request.headers.get('content-encoding', '').lower() == 'gzip' or content_type in GZIP_TYPES
+            csv_bytes = await read_csv_stream(request.stream(), gzipped)
+        
+        fields['channel_name'] = fields['channel_name'] or "Unknown Channel"
+        return ChannelAnalysisRequest(**fields), csv_bytes
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except (ValueError, TypeError, zlib.error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {e}")
+
+# Little-endian element types of packed /analyze/quick arrays
+PACKED_DTYPES = {'int64': '<i8', 'float64': '<f8'}
+EPOCH_DAY_DTYPE = '<i4'
+
+def unpack_array(data, dtype):
+    """Read-only numpy view of a little-endian buffer (raw bytes or base64 text), without copying"""
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    return np.frombuffer(data, dtype=dtype)
+
+def quick_frame(views, subscribers, dates):
+    """Date/Views/Subscribers frame for a quick analysis; dates are strings or epoch days"""
+    if not len(views) == len(subscribers) == len(dates):
+        raise ValueError("views, subscribers and dates must have the same length")
+    if isinstance(dates, np.ndarray) and dates.dtype.kind == 'i':
+        dates = dates.astype('datetime64[D]').astype('datetime64[ns]')
+    else:
+        dates = pd.to_datetime(dates)
+    return pd.DataFrame({
+        'Date': dates,
+        'Views': views,
+        'Subscribers': subscribers
+    })
+
+async def read_quick_request(request, channel_name, dtype):
+    """
+    (channel_name, frame) for an /analyze/quick body, which is either
+    - a QuickAnalysisRequest JSON object, with plain lists or packed base64 arrays
+    - an application/octet-stream body holding the views, subscribers and
+      epoch-day arrays back to back (n * 8 + n * 8 + n * 4 bytes)
+    """
+    content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    try:
+        if content_type == 'application/octet-stream':
+            body = await request.body()
+            value_dtype = np.dtype(PACKED_DTYPES[dtype])
+            n, remainder = divmod(len(body), 2 * value_dtype.itemsize + np.dtype(EPOCH_DAY_DTYPE).itemsize)
+            if remainder:
+                raise ValueError(f"Body length {len(body)} is not a whole number of data points")
+            values = np.frombuffer(body, dtype=value_dtype, count=2 * n)
+            dates = np.frombuffer(body, dtype=EPOCH_DAY_DTYPE, offset=2 * n * value_dtype.itemsize)
+            return channel_name, quick_frame(values[:n], values[n:2 * n], dates)
+        
+        params = QuickAnalysisRequest(**await request.json())
+        if params.views_packed is not None:
+            return params.channel_name, quick_frame(
+                unpack_array(params.views_packed, PACKED_DTYPES[params.dtype]),
+                unpack_array(params.subscribers_packed or '', PACKED_DTYPES[params.dtype]),
+                unpack_array(params.dates_packed or '', EPOCH_DAY_DTYPE)
+            )
+        return params.channel_name, quick_frame(params.recent_views, params.recent_subscribers, params.dates)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except (ValueError, TypeError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {e}")
+
+async def run_cached_analysis(channel_name, csv_bytes, spike_threshold=3.0, z_threshold=3.0):
+    """
+    run_full_analysis results for a CSV and thresholds, from the result cache
+    when the same bytes were analyzed with the same parameters before,
+    otherwise computed in the analysis process pool
+    """
+    spike_threshold, z_threshold = float(spike_threshold), float(z_threshold)
+    key = result_key('full', csv_bytes, channel=channel_name,
+                     spike_threshold=spike_threshold, z_threshold=z_threshold)
+    results = result_cache.get(key)
+    if results is None:
+        results = await get_pool().run(full_analysis, channel_name, csv_bytes, spike_threshold, z_threshold)
+        result_cache.put(key, results)
+    return results
+
+def detailed_summary(channel_name, results):
+    """JSON-ready summary of run_full_analysis results (upload and job responses)"""
+    cleaner = ComparativeAnalyzer()
+    return {
+        "channel": channel_name,
+        "rows_analyzed": results['data_points'],
+        "authenticity_score": results['authenticity']['score'],
+        "rating": results['authenticity']['rating'],
+        "total_spikes": len(results.get('spikes', [])),
+        "total_drops": len(results.get('drops', [])),
+        "total_anomalies": len(results.get('anomalies', [])),
+        "estimated_bot_cost": cleaner._clean_for_json(results['cost_estimate']),
+        "engagement_metrics": cleaner._clean_for_json(results.get('engagement', {})),
+        "key_findings": results['authenticity']['reasons']
+    }
+
+# CPU-bound analyses run in worker processes so the event loop stays responsive
+@app.on_event("startup")
+async def start_analysis_pool():
+    await asyncio.get_running_loop().run_in_executor(None, get_pool().start)
 
-# In-memory cache for results
-analysis_cache = {}
+@app.on_event("shutdown")
+async def stop_analysis_pool():
+    get_pool().shutdown()
+
+# Queued jobs are picked up by one dispatcher per pool worker
+job_workers = []
+job_wakeup = None
+
+async def job_worker():
+    """Run queued jobs one at a time until cancelled"""
+    store = get_job_store()
+    while True:
+        job_wakeup.clear()
+        job = store.claim()
+        if job is None:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(job_wakeup.wait(), timeout=5)
+            continue
+        try:
+            results = await run_cached_analysis(job['channel'], job['data'], **job['params'])
+            store.finish(job['id'], detailed_summary(job['channel'], results))
+        except asyncio.CancelledError:
+            raise  # still 'running' in the store; requeued on the next start
+        except Exception as e:
+            store.fail(job['id'], f"{type(e).__name__}: {e}")
+
+@app.on_event("startup")
+async def start_job_workers():
+    global job_wakeup
+    job_wakeup = asyncio.Event()
+    requeued = get_job_store().requeue_interrupted()
+    if requeued:
+        print(f"🔁 Requeued {requeued} interrupted jobs")
+    job_workers.extend(asyncio.create_task(job_worker()) for _ in range(get_pool().workers))
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    for task in job_workers:
+        task.cancel()
+    await asyncio.gather(*job_workers, return_exceptions=True)
+    job_workers.clear()
+
+def queue_job(channel_name, csv_bytes, spike_threshold=3.0, z_threshold=3.0):
+    """Store a job and wake a dispatcher; returns the submission response"""
+    job_id = get_job_store().submit('full', channel_name, csv_bytes,
+                                    spike_threshold=float(spike_threshold), z_threshold=float(z_threshold))
+    if job_wakeup is not None:
+        job_wakeup.set()
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "timestamp": datetime.now().isoformat()
+    }
 
 @app.get("/")
 async def root():
@@ -74,6 +316,11 @@ async def root():
             "/analyze/quick",
             "/analyze/compare",
             "/analyze/upload",
+            "/analyze/sweep",
+            "/analyze/batch",
+            "/analyze/cache/stats",
+            "/jobs",
+            "/jobs/upload",
             "/health",
             "/docs"
         ]
@@ -87,44 +334,41 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_channel(request: ChannelAnalysisRequest):
+@app.post("/analyze", response_model=AnalysisResponse, openapi_extra={
+    "requestBody": {"content": {
+        "application/json": {"schema": {"$ref": "#/components/schemas/ChannelAnalysisRequest"}},
+        "text/csv": {"schema": {"type": "string"}},
+        "application/gzip": {"schema": {"type": "string", "format": "binary"}},
+        "multipart/form-data": {"schema": {"type": "object", "properties": {
+            "file": {"type": "string", "format": "binary"}}}}
+    }}
+})
+async def analyze_channel(
+    request: Request,
+    channel_name: Optional[str] = None,
+    spike_threshold: float = 3.0,
+    z_threshold: float = 3.0
+):
     """
     Analyze a single YouTube channel for bot activity
+    The CSV can be sent base64-encoded in JSON, as a raw (optionally gzipped)
+    text/csv body or as a multipart file; the last two skip base64 entirely
     """
+    params, csv_bytes = await read_analysis_request(request, channel_name, spike_threshold, z_threshold)
     try:
-        # Check cache
-        cache_key = f"{request.channel_name}_{request.spike_threshold}_{request.z_threshold}"
-        if cache_key in analysis_cache:
-            cached = analysis_cache[cache_key]
-            if (datetime.now() - cached['timestamp']).seconds < 3600:  # 1 hour cache
-                return cached['response']
-        
-        # Initialize detector
-        detector = BotDetectionEngine(request.channel_name)
-        
-        # Load CSV data if provided
-        if request.csv_data:
-            import base64
-            csv_bytes = base64.b64decode(request.csv_data)
-            csv_str = csv_bytes.decode('utf-8')
-            df = pd.read_csv(io.StringIO(csv_str))
-            detector.data = df
-            detector._identify_metrics()
-        else:
+        if not csv_bytes:
             return JSONResponse(
                 status_code=400,
                 content={"error": "CSV data required for analysis"}
             )
         
-        # Run analysis with custom thresholds
-        detector.spike_threshold = request.spike_threshold
-        detector.z_threshold = request.z_threshold
-        results = detector.run_full_analysis()
+        # Run analysis with custom thresholds (cached per CSV content + thresholds)
+        results = await run_cached_analysis(params.channel_name, csv_bytes,
+                                            params.spike_threshold, params.z_threshold)
         
         # Prepare response
         response = AnalysisResponse(
-            channel=request.channel_name,
+            channel=params.channel_name,
             authenticity_score=results['authenticity']['score'],
             rating=results['authenticity']['rating'],
             total_spikes=len(results.get('spikes', [])),
@@ -138,43 +382,41 @@ async def analyze_channel(request: ChannelAnalysisRequest):
             timestamp=datetime.now().isoformat()
         )
         
-        # Cache result
-        analysis_cache[cache_key] = {
-            'response': response,
-            'timestamp': datetime.now()
-        }
-        
         return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/analyze/quick")
-async def quick_analysis(request: QuickAnalysisRequest):
+@app.post("/analyze/quick", openapi_extra={
+    "requestBody": {"content": {
+        "application/json": {"schema": QuickAnalysisRequest.model_json_schema()},
+        "application/octet-stream": {"schema": {"type": "string", "format": "binary"}}
+    }}
+})
+async def quick_analysis(
+    request: Request,
+    channel_name: str = "Unknown Channel",
+    dtype: Literal['int64', 'float64'] = 'int64'
+):
     """
     Perform quick bot detection on recent data points
+    Long series can be sent packed (base64 fields or an octet-stream body),
+    which is wrapped with np.frombuffer instead of validated element by element
     """
+    channel_name, df = await read_quick_request(request, channel_name, dtype)
     try:
-        # Create DataFrame from provided data
-        df = pd.DataFrame({
-            'Date': pd.to_datetime(request.dates),
-            'Views': request.recent_views,
-            'Subscribers': request.recent_subscribers
-        })
-        
         # Initialize detector
-        detector = BotDetectionEngine(request.channel_name)
+        detector = BotDetectionEngine(channel_name)
         detector.data = df
         detector._identify_metrics()
         
         # Quick analysis
-        spikes = []
-        for col in ['Views', 'Subscribers']:
-            spikes.extend(detector.detect_spikes(col))
-        
-        anomalies = []
-        for col in ['Views', 'Subscribers']:
-            anomalies.extend(detector.detect_statistical_anomalies(col))
+        spikes = EventTable.concat(
+            [detector.detect_spikes(col) for col in ['Views', 'Subscribers']], kind='spike'
+        )
+        anomalies = EventTable.concat(
+            [detector.detect_statistical_anomalies(col) for col in ['Views', 'Subscribers']], kind='anomaly'
+        )
         
         # Calculate quick authenticity score
         score = 100
@@ -186,7 +428,7 @@ async def quick_analysis(request: QuickAnalysisRequest):
         rating = "AUTHENTIC" if score >= 70 else "SUSPICIOUS" if score >= 40 else "LIKELY_BOTTED"
         
         return {
-            "channel": request.channel_name,
+            "channel": channel_name,
             "quick_score": score,
             "rating": rating,
             "spikes_detected": len(spikes),
@@ -201,7 +443,6 @@ async def quick_analysis(request: QuickAnalysisRequest):
 
 @app.post("/analyze/upload")
 async def analyze_uploaded_file(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     channel_name: str = "Unknown Channel",
     spike_threshold: float = 3.0
@@ -212,29 +453,14 @@ async def analyze_uploaded_file(
     try:
         # Read uploaded file
         contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
-        
-        # Initialize detector
-        detector = BotDetectionEngine(channel_name)
-        detector.data = df
-        detector._identify_metrics()
         
-        # Run analysis
-        results = detector.run_full_analysis()
+        # Run analysis (cached per file content + threshold)
+        results = await run_cached_analysis(channel_name, contents, spike_threshold)
         
         # Prepare detailed response
         return {
-            "channel": channel_name,
+            **detailed_summary(channel_name, results),
             "filename": file.filename,
-            "rows_analyzed": len(df),
-            "authenticity_score": results['authenticity']['score'],
-            "rating": results['authenticity']['rating'],
-            "total_spikes": len(results.get('spikes', [])),
-            "total_drops": len(results.get('drops', [])),
-            "total_anomalies": len(results.get('anomalies', [])),
-            "estimated_bot_cost": results['cost_estimate'],
-            "engagement_metrics": results.get('engagement', {}),
-            "key_findings": results['authenticity']['reasons'],
             "timestamp": datetime.now().isoformat()
         }
         
@@ -250,21 +476,18 @@ async def compare_channels(request: ComparativeAnalysisRequest):
         comparator = ComparativeAnalyzer()
         channel_results = {}
         
-        # Analyze each channel
-        for channel_req in request.channels:
-            detector = BotDetectionEngine(channel_req.channel_name)
-            
-            if channel_req.csv_data:
-                import base64
-                csv_bytes = base64.b64decode(channel_req.csv_data)
-                csv_str = csv_bytes.decode('utf-8')
-                df = pd.read_csv(io.StringIO(csv_str))
-                detector.data = df
-                detector._identify_metrics()
-                
-                results = detector.run_full_analysis()
-                channel_results[channel_req.channel_name] = results
-                comparator.add_channel(channel_req.channel_name, results)
+        # Analyze every channel in parallel across the pool, at most max_concurrency at a time
+        limit = asyncio.Semaphore(concurrency_limit(request.max_concurrency))
+        
+        async def analyze(channel_req):
+            async with limit:
+                return await run_cached_analysis(channel_req.channel_name, decode_csv(channel_req.csv_data),
+                                                 channel_req.spike_threshold, channel_req.z_threshold)
+        
+        requests = [channel_req for channel_req in request.channels if channel_req.csv_data]
+        for channel_req, results in zip(requests, await asyncio.gather(*map(analyze, requests))):
+            channel_results[channel_req.channel_name] = results
+            comparator.add_channel(channel_req.channel_name, results)
         
         # Comparative analysis
         comparison = comparator.generate_comparative_report()
@@ -281,6 +504,32 @@ async def compare_channels(request: ComparativeAnalysisRequest):
             "similar_bot_patterns": len(comparison['bot_signatures']['similar_patterns']),
             "timestamp": datetime.now().isoformat()
         }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze/sweep")
+async def sweep_thresholds(request: ThresholdSweepRequest):
+    """
+    Detection counts and authenticity scores for a grid of thresholds
+    Rolling statistics are computed once and shared by every grid point
+    """
+    try:
+        data_points, sweep = await get_pool().run(
+            threshold_sweep, request.channel_name, decode_csv(request.csv_data),
+            spike_thresholds=request.spike_thresholds,
+            prominences=request.prominences,
+            z_thresholds=request.z_thresholds,
+            drop_thresholds=request.drop_thresholds
+        )
+        
+        return {
+            "channel": request.channel_name,
+            "data_points": data_points,
+            "grid_size": len(sweep['spikes']) + len(sweep['anomalies']) + len(sweep['drops']),
+            **sweep,
+            "timestamp": datetime.now().isoformat()
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -290,9 +539,7 @@ async def clear_cache():
     """
     Clear the analysis cache
     """
-    global analysis_cache
-    cache_size = len(analysis_cache)
-    analysis_cache = {}
+    cache_size = result_cache.clear()
     
     return {
         "message": "Cache cleared successfully",
@@ -300,6 +547,188 @@ async def clear_cache():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/analyze/cache/stats")
+async def cache_stats():
+    """
+    Result cache size and hit/miss/eviction counters
+    """
+    return {
+        **result_cache.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+def concurrency_limit(requested):
+    """
+    Channels analyzed at once for one request: the client's max_concurrency,
+    never more than the pool has workers (each in-flight channel holds its CSV)
+    """
+    workers = get_pool().workers
+    return min(requested or workers, workers)
+
+# Channels waiting for a worker / finished lines waiting for the client, per batch request
+BATCH_QUEUE_SIZE = 16
+# Request bodies larger than this are spooled to disk before streaming starts
+BATCH_SPOOL_BYTES = 32 * 1024 * 1024
+
+async def ndjson_batch_items(spool, spike_threshold, z_threshold):
+    """Channel items from a spooled NDJSON body, one JSON object per line"""
+    for line in spool:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            yield {
+                'channel_name': item.get('channel_name', 'Unknown'),
+                'csv_data': item['csv_data'],
+                'spike_threshold': item.get('spike_threshold', spike_threshold),
+                'z_threshold': item.get('z_threshold', z_threshold)
+            }
+        except (ValueError, KeyError, AttributeError) as e:
+            yield {'channel_name': None, 'error': f"Invalid NDJSON line: {type(e).__name__}: {e}"}
+
+async def multipart_batch_items(form, spike_threshold, z_threshold):
+    """Channel items from every uploaded file of a multipart form"""
+    for _, value in form.multi_items():
+        if hasattr(value, 'filename'):
+            yield {
+                'channel_name': channel_name_from_path(value.filename or 'Unknown'),
+                'csv_bytes': await value.read(),
+                'spike_threshold': spike_threshold,
+                'z_threshold': z_threshold
+            }
+
+async def analyze_batch_item(index, item):
+    """One NDJSON result record for a batch item"""
+    start = time.perf_counter()
+    record = {"index": index, "channel": item['channel_name']}
+    try:
+        if 'error' in item:
+            raise ValueError(item['error'])
+        csv_bytes = item['csv_bytes'] if 'csv_bytes' in item else decode_csv(item['csv_data'])
+        results = await run_cached_analysis(item['channel_name'], csv_bytes,
+                                            item['spike_threshold'], item['z_threshold'])
+        record.update({"status": "ok", **detailed_summary(item['channel_name'], results)})
+    except Exception as e:
+        record.update({"status": "error", "error": str(e)})
+    record["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+async def stream_batch(items, workers, cleanup=None):
+    """
+    NDJSON lines for batch items in completion order
+    Items are pulled into a bounded queue as workers free up and finished lines
+    wait in a bounded queue for the client, so memory stays flat however many
+    channels the batch holds
+    """
+    inbox = asyncio.Queue(maxsize=BATCH_QUEUE_SIZE)
+    outbox = asyncio.Queue(maxsize=BATCH_QUEUE_SIZE)
+    
+    async def produce():
+        index = 0
+        async for item in items:
+            await inbox.put((index, item))
+            index += 1
+        for _ in range(workers):
+            await inbox.put(None)
+    
+    async def consume():
+        while (job := await inbox.get()) is not None:
+            await outbox.put(await analyze_batch_item(*job))
+        await outbox.put(None)
+    
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(consume()) for _ in range(workers)]
+    try:
+        finished = 0
+        while finished < workers:
+            record = await outbox.get()
+            if record is None:
+                finished += 1
+            else:
+                yield json.dumps(record) + "\n"
+        await tasks[0]
+    finally:
+        # Client gone or batch done: stop pulling items and release the spooled body
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if cleanup is not None:
+            await cleanup()
+
+@app.post("/analyze/batch")
+async def analyze_batch(
+    request: Request,
+    max_concurrency: Optional[int] = Query(None, ge=1, le=ANALYSIS_WORKERS),
+    spike_threshold: float = 3.0,
+    z_threshold: float = 3.0
+):
+    """
+    Analyze many channels from an NDJSON body (one ChannelAnalysisRequest per
+    line) or a multipart upload of CSV files; streams one NDJSON result line per
+    channel as each finishes
+    """
+    workers = concurrency_limit(max_concurrency)
+    
+    # The body is fully received (spooled to disk past BATCH_SPOOL_BYTES) before
+    # streaming, since the streaming response itself listens on the receive channel
+    if request.headers.get('content-type', '').startswith('multipart/form-data'):
+        form = await request.form(max_files=float('inf'), max_fields=float('inf'))
+        items = multipart_batch_items(form, spike_threshold, z_threshold)
+        cleanup = form.close
+    else:
+        spool = tempfile.SpooledTemporaryFile(max_size=BATCH_SPOOL_BYTES)
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        items = ndjson_batch_items(spool, spike_threshold, z_threshold)
+        
+        async def cleanup():
+            spool.close()
+    
+    return StreamingResponse(stream_batch(items, workers, cleanup), media_type="application/x-ndjson")
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: ChannelAnalysisRequest):
+    """
+    Queue a full analysis; poll GET /jobs/{job_id} for progress and the result
+    """
+    if not request.csv_data:
+        raise HTTPException(status_code=400, detail="CSV data required for analysis")
+    return queue_job(request.channel_name, decode_csv(request.csv_data),
+                     request.spike_threshold, request.z_threshold)
+
+@app.post("/jobs/upload", status_code=202)
+async def submit_upload_job(
+    file: UploadFile = File(...),
+    channel_name: str = "Unknown Channel",
+    spike_threshold: float = 3.0,
+    z_threshold: float = 3.0
+):
+    """
+    Queue a full analysis of an uploaded CSV file
+    """
+    return queue_job(channel_name, await file.read(), spike_threshold, z_threshold)
+
+@app.get("/jobs")
+async def list_jobs(status: Optional[str] = None, limit: int = 100):
+    """
+    Recent jobs (without results) and the number of jobs per status
+    """
+    store = get_job_store()
+    return {
+        "counts": store.counts(),
+        "jobs": store.list(status, limit)
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Job status and progress, with the result once it is done
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
 @app.get("/analyze/thresholds")
 async def get_threshold_recommendations():
     """
@@ -327,9 +756,110 @@ async def get_threshold_recommendations():
     }
 
 # WebSocket endpoint for real-time analysis
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 import json
 
+async def stream_analysis(websocket, channel_name, csv_bytes):
+    """
+    Run the staged analysis in the process pool, sending progress updates;
+    returns the result summary
+    """
+    await websocket.send_json({
+        "status": "analyzing",
+        "progress": 10,
+        "message": "Loading data..."
+    })
+    
+    total_spikes, total_anomalies, results = await get_pool().run(staged_counts, channel_name, csv_bytes)
+    
+    await websocket.send_json({
+        "status": "analyzing",
+        "progress": 40,
+        "message": f"Found {total_spikes} suspicious spikes"
+    })
+    
+    await websocket.send_json({
+        "status": "analyzing",
+        "progress": 70,
+        "message": f"Detected {total_anomalies} statistical anomalies"
+    })
+    
+    return {
+        "channel": channel_name,
+        "authenticity_score": results['score'],
+        "rating": results['rating'],
+        "total_spikes": total_spikes,
+        "total_anomalies": total_anomalies,
+        "key_findings": results['reasons'][:5]
+    }
+
+async def receive_message(websocket):
+    """Next JSON object from the socket; malformed frames get an error frame and are skipped"""
+    while True:
+        try:
+            message = json.loads(await websocket.receive_text())
+            if isinstance(message, dict):
+                return message
+            error = "expected a JSON object"
+        except ValueError as e:
+            error = str(e)
+        await websocket.send_json({"type": "error", "message": f"Invalid message: {error}"})
+
+async def stream_rows(websocket, first_message):
+    """
+    Streaming protocol (see stream_session): ingest row batches into an
+    incremental detector and answer each with its new events and score
+    Batches wait in a queue of MAX_PENDING_BATCHES; when it is full the server
+    stops reading the socket, so a fast client is slowed to the analysis rate
+    """
+    session = StreamingSession(first_message.get('channel_name', 'Unknown'))
+    pending = asyncio.Queue(maxsize=MAX_PENDING_BATCHES)
+    
+    async def process():
+        while True:
+            message = await pending.get()
+            if message is None:
+                return
+            try:
+                update = await asyncio.to_thread(session.ingest, message)
+            except Exception as e:
+                update = {"type": "error", "seq": message.get('seq'), "message": str(e)}
+            update["pending_batches"] = pending.qsize()
+            await websocket.send_json(update)
+    
+    processor = asyncio.create_task(process())
+    message = first_message
+    try:
+        while True:
+            kind = message.get('type')
+            if kind == 'rows':
+                if session.batch_size(message) > MAX_BATCH_ROWS:
+                    await websocket.send_json({"type": "error", "seq": message.get('seq'),
+                                               "message": f"Batch exceeds {MAX_BATCH_ROWS} rows"})
+                else:
+                    await pending.put(message)
+            elif kind == 'start':
+                await websocket.send_json({
+                    "type": "ready",
+                    "channel": session.channel_name,
+                    "max_batch_rows": MAX_BATCH_ROWS,
+                    "max_pending_batches": MAX_PENDING_BATCHES
+                })
+            elif kind == 'end':
+                break
+            else:
+                await websocket.send_json({"type": "error", "message": f"Unknown message type: {kind}"})
+            message = await receive_message(websocket)
+        
+        # Finish the buffered batches before the final summary
+        await pending.put(None)
+        await processor
+        await websocket.send_json({"type": "complete", **session.summary()})
+    finally:
+        # Disconnects and errors must not leave the processor (and its session) running
+        processor.cancel()
+        await asyncio.gather(processor, return_exceptions=True)
+
 @app.websocket("/ws/analyze")
 async def websocket_analyze(websocket: WebSocket):
     """
@@ -340,68 +870,30 @@ async def websocket_analyze(websocket: WebSocket):
     try:
         while True:
             # Receive data
-            data = await websocket.receive_text()
-            request = json.loads(data)
+            request = await receive_message(websocket)
+            
+            # Row-batch streaming; the connection closes after its 'end'
+            if request.get('type') in ('start', 'rows'):
+                await stream_rows(websocket, request)
+                break
             
             # Process analysis
             channel_name = request.get('channel_name', 'Unknown')
             csv_data = request.get('csv_data')
             
             if csv_data:
-                # Initialize detector
-                detector = BotDetectionEngine(channel_name)
+                csv_bytes = decode_csv(csv_data)
                 
-                # Decode CSV
-                import base64
-                csv_bytes = base64.b64decode(csv_data)
-                csv_str = csv_bytes.decode('utf-8')
-                df = pd.read_csv(io.StringIO(csv_str))
-                detector.data = df
-                detector._identify_metrics()
-                
-                # Stream analysis updates
-                await websocket.send_json({
-                    "status": "analyzing",
-                    "progress": 10,
-                    "message": "Loading data..."
-                })
-                
-                # Detect spikes
-                spikes = []
-                for col in detector.view_cols + detector.sub_cols:
-                    spikes.extend(detector.detect_spikes(col))
-                
-                await websocket.send_json({
-                    "status": "analyzing",
-                    "progress": 40,
-                    "message": f"Found {len(spikes)} suspicious spikes"
-                })
-                
-                # Detect anomalies
-                anomalies = []
-                for col in detector.view_cols + detector.sub_cols:
-                    anomalies.extend(detector.detect_statistical_anomalies(col))
-                
-                await websocket.send_json({
-                    "status": "analyzing",
-                    "progress": 70,
-                    "message": f"Detected {len(anomalies)} statistical anomalies"
-                })
-                
-                # Final analysis
-                results = detector.generate_authenticity_score()
+                # Same CSV streamed before: answer from the shared result cache
+                cache_key = result_key('stream', csv_bytes, channel=channel_name)
+                summary = result_cache.get(cache_key)
+                if summary is None:
+                    summary = result_cache.put(cache_key, await stream_analysis(websocket, channel_name, csv_bytes))
                 
                 await websocket.send_json({
                     "status": "complete",
                     "progress": 100,
-                    "results": {
-                        "channel": channel_name,
-                        "authenticity_score": results['score'],
-                        "rating": results['rating'],
-                        "total_spikes": len(spikes),
-                        "total_anomalies": len(anomalies),
-                        "key_findings": results['reasons'][:5]
-                    }
+                    "results": summary
                 })
             else:
                 await websocket.send_json({
@@ -409,13 +901,14 @@ async def websocket_analyze(websocket: WebSocket):
                     "message": "No CSV data provided"
                 })
                 
+    except WebSocketDisconnect:
+        return
     except Exception as e:
         await websocket.send_json({
             "status": "error",
             "message": str(e)
         })
-    finally:
-        await websocket.close()
+    await websocket.close()
 
 if __name__ == "__main__":
     import uvicorn
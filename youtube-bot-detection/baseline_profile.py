@@ -0,0 +1,230 @@
+"""
+Organic Baseline Profile - YouTube Bot Detection System
+Learns spike, variance, weekday and engagement distributions from trusted channels once and saves them as a compact .npz/JSON artifact
+
+Usage:
+    python baseline_profile.py jesse.csv bisping.csv chael.csv -o organic_profile.npz
+"""
+
+import os
+import sys
+import json
+import argparse
+import warnings
+from datetime import datetime
+import pandas as pd
+import numpy as np
+
+PROFILE_VERSION = 1
+
+# Percentile grid stored for the variance and engagement distributions
+PERCENTILES = np.arange(0, 101, 5)
+
+
+class BaselineProfile:
+    """
+    Learned organic patterns of a set of trusted baseline channels
+    Spikes and plateaus are kept per event (with the index of their channel) so
+    baseline pattern dicts can be rebuilt without the original CSVs
+    """
+    
+    ARRAYS = ['spike_amplitude', 'spike_build_days', 'spike_decay_days', 'spike_channel',
+              'plateau_cv', 'plateau_channel', 'variance_percentiles', 'weekday_profile',
+              'engagement_rate', 'engagement_percentiles']
+    
+    def __init__(self, channels, arrays, learned_at=None):
+        self.channels = list(channels)
+        self.learned_at = learned_at or datetime.now().isoformat()
+        for name in self.ARRAYS:
+            setattr(self, name, np.asarray(arrays[name]))
+    
+    @classmethod
+    def learn(cls, channels):
+        """
+        Learn a profile from {channel_name: daily DataFrame}
+        Frames need 'Views'; 'Date' and 'Likes' add the weekday and engagement parts
+        """
+        from multi_baseline_forensics import ForensicBotDetector
+        
+        detector = ForensicBotDetector()
+        names, spikes, spike_channel, plateaus, plateau_channel = [], [], [], [], []
+        variances, weekdays, engagement, daily_engagement = [], [], [], []
+        
+        for name, data in channels.items():
+            if data is None or 'Views' not in data.columns:
+                continue
+            index = len(names)
+            names.append(name)
+            
+            patterns = detector.molecular_pattern_analysis(data, name)
+            spikes.extend(patterns['spikes'])
+            spike_channel.extend([index] * len(patterns['spikes']))
+            plateaus.extend(p['coefficient_variation'] for p in patterns['plateaus'])
+            plateau_channel.extend([index] * len(patterns['plateaus']))
+            engagement.append(patterns.get('engagement_rate', np.nan))
+            
+            variances.append(data['Views'].pct_change().abs().dropna().to_numpy(dtype=float))
+            
+            if 'Date' in data.columns:
+                dates = pd.to_datetime(data['Date'], errors='coerce')
+                by_weekday = data['Views'].groupby(dates.dt.dayofweek).mean()
+                weekdays.append(by_weekday.reindex(range(7)).to_numpy(dtype=float) / data['Views'].mean())
+            
+            if 'Likes' in data.columns:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rates = (data['Likes'] / data['Views']).to_numpy(dtype=float) * 100
+                daily_engagement.append(rates[np.isfinite(rates)])
+        
+        variances = np.concatenate(variances) if variances else np.empty(0)
+        daily_engagement = np.concatenate(daily_engagement) if daily_engagement else np.empty(0)
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)  # weekdays no baseline has data on
+            weekday_profile = np.nanmean(weekdays, axis=0) if weekdays else np.full(7, np.nan)
+        
+        arrays = {
+            'spike_amplitude': np.array([s['amplitude'] for s in spikes], dtype=float),
+            'spike_build_days': np.array([s['build_days'] for s in spikes], dtype=np.int16),
+            'spike_decay_days': np.array([s['decay_days'] for s in spikes], dtype=np.int16),
+            'spike_channel': np.array(spike_channel, dtype=np.int16),
+            'plateau_cv': np.array(plateaus, dtype=float),
+            'plateau_channel': np.array(plateau_channel, dtype=np.int16),
+            'variance_percentiles': np.percentile(variances * 100, PERCENTILES) if len(variances) else np.empty(0),
+            'weekday_profile': weekday_profile,
+            'engagement_rate': np.array(engagement, dtype=float),
+            'engagement_percentiles': np.percentile(daily_engagement, PERCENTILES) if len(daily_engagement) else np.empty(0),
+        }
+        return cls(names, arrays)
+    
+    def _metadata(self):
+        return {'version': PROFILE_VERSION, 'channels': self.channels, 'learned_at': self.learned_at}
+    
+    def save(self, path):
+        """Save as compressed .npz (metadata stored as a JSON string), or as JSON for a .json path"""
+        if path.lower().endswith('.json'):
+            payload = self._metadata()
+            payload.update({name: getattr(self, name).tolist() for name in self.ARRAYS})
+            with open(path, 'w') as f:
+                json.dump(payload, f, indent=2)
+        else:
+            np.savez_compressed(path, metadata=np.array(json.dumps(self._metadata())),
+                                **{name: getattr(self, name) for name in self.ARRAYS})
+        return path
+    
+    @classmethod
+    def load(cls, path):
+        """Load a profile written by save()"""
+        if path.lower().endswith('.json'):
+            with open(path) as f:
+                payload = json.load(f)
+            metadata = payload
+            arrays = {name: np.array(payload[name], dtype=float) for name in cls.ARRAYS}
+        else:
+            with np.load(path, allow_pickle=False) as npz:
+                metadata = json.loads(str(npz['metadata']))
+                arrays = {name: npz[name] for name in cls.ARRAYS}
+        
+        if metadata.get('version') != PROFILE_VERSION:
+            raise ValueError(f"Unsupported baseline profile version: {metadata.get('version')}")
+        return cls(metadata['channels'], arrays, learned_at=metadata['learned_at'])
+    
+    def _grid_range(self, grid, low, high, default):
+        if not len(grid):
+            return default
+        return (float(np.interp(low, PERCENTILES, grid)), float(np.interp(high, PERCENTILES, grid)))
+    
+    def variance_range(self, low=15, high=85):
+        """Natural daily % change range across the baselines (15/30 when unknown)"""
+        return self._grid_range(self.variance_percentiles, low, high, (15, 30))
+    
+    def engagement_range(self, low=15, high=85):
+        """Daily likes/views % range across the baselines"""
+        return self._grid_range(self.engagement_percentiles, low, high, None)
+    
+    def spike_ranges(self, low=15, high=85):
+        """Percentile ranges of organic spike amplitude, build-up days and decay days"""
+        if not len(self.spike_amplitude):
+            return {}
+        return {
+            'amplitude': tuple(np.percentile(self.spike_amplitude, [low, high]).tolist()),
+            'build_days': tuple(np.percentile(self.spike_build_days, [low, high]).tolist()),
+            'decay_days': tuple(np.percentile(self.spike_decay_days, [low, high]).tolist()),
+        }
+    
+    def baseline_patterns(self):
+        """
+        Per-channel pattern dicts in the molecular_pattern_analysis shape,
+        ready for ForensicBotDetector.compare_to_baselines
+        """
+        patterns = {}
+        for index, name in enumerate(self.channels):
+            in_channel = self.spike_channel == index
+            channel_patterns = {
+                'channel': name,
+                'spikes': [
+                    {'amplitude': float(a), 'build_days': int(b), 'decay_days': int(d)}
+                    for a, b, d in zip(self.spike_amplitude[in_channel],
+                                       self.spike_build_days[in_channel],
+                                       self.spike_decay_days[in_channel])
+                ],
+                'plateaus': [{'coefficient_variation': float(cv)}
+                             for cv in self.plateau_cv[self.plateau_channel == index]],
+                'anomalies': [],
+                'similarity_scores': {}
+            }
+            if not np.isnan(self.engagement_rate[index]):
+                channel_patterns['engagement_rate'] = float(self.engagement_rate[index])
+                channel_patterns['engagement_organic'] = 2.5 <= channel_patterns['engagement_rate'] <= 4.5
+            patterns[name] = channel_patterns
+        return patterns
+    
+    def summary(self):
+        """Human-readable learned ranges"""
+        return {
+            'channels': self.channels,
+            'spikes': int(len(self.spike_amplitude)),
+            'plateaus': int(len(self.plateau_cv)),
+            'daily_variance': self.variance_range(),
+            'engagement_rate': self.engagement_range(),
+            'weekday_profile': [round(float(v), 3) for v in self.weekday_profile],
+            **self.spike_ranges()
+        }
+
+
+def load_baseline_export(path, channel_name):
+    """Daily stats for one baseline export (per-video exports are aggregated to days)"""
+    columns = pd.read_csv(path, nrows=0).columns
+    if 'DATE PUBLISHED' in columns:
+        from video_data_adapter import VideoDataAdapter
+        return VideoDataAdapter().load_video_csv(path, channel_name)
+    
+    from data_processor import DataProcessor
+    return DataProcessor().load_vidiq_export(path, channel_name)
+
+
+def main(argv=None):
+    from fleet_runner import channel_name_from_path
+    
+    parser = argparse.ArgumentParser(description="Learn an organic baseline profile from trusted vidIQ exports")
+    parser.add_argument('exports', nargs='+', help="CSV exports of the trusted baseline channels")
+    parser.add_argument('-o', '--output', default='organic_profile.npz', help="profile file (.npz or .json)")
+    args = parser.parse_args(argv)
+    
+    channels = {}
+    for path in args.exports:
+        if not os.path.exists(path):
+            parser.error(f"{path} not found")
+        name = channel_name_from_path(path)
+        channels[name] = load_baseline_export(path, name)
+    
+    profile = BaselineProfile.learn(channels)
+    profile.save(args.output)
+    
+    print(f"\n✅ Baseline profile saved to: {args.output}")
+    for key, value in profile.summary().items():
+        print(f"   • {key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,58 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from scipy import stats
-from scipy.signal import find_peaks
+from scipy.signal import find_peaks, peak_prominences
 import warnings
+from event_table import EventTable
+from export_cache import read_export
 warnings.filterwarnings('ignore')
 
+# Bump when detection output changes so cached API results are not reused
+ENGINE_VERSION = 1
+
+
+class AnalysisContext:
+    """
+    Shared intermediate results for one analysis pass over a channel's data
+    Rolling baselines, growth series and detector results are computed once per
+    (column, parameters) key and reused by every consumer of the pass
+    """
+    
+    def __init__(self, data):
+        self.data = data
+        self._cache = {}
+    
+    def get(self, key, compute):
+        """Return the cached value for key, computing it on first use"""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+    
+    def values(self, column):
+        """Column values with missing entries treated as zero"""
+        return self.get(('values', column), lambda: self.data[column].fillna(0))
+    
+    def rolling(self, column, stat, window=30):
+        """Trailing rolling statistic ('median', 'mean', 'std') of a column"""
+        return self.get(
+            ('rolling', column, stat, window),
+            lambda: getattr(self.values(column).rolling(window=window, min_periods=1), stat)()
+        )
+    
+    def pct_change(self, column):
+        """Daily growth rates with infinities masked out"""
+        return self.get(
+            ('pct_change', column),
+            lambda: self.values(column).pct_change().fillna(0).replace([np.inf, -np.inf], np.nan)
+        )
+    
+    def dates_array(self, positions):
+        """Date labels for row positions (the positions themselves without a Date column)"""
+        if 'Date' in self.data.columns:
+            return self.get(('dates',), lambda: self.data['Date'].to_numpy())[positions]
+        return np.asarray(positions, dtype=np.int64)
+
+
 class BotDetectionEngine:
     """
     Core engine for detecting bot activity in YouTube channel analytics
@@ -22,11 +70,24 @@ class BotDetectionEngine:
         self.anomalies = []
         self.bot_confidence_scores = {}
         self.manipulation_events = []
+        self._context = None
+        
+        # Detector defaults, used whenever a detector is called without explicit thresholds
+        self.spike_threshold = 3.0   # minimum spike ratio over the rolling median
+        self.prominence = 2.0        # minimum peak prominence of a spike ratio
+        self.z_threshold = 3         # rolling z-score for statistical anomalies
+        self.drop_threshold = 0.5    # day-over-day drop fraction for cliff drops
+    
+    def _get_context(self):
+        """Analysis context for the current data, rebuilt whenever data is replaced"""
+        if self._context is None or self._context.data is not self.data:
+            self._context = AnalysisContext(self.data)
+        return self._context
         
     def load_data(self, csv_path):
         """Load and preprocess YouTube analytics data"""
         try:
-            self.data = pd.read_csv(csv_path)
+            self.data = read_export(csv_path)
             print(f"✅ Loaded data for {self.channel_name}: {len(self.data)} rows")
             
             # Convert date column if exists
@@ -51,6 +112,7 @@ class BotDetectionEngine:
     
     def _identify_metrics(self):
         """Identify view and subscriber columns"""
+        self._context = None
         self.view_cols = []
         self.sub_cols = []
         
@@ -65,7 +127,7 @@ class BotDetectionEngine:
         print(f"📊 Found view columns: {self.view_cols}")
         print(f"📊 Found subscriber columns: {self.sub_cols}")
     
-    def detect_spikes(self, column, threshold_percentile=99.5, min_spike_ratio=3.0):
+    def detect_spikes(self, column, threshold_percentile=99.5, min_spike_ratio=None, prominence=None):
         """
         Detect suspicious spikes in data
         
@@ -73,43 +135,56 @@ class BotDetectionEngine:
         1. Calculate rolling baseline (30-day median)
         2. Find points exceeding threshold percentile
         3. Calculate spike ratio (value / baseline)
-        4. Flag spikes with ratio > min_spike_ratio
+        4. Flag spikes with ratio > min_spike_ratio (default: self.spike_threshold)
         """
         if column not in self.data.columns:
             return []
         
-        values = self.data[column].fillna(0)
-        
-        # Calculate rolling baseline with better handling
-        baseline = values.rolling(window=30, min_periods=1, center=False).median()
-        baseline = baseline.fillna(values.mean())  # Fill NaN with mean
-        baseline = baseline.replace(0, values.mean())  # Replace 0 baseline with mean
+        min_spike_ratio = self.spike_threshold if min_spike_ratio is None else min_spike_ratio
+        prominence = self.prominence if prominence is None else prominence
+        context = self._get_context()
+        return context.get(
+            ('spikes', column, threshold_percentile, min_spike_ratio, prominence),
+            lambda: self._detect_spikes(context, column, min_spike_ratio, prominence)
+        )
+    
+    def _spike_ratios(self, context, column):
+        """Value / rolling-median baseline for a column, shared by every spike threshold"""
+        def compute():
+            values = context.values(column)
+            
+            # Calculate rolling baseline with better handling
+            baseline = context.rolling(column, 'median')
+            baseline = baseline.fillna(values.mean())  # Fill NaN with mean
+            baseline = baseline.replace(0, values.mean())  # Replace 0 baseline with mean
+            
+            # Calculate spike ratios safely
+            return baseline, np.where(baseline > 0, values / baseline, 0)
         
-        # Calculate spike ratios safely
-        spike_ratios = np.where(baseline > 0, values / baseline, 0)
+        return context.get(('spike_ratios', column), compute)
+    
+    def _detect_spikes(self, context, column, min_spike_ratio, prominence):
+        """Spike detection over the shared rolling baseline"""
+        values = context.values(column)
+        baseline, spike_ratios = self._spike_ratios(context, column)
         
         # Find peaks
         peaks, properties = find_peaks(
             spike_ratios,
             height=min_spike_ratio,
-            prominence=2.0,
+            prominence=prominence,
             distance=7  # Minimum 7 days between spikes
         )
         
-        spikes = []
-        for idx in peaks:
-            if idx < len(self.data):
-                spike_info = {
-                    'date': self.data.iloc[idx]['Date'] if 'Date' in self.data.columns else idx,
-                    'value': values.iloc[idx],
-                    'baseline': baseline.iloc[idx],
-                    'spike_ratio': spike_ratios[idx],  # spike_ratios is a numpy array
-                    'metric': column,
-                    'severity': self._calculate_severity(spike_ratios[idx])
-                }
-                spikes.append(spike_info)
-        
-        return spikes
+        peaks = peaks[peaks < len(self.data)]
+        return EventTable.from_arrays(
+            'spike', column,
+            dates=context.dates_array(peaks),
+            values=values.to_numpy()[peaks],
+            baselines=baseline.to_numpy()[peaks],
+            ratios=spike_ratios[peaks],
+            severities=self._calculate_severities(spike_ratios[peaks])
+        )
     
     def _calculate_severity(self, spike_ratio):
         """Calculate severity score of spike (1-10)"""
@@ -126,7 +201,12 @@ class BotDetectionEngine:
         else:
             return 10
     
-    def detect_cliff_drops(self, column, drop_threshold=0.5):
+    def _calculate_severities(self, spike_ratios):
+        """Vectorized _calculate_severity over an array of spike ratios"""
+        levels = np.array([1, 3, 5, 7, 9, 10])
+        return levels[np.digitize(spike_ratios, [3, 5, 10, 50, 100])]
+    
+    def detect_cliff_drops(self, column, drop_threshold=None):
         """
         Detect suspicious cliff drops (sudden decreases after spikes)
         Indication of bot purges or expired bot contracts
@@ -134,25 +214,41 @@ class BotDetectionEngine:
         if column not in self.data.columns:
             return []
         
-        values = self.data[column].fillna(0)
-        drops = []
+        drop_threshold = self.drop_threshold if drop_threshold is None else drop_threshold
+        context = self._get_context()
+        return context.get(
+            ('drops', column, drop_threshold),
+            lambda: self._detect_cliff_drops(context, column, drop_threshold)
+        )
+    
+    def _drop_ratios(self, context, column):
+        """Day-over-day (before, after, drop ratio) arrays for a column"""
+        def compute():
+            values = context.values(column).to_numpy()
+            before = values[:-1]
+            after = values[1:]
+            
+            # Day-over-day drop ratio, only defined where the previous day was positive
+            with np.errstate(divide='ignore', invalid='ignore'):
+                drop_ratios = 1 - (after / before)
+            return before, after, drop_ratios
         
-        for i in range(1, len(values)):
-            if values.iloc[i-1] > 0:
-                drop_ratio = 1 - (values.iloc[i] / values.iloc[i-1])
-                
-                if drop_ratio > drop_threshold:
-                    drop_info = {
-                        'date': self.data.iloc[i]['Date'] if 'Date' in self.data.columns else i,
-                        'before_value': values.iloc[i-1],
-                        'after_value': values.iloc[i],
-                        'drop_percentage': drop_ratio * 100,
-                        'metric': column,
-                        'bot_purge_probability': min(drop_ratio * 100, 95)
-                    }
-                    drops.append(drop_info)
-        
-        return drops
+        return context.get(('drop_ratios', column), compute)
+    
+    def _detect_cliff_drops(self, context, column, drop_threshold):
+        """Cliff drop detection over the shared column values"""
+        before, after, drop_ratios = self._drop_ratios(context, column)
+        flagged = np.flatnonzero((before > 0) & (drop_ratios > drop_threshold))
+        drop_percentages = drop_ratios[flagged] * 100
+        
+        return EventTable.from_arrays(
+            'drop', column,
+            dates=context.dates_array(flagged + 1),
+            values=after[flagged],
+            baselines=before[flagged],
+            ratios=drop_percentages,
+            severities=np.minimum(drop_percentages, 95)
+        )
     
     def calculate_engagement_metrics(self):
         """
@@ -160,6 +256,13 @@ class BotDetectionEngine:
         Organic engagement rates: 0.5-2% view-to-sub conversion
         Bot engagement: >5% or <0.1%
         """
+        return self._get_context().get(
+            ('engagement', tuple(self.view_cols), tuple(self.sub_cols)),
+            self._calculate_engagement_metrics
+        )
+    
+    def _calculate_engagement_metrics(self):
+        """View-to-subscriber conversion metrics for the current data"""
         metrics = {}
         
         # Find total views and subscribers
@@ -167,32 +270,40 @@ class BotDetectionEngine:
             total_views = self.data[self.view_cols[0]].sum()
             total_subs = self.data[self.sub_cols[0]].max() if self.sub_cols else 0
             
-            if total_views > 0:
-                conversion_rate = (total_subs / total_views) * 100
+            metrics = self._conversion_metrics(total_views, total_subs)
                 
-                # Determine authenticity
-                if 0.5 <= conversion_rate <= 2.0:
-                    authenticity = "ORGANIC"
-                    confidence = 85
-                elif conversion_rate > 5.0:
-                    authenticity = "BOT_INFLATION"
-                    confidence = 90
-                elif conversion_rate < 0.1:
-                    authenticity = "VIEW_BOTTING"
-                    confidence = 80
-                else:
-                    authenticity = "SUSPICIOUS"
-                    confidence = 60
+        return metrics
                 
-                metrics['conversion_rate'] = conversion_rate
-                metrics['authenticity'] = authenticity
-                metrics['confidence'] = confidence
-                metrics['total_views'] = total_views
-                metrics['total_subs'] = total_subs
+    def _conversion_metrics(self, total_views, total_subs):
+        """Classify a channel's view-to-subscriber conversion rate"""
+        metrics = {}
+        
+        if total_views > 0:
+            conversion_rate = (total_subs / total_views) * 100
+            
+            # Determine authenticity
+            if 0.5 <= conversion_rate <= 2.0:
+                authenticity = "ORGANIC"
+                confidence = 85
+            elif conversion_rate > 5.0:
+                authenticity = "BOT_INFLATION"
+                confidence = 90
+            elif conversion_rate < 0.1:
+                authenticity = "VIEW_BOTTING"
+                confidence = 80
+            else:
+                authenticity = "SUSPICIOUS"
+                confidence = 60
+            
+            metrics['conversion_rate'] = conversion_rate
+            metrics['authenticity'] = authenticity
+            metrics['confidence'] = confidence
+            metrics['total_views'] = total_views
+            metrics['total_subs'] = total_subs
         
         return metrics
     
-    def detect_statistical_anomalies(self, column, z_threshold=3):
+    def detect_statistical_anomalies(self, column, z_threshold=None):
         """
         Statistical anomaly detection using Z-score
         Flags data points > 3 standard deviations from mean
@@ -200,32 +311,44 @@ class BotDetectionEngine:
         if column not in self.data.columns:
             return []
         
-        values = self.data[column].fillna(0)
-        
-        # Calculate rolling statistics
-        rolling_mean = values.rolling(window=30, min_periods=1).mean()
-        rolling_std = values.rolling(window=30, min_periods=1).std()
-        
-        # Calculate z-scores
-        z_scores = np.abs((values - rolling_mean) / (rolling_std + 1))
+        z_threshold = self.z_threshold if z_threshold is None else z_threshold
+        context = self._get_context()
+        return context.get(
+            ('anomalies', column, z_threshold),
+            lambda: self._detect_statistical_anomalies(context, column, z_threshold)
+        )
+    
+    def _detect_statistical_anomalies(self, context, column, z_threshold):
+        """Z-score anomaly detection over the shared rolling statistics"""
+        values = context.values(column)
+        rolling_mean = context.rolling(column, 'mean')
+        z_scores = self._z_scores(context, column)
         
         # Find anomalies
-        anomalies = []
         anomaly_indices = np.where(z_scores > z_threshold)[0]
         
-        for idx in anomaly_indices:
-            if idx < len(self.data):
-                anomaly_info = {
-                    'date': self.data.iloc[idx]['Date'] if 'Date' in self.data.columns else idx,
-                    'value': values.iloc[idx],
-                    'expected_value': rolling_mean.iloc[idx],
-                    'z_score': z_scores.iloc[idx],
-                    'metric': column,
-                    'confidence': min(95, 50 + (z_scores.iloc[idx] * 5))
-                }
-                anomalies.append(anomaly_info)
+        return EventTable.from_arrays(
+            'anomaly', column,
+            dates=context.dates_array(anomaly_indices),
+            values=values.to_numpy()[anomaly_indices],
+            baselines=rolling_mean.to_numpy()[anomaly_indices],
+            ratios=z_scores[anomaly_indices],
+            severities=np.minimum(95, 50 + (z_scores[anomaly_indices] * 5))
+        )
+    
+    def _z_scores(self, context, column):
+        """Rolling z-score of every row, shared by every anomaly threshold"""
+        def compute():
+            values = context.values(column)
+            
+            # Calculate rolling statistics
+            rolling_mean = context.rolling(column, 'mean')
+            rolling_std = context.rolling(column, 'std')
+            
+            # Calculate z-scores
+            return np.abs((values - rolling_mean) / (rolling_std + 1)).to_numpy()
         
-        return anomalies
+        return context.get(('z_scores', column), compute)
     
     def analyze_growth_patterns(self):
         """
@@ -233,17 +356,20 @@ class BotDetectionEngine:
         Organic growth: gradual, consistent
         Bot growth: sudden spikes, irregular patterns
         """
+        return self._get_context().get(
+            ('growth_patterns', tuple(self.view_cols + self.sub_cols)),
+            self._analyze_growth_patterns
+        )
+    
+    def _analyze_growth_patterns(self):
+        """Per-column growth statistics over the shared pct_change series"""
+        context = self._get_context()
         patterns = {}
         
         for col in self.view_cols + self.sub_cols:
             if col in self.data.columns:
-                values = self.data[col].fillna(0)
-                
-                # Calculate daily growth rates
-                growth_rates = values.pct_change().fillna(0)
-                
-                # Statistics (handle infinities)
-                growth_rates = growth_rates.replace([np.inf, -np.inf], np.nan)
+                # Daily growth rates (infinities already masked)
+                growth_rates = context.pct_change(col)
                 mean_growth = growth_rates.mean()
                 std_growth = growth_rates.std()
                 max_growth = growth_rates.max() if not growth_rates.isna().all() else 0
@@ -252,63 +378,81 @@ class BotDetectionEngine:
                 suspicious_days = (growth_rates > 1.0).sum()
                 impossible_days = (growth_rates > 10.0).sum()  # >1000% growth
                 
-                pattern_score = 100
-                if suspicious_days > 5:
-                    pattern_score -= suspicious_days * 5
-                if impossible_days > 0:
-                    pattern_score -= impossible_days * 20
-                
-                patterns[col] = {
-                    'mean_daily_growth': mean_growth * 100,
-                    'std_daily_growth': std_growth * 100,
-                    'max_daily_growth': max_growth * 100,
-                    'suspicious_growth_days': suspicious_days,
-                    'impossible_growth_days': impossible_days,
-                    'authenticity_score': max(0, pattern_score)
-                }
+                patterns[col] = self._growth_pattern(
+                    mean_growth, std_growth, max_growth, suspicious_days, impossible_days
+                )
         
         return patterns
     
+    def _growth_pattern(self, mean_growth, std_growth, max_growth, suspicious_days, impossible_days):
+        """Score one column's growth statistics"""
+        pattern_score = 100
+        if suspicious_days > 5:
+            pattern_score -= suspicious_days * 5
+        if impossible_days > 0:
+            pattern_score -= impossible_days * 20
+        
+        return {
+            'mean_daily_growth': mean_growth * 100,
+            'std_daily_growth': std_growth * 100,
+            'max_daily_growth': max_growth * 100,
+            'suspicious_growth_days': suspicious_days,
+            'impossible_growth_days': impossible_days,
+            'authenticity_score': max(0, pattern_score)
+        }
+    
     def detect_time_patterns(self):
         """
         Detect unnatural time patterns
         Bots often operate in specific time windows
         """
+        return self._get_context().get(
+            ('time_patterns', tuple(self.view_cols + self.sub_cols)),
+            self._detect_time_patterns
+        )
+    
+    def _detect_time_patterns(self):
+        """Weekend vs weekday ratios for every metric column"""
         time_patterns = {}
         
         if 'Date' in self.data.columns:
             self.data['DayOfWeek'] = self.data['Date'].dt.dayofweek
             self.data['Month'] = self.data['Date'].dt.month
             
+            # Check for weekend vs weekday patterns
+            weekend_mask = self.data['DayOfWeek'].isin([5, 6])
+            
             for col in self.view_cols + self.sub_cols:
                 if col in self.data.columns:
-                    # Check for weekend vs weekday patterns
-                    weekend_mask = self.data['DayOfWeek'].isin([5, 6])
                     weekend_avg = self.data[weekend_mask][col].mean()
                     weekday_avg = self.data[~weekend_mask][col].mean()
                     
-                    if weekday_avg > 0:
-                        weekend_ratio = weekend_avg / weekday_avg
-                    else:
-                        weekend_ratio = 0
-                    
-                    # Natural pattern: similar or slightly lower on weekends
-                    if 0.7 <= weekend_ratio <= 1.3:
-                        pattern_type = "NATURAL"
-                    elif weekend_ratio < 0.3 or weekend_ratio > 3:
-                        pattern_type = "BOT_PATTERN"
-                    else:
-                        pattern_type = "SUSPICIOUS"
-                    
-                    time_patterns[col] = {
-                        'weekend_ratio': weekend_ratio,
-                        'pattern_type': pattern_type,
-                        'weekend_avg': weekend_avg,
-                        'weekday_avg': weekday_avg
-                    }
+                    time_patterns[col] = self._weekend_pattern(weekend_avg, weekday_avg)
         
         return time_patterns
     
+    def _weekend_pattern(self, weekend_avg, weekday_avg):
+        """Classify a column's weekend-to-weekday activity ratio"""
+        if weekday_avg > 0:
+            weekend_ratio = weekend_avg / weekday_avg
+        else:
+            weekend_ratio = 0
+        
+        # Natural pattern: similar or slightly lower on weekends
+        if 0.7 <= weekend_ratio <= 1.3:
+            pattern_type = "NATURAL"
+        elif weekend_ratio < 0.3 or weekend_ratio > 3:
+            pattern_type = "BOT_PATTERN"
+        else:
+            pattern_type = "SUSPICIOUS"
+        
+        return {
+            'weekend_ratio': weekend_ratio,
+            'pattern_type': pattern_type,
+            'weekend_avg': weekend_avg,
+            'weekday_avg': weekday_avg
+        }
+    
     def calculate_manipulation_cost(self, views_botted, subs_botted):
         """
         Estimate cost of bot manipulation
@@ -345,19 +489,30 @@ class BotDetectionEngine:
         100 = Completely authentic
         0 = Heavily botted
         """
+        spike_counts = {col: len(self.detect_spikes(col)) for col in self.view_cols + self.sub_cols}
+        return self._score_components(
+            spike_counts,
+            self.calculate_engagement_metrics(),
+            self.analyze_growth_patterns(),
+            self.detect_time_patterns()
+        )
+    
+    def _score_components(self, spike_counts, engagement, patterns, time_patterns):
+        """
+        Combine per-column spike counts, engagement, growth and time patterns
+        into the 0-100 authenticity score
+        """
         score = 100
         reasons = []
         
         # Check for spikes
-        for col in self.view_cols + self.sub_cols:
-            spikes = self.detect_spikes(col)
-            if spikes:
-                spike_penalty = min(len(spikes) * 5, 30)
+        for col, spike_count in spike_counts.items():
+            if spike_count:
+                spike_penalty = min(spike_count * 5, 30)
                 score -= spike_penalty
-                reasons.append(f"Found {len(spikes)} suspicious spikes in {col} (-{spike_penalty} points)")
+                reasons.append(f"Found {spike_count} suspicious spikes in {col} (-{spike_penalty} points)")
         
         # Check engagement metrics
-        engagement = self.calculate_engagement_metrics()
         if engagement:
             if engagement['authenticity'] == "BOT_INFLATION":
                 score -= 25
@@ -367,7 +522,6 @@ class BotDetectionEngine:
                 reasons.append(f"View botting pattern detected (-20 points)")
         
         # Check growth patterns
-        patterns = self.analyze_growth_patterns()
         for metric, pattern in patterns.items():
             if pattern['authenticity_score'] < 50:
                 penalty = (100 - pattern['authenticity_score']) / 4
@@ -375,7 +529,6 @@ class BotDetectionEngine:
                 reasons.append(f"Unnatural growth in {metric} (-{penalty:.1f} points)")
         
         # Check time patterns
-        time_patterns = self.detect_time_patterns()
         bot_patterns = sum(1 for p in time_patterns.values() if p['pattern_type'] == "BOT_PATTERN")
         if bot_patterns > 0:
             penalty = bot_patterns * 10
@@ -388,6 +541,89 @@ class BotDetectionEngine:
             'reasons': reasons
         }
     
+    def sweep_thresholds(self, spike_thresholds=(2.0, 3.0, 5.0), prominences=(2.0,),
+                         z_thresholds=(2.0, 3.0, 4.0), drop_thresholds=(0.3, 0.5, 0.7)):
+        """
+        Detection counts and authenticity scores over a grid of thresholds
+        
+        Spike ratios, z-scores and drop ratios are computed once per column.
+        Each spike height needs one peak search (prominence is filtered after
+        the height and 7-day distance rules, so every prominence value reuses
+        it); z-score and drop thresholds are sorted-array lookups.
+        """
+        context = self._get_context()
+        metric_cols = self.view_cols + self.sub_cols
+        present_cols = [col for col in metric_cols if col in self.data.columns]
+        prominences = np.asarray(prominences, dtype=float)
+        
+        # Spike counts for every (height, prominence) pair
+        spike_counts = {
+            (height, prominence): {col: 0 for col in metric_cols}
+            for height in spike_thresholds for prominence in prominences.tolist()
+        }
+        for col in present_cols:
+            _, spike_ratios = self._spike_ratios(context, col)
+            for height in spike_thresholds:
+                peaks, _ = find_peaks(spike_ratios, height=height, distance=7)
+                peak_prominence = np.sort(peak_prominences(spike_ratios, peaks)[0])
+                counts = len(peak_prominence) - np.searchsorted(peak_prominence, prominences, side='left')
+                for prominence, count in zip(prominences.tolist(), counts.tolist()):
+                    spike_counts[(height, prominence)][col] = count
+        
+        # Scores only depend on spike counts; the other components are shared
+        engagement = self.calculate_engagement_metrics()
+        patterns = self.analyze_growth_patterns()
+        time_patterns = self.detect_time_patterns()
+        spike_grid = []
+        for (height, prominence), counts in spike_counts.items():
+            authenticity = self._score_components(counts, engagement, patterns, time_patterns)
+            spike_grid.append({
+                'min_spike_ratio': height,
+                'prominence': prominence,
+                'total_spikes': sum(counts.values()),
+                'spikes_by_metric': counts,
+                'score': authenticity['score'],
+                'rating': authenticity['rating']
+            })
+        
+        # Anomaly and drop counts: events strictly above each threshold
+        z_sorted = {}
+        drops_sorted = {}
+        for col in present_cols:
+            z_scores = self._z_scores(context, col)
+            z_sorted[col] = np.sort(z_scores[~np.isnan(z_scores)])
+            before, _, drop_ratios = self._drop_ratios(context, col)
+            drops_sorted[col] = np.sort(drop_ratios[before > 0])
+        
+        def count_above(sorted_values, thresholds):
+            return {
+                col: (len(values) - np.searchsorted(values, thresholds, side='right')).tolist()
+                for col, values in sorted_values.items()
+            }
+        
+        anomaly_counts = count_above(z_sorted, np.asarray(z_thresholds, dtype=float))
+        drop_counts = count_above(drops_sorted, np.asarray(drop_thresholds, dtype=float))
+        
+        return {
+            'spikes': spike_grid,
+            'anomalies': [
+                {
+                    'z_threshold': threshold,
+                    'total_anomalies': sum(counts[i] for counts in anomaly_counts.values()),
+                    'anomalies_by_metric': {col: counts[i] for col, counts in anomaly_counts.items()}
+                }
+                for i, threshold in enumerate(z_thresholds)
+            ],
+            'drops': [
+                {
+                    'drop_threshold': threshold,
+                    'total_drops': sum(counts[i] for counts in drop_counts.values()),
+                    'drops_by_metric': {col: counts[i] for col, counts in drop_counts.items()}
+                }
+                for i, threshold in enumerate(drop_thresholds)
+            ]
+        }
+    
     def _get_rating(self, score):
         """Convert score to rating"""
         if score >= 90:
@@ -437,6 +673,9 @@ class BotDetectionEngine:
         """
         Run complete bot detection analysis
         """
+        # Fresh context so every stage below shares one set of intermediates
+        self._context = None
+        
         print(f"\n🔍 RUNNING BOT DETECTION ANALYSIS FOR: {self.channel_name}")
         print("=" * 60)
         
@@ -448,27 +687,28 @@ class BotDetectionEngine:
         
         # 1. Spike Detection
         print("\n📈 SPIKE DETECTION:")
-        all_spikes = []
+        spike_tables = []
         for col in self.view_cols + self.sub_cols:
             spikes = self.detect_spikes(col)
-            all_spikes.extend(spikes)
+            spike_tables.append(spikes)
             if spikes:
                 print(f"  ⚠️ {col}: {len(spikes)} suspicious spikes detected")
                 for spike in spikes[:3]:  # Show top 3
                     print(f"    - {spike['date']}: {spike['value']:,.0f} (ratio: {spike['spike_ratio']:.1f}x)")
+        all_spikes = EventTable.concat(spike_tables, kind='spike')
         results['spikes'] = all_spikes
         
         # 2. Cliff Drop Detection
         print("\n📉 CLIFF DROP DETECTION:")
-        all_drops = []
+        drop_tables = []
         for col in self.view_cols + self.sub_cols:
             drops = self.detect_cliff_drops(col)
-            all_drops.extend(drops)
+            drop_tables.append(drops)
             if drops:
                 print(f"  ⚠️ {col}: {len(drops)} cliff drops detected")
                 for drop in drops[:3]:
                     print(f"    - {drop['date']}: -{drop['drop_percentage']:.1f}% drop")
-        results['drops'] = all_drops
+        results['drops'] = EventTable.concat(drop_tables, kind='drop')
         
         # 3. Engagement Metrics
         print("\n💰 ENGAGEMENT ANALYSIS:")
@@ -500,27 +740,21 @@ class BotDetectionEngine:
         
         # 6. Statistical Anomalies
         print("\n🔬 STATISTICAL ANOMALIES:")
-        all_anomalies = []
+        anomaly_tables = []
         for col in self.view_cols + self.sub_cols:
             anomalies = self.detect_statistical_anomalies(col)
-            all_anomalies.extend(anomalies)
+            anomaly_tables.append(anomalies)
             if anomalies:
                 print(f"  ⚠️ {col}: {len(anomalies)} statistical anomalies")
-        results['anomalies'] = all_anomalies
+        results['anomalies'] = EventTable.concat(anomaly_tables, kind='anomaly')
         
         # 7. Cost Estimation
         print("\n💸 BOT MANIPULATION COST ESTIMATE:")
-        # Estimate botted metrics based on spikes
-        est_botted_views = sum(
-            max(0, s['value'] - s.get('baseline', 0)) 
-            for s in all_spikes 
-            if 'view' in s['metric'].lower() and not pd.isna(s.get('baseline'))
-        )
-        est_botted_subs = sum(
-            max(0, s['value'] - s.get('baseline', 0)) 
-            for s in all_spikes 
-            if 'sub' in s['metric'].lower() and not pd.isna(s.get('baseline'))
-        )
+        # Estimate botted metrics based on spikes (excess over baseline)
+        excess = np.maximum(0, all_spikes.values.astype(float) - all_spikes.baselines.astype(float))
+        has_baseline = ~pd.isna(all_spikes.baselines)
+        est_botted_views = sum(excess[has_baseline & all_spikes.metric_mask(lambda m: 'view' in m.lower())].tolist())
+        est_botted_subs = sum(excess[has_baseline & all_spikes.metric_mask(lambda m: 'sub' in m.lower())].tolist())
         
         cost = self.calculate_manipulation_cost(est_botted_views, est_botted_subs)
         print(f"  Estimated Botted Views: {cost['views_botted']:,.0f}")
@@ -8,6 +8,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from scipy import stats
 from scipy.signal import find_peaks
+from baseline_profile import BaselineProfile
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -21,6 +22,7 @@ class OrganicBaselineBotDetector:
         self.is_baseline = channel_name == "Jesse ON FIRE"
         self.data = None
         self.organic_baseline = None
+        self.baseline_profile = None
         self.anomalies = []
         
     def establish_organic_baseline(self, jesse_data):
@@ -30,6 +32,25 @@ class OrganicBaselineBotDetector:
         print("🎯 ESTABLISHING ORGANIC BASELINE FROM JESSE ON FIRE")
         print("   (Confirmed bot-free by owner testimony)")
         
+        self._default_organic_baseline()
+        
+        # Learn from Jesse's actual patterns
+        if jesse_data is not None:
+            self._learn_organic_patterns(jesse_data)
+    
+    def load_organic_baseline(self, profile):
+        """
+        Establish the organic baseline from a saved BaselineProfile (or its path)
+        instead of re-reading the baseline channel's data
+        """
+        if isinstance(profile, str):
+            profile = BaselineProfile.load(profile)
+        
+        print(f"🎯 LOADING ORGANIC BASELINE PROFILE ({', '.join(profile.channels)})")
+        self._default_organic_baseline()
+        self._apply_baseline_profile(profile)
+    
+    def _default_organic_baseline(self):
         self.organic_baseline = {
             'viral_spike_duration': (2, 7),  # Days for organic viral growth
             'viral_spike_magnitude': (3, 5),  # 3-5x baseline is NORMAL for viral
@@ -39,10 +60,6 @@ class OrganicBaselineBotDetector:
             'geographic_diversity': 0.7,  # Multiple states/countries
             'news_correlation': True,  # Spikes match news cycles
         }
-        
-        # Learn from Jesse's actual patterns
-        if jesse_data is not None:
-            self._learn_organic_patterns(jesse_data)
     
     def _learn_organic_patterns(self, data):
         """
@@ -55,6 +72,29 @@ class OrganicBaselineBotDetector:
         print("      • Multi-day build-up before peaks (ORGANIC)")
         print("      • Natural decay after viral moments (ORGANIC)")
         print("      • 2-4% engagement rate (ORGANIC)")
+        
+        self._apply_baseline_profile(BaselineProfile.learn({"Jesse ON FIRE": data}))
+    
+    def _apply_baseline_profile(self, profile):
+        """
+        Replace the default ranges with the ones learned in the profile
+        """
+        self.baseline_profile = profile
+        spikes = profile.spike_ranges()
+        if spikes:
+            self.organic_baseline['viral_spike_magnitude'] = spikes['amplitude']
+            self.organic_baseline['build_up_days'] = spikes['build_days']
+            self.organic_baseline['decay_curve_days'] = spikes['decay_days']
+        engagement = profile.engagement_range()
+        if engagement is not None:
+            self.organic_baseline['engagement_rate'] = engagement
+        self.organic_baseline['daily_variance'] = profile.variance_range()
+        self.organic_baseline['weekday_profile'] = profile.weekday_profile.tolist()
+        
+        print(f"   📐 Learned from {len(profile.spike_amplitude)} organic spikes:")
+        for key in ('viral_spike_magnitude', 'build_up_days', 'decay_curve_days', 'engagement_rate', 'daily_variance'):
+            low, high = self.organic_baseline[key]
+            print(f"      • {key}: {low:.1f} - {high:.1f}")
     
     def detect_bot_patterns(self, column):
         """
@@ -71,51 +111,74 @@ class OrganicBaselineBotDetector:
         values = self.data[column].fillna(0)
         bot_signatures = []
         
-        # Look for ANTI-JESSE patterns (these are bot indicators)
-        for i in range(1, len(values)-1):
-            # 1. INSTANT VERTICAL SPIKES (not Jesse-like)
-            if i > 0 and values.iloc[i] > 0 and values.iloc[i-1] > 0:
-                spike_ratio = values.iloc[i] / values.iloc[i-1]
+        # Rules are evaluated as masks over rows 1..n-2 and reported in row order
+        rule_masks, spike_ratios = self._bot_pattern_masks(values)
+        positions, rules = np.nonzero(np.column_stack(rule_masks))
+        rows = positions + 1
+        dates = self.data['Date'].iloc[rows].tolist() if 'Date' in self.data.columns else None
                 
-                # Jesse's spikes build over 2-7 days, not instant
-                if spike_ratio > 10:  # 1000% in one day = NOT ORGANIC
-                    bot_signatures.append({
-                        'date': self.data.iloc[i]['Date'] if 'Date' in self.data.columns else i,
-                        'pattern': 'INSTANT_VERTICAL_SPIKE',
-                        'severity': 10,
-                        'explanation': f"Unnatural {spike_ratio:.0f}x jump (Jesse never does this)",
-                        'bot_probability': 95
-                    })
+        for k, (i, rule) in enumerate(zip(rows.tolist(), rules.tolist())):
+            date = dates[k] if dates is not None else i
             
-            # 2. RECTANGULAR PATTERNS (MMA GURU October signature)
-            if i > 7:  # Need a week of data
-                week_values = values.iloc[i-7:i]
-                week_std = week_values.std()
-                week_mean = week_values.mean()
-                
+            # Look for ANTI-JESSE patterns (these are bot indicators)
+            if rule == 0:
+                # Jesse's spikes build over 2-7 days, not instant
+                bot_signatures.append({
+                    'date': date,
+                    'pattern': 'INSTANT_VERTICAL_SPIKE',
+                    'severity': 10,
+                    'explanation': f"Unnatural {spike_ratios[i]:.0f}x jump (Jesse never does this)",
+                    'bot_probability': 95
+                })
+            elif rule == 1:
                 # Rectangular = sustained identical high values (NOT organic)
-                if week_mean > values.mean() * 3 and week_std < week_mean * 0.1:
-                    bot_signatures.append({
-                        'date': self.data.iloc[i]['Date'] if 'Date' in self.data.columns else i,
-                        'pattern': 'RECTANGULAR_SUSTAIN',
-                        'severity': 10,
-                        'explanation': "Artificial plateau - Jesse shows natural decay",
-                        'bot_probability': 98
-                    })
-            
-            # 3. NO BUILD-UP (Jesse always has anticipation phase)
-            if i > 1 and values.iloc[i] > values.mean() * 5:
-                if values.iloc[i-1] < values.mean() * 1.5:
-                    bot_signatures.append({
-                        'date': self.data.iloc[i]['Date'] if 'Date' in self.data.columns else i,
-                        'pattern': 'NO_BUILD_UP',
-                        'severity': 8,
-                        'explanation': "Missing anticipation phase that Jesse always has",
-                        'bot_probability': 85
-                    })
+                bot_signatures.append({
+                    'date': date,
+                    'pattern': 'RECTANGULAR_SUSTAIN',
+                    'severity': 10,
+                    'explanation': "Artificial plateau - Jesse shows natural decay",
+                    'bot_probability': 98
+                })
+            else:
+                bot_signatures.append({
+                    'date': date,
+                    'pattern': 'NO_BUILD_UP',
+                    'severity': 8,
+                    'explanation': "Missing anticipation phase that Jesse always has",
+                    'bot_probability': 85
+                })
         
         return bot_signatures
     
+    def _bot_pattern_masks(self, values):
+        """
+        Masks of the three anti-Jesse rules for rows 1..n-2, plus the
+        day-over-day ratio used in spike explanations
+        """
+        v = values.to_numpy(dtype=float)
+        n = len(v)
+        rows = np.arange(1, n - 1)
+        overall_mean = values.mean()
+        
+        # 1. INSTANT VERTICAL SPIKES (not Jesse-like): >1000% in one day
+        previous = np.r_[np.nan, v[:-1]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spike_ratios = v / previous
+        instant = (v[rows] > 0) & (previous[rows] > 0) & (spike_ratios[rows] > 10)
+        
+        # 2. RECTANGULAR PATTERNS (MMA GURU October signature): the 7 days before row i
+        rectangular = np.zeros(len(rows), dtype=bool)
+        if n > 9:
+            weeks = np.lib.stride_tricks.sliding_window_view(v, 7)[1:n - 8]  # weeks before rows 8..n-2
+            week_mean = weeks.mean(axis=1)
+            week_std = weeks.std(axis=1, ddof=1)
+            rectangular[7:] = (week_mean > overall_mean * 3) & (week_std < week_mean * 0.1)
+        
+        # 3. NO BUILD-UP (Jesse always has anticipation phase)
+        no_build_up = (rows > 1) & (v[rows] > overall_mean * 5) & (previous[rows] < overall_mean * 1.5)
+        
+        return (instant, rectangular, no_build_up), spike_ratios
+    
     def calculate_authenticity_score(self):
         """
         Score based on similarity to Jesse's organic patterns
@@ -348,6 +411,7 @@ def recalibrate_analysis(jesse_csv, mma_csv):
     mma_detector = OrganicBaselineBotDetector("THE MMA GURU")
     mma_detector.data = mma_data
     mma_detector.organic_baseline = jesse_detector.organic_baseline
+    mma_detector.baseline_profile = jesse_detector.baseline_profile
     
     # Analyze MMA GURU against Jesse baseline
     print("\n" + "="*70)
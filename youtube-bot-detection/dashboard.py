@@ -14,6 +14,7 @@ import json
 import os
 from bot_detection_engine import BotDetectionEngine
 from data_processor import DataProcessor, ComparativeAnalyzer
+from export_cache import read_video_export
 
 # Page config
 st.set_page_config(
@@ -63,8 +64,7 @@ def load_channel_data(csv_path, channel_name):
     
     if data is None:
         # Fallback to raw data loading
-        data = pd.read_csv(csv_path)
-        data['DATE PUBLISHED'] = pd.to_datetime(data['DATE PUBLISHED'], format='%d/%m/%Y', errors='coerce')
+        data = read_video_export(csv_path)
         data = data.rename(columns={'DATE PUBLISHED': 'Date', 'VIEWS': 'Views'})
     
     detector = BotDetectionEngine(channel_name)
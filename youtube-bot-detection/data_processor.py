@@ -8,6 +8,8 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
+from event_table import EventTable
+from export_cache import read_export
 
 class DataProcessor:
     """
@@ -23,7 +25,7 @@ class DataProcessor:
         Load VidIQ export CSV with proper column mapping
         """
         try:
-            df = pd.read_csv(filepath)
+            df = read_export(filepath)
             print(f"📂 Loading {channel_name} data from {os.path.basename(filepath)}")
             print(f"  Columns found: {list(df.columns)}")
             print(f"  Shape: {df.shape}")
@@ -198,39 +200,59 @@ class ComparativeAnalyzer:
         channel_spikes = {}
         for channel, results in self.channels.items():
             if 'spikes' in results:
-                spike_dates = {}
-                for spike in results['spikes']:
-                    date = spike.get('date')
-                    if isinstance(date, str):
-                        date = pd.to_datetime(date)
-                    if date:
-                        if date not in spike_dates:
-                            spike_dates[date] = []
-                        spike_dates[date].append(spike)
-                channel_spikes[channel] = spike_dates
+                channel_spikes[channel] = self._group_spikes_by_date(results['spikes'])
         
         # Find overlapping dates
         if len(channel_spikes) >= 2:
             channels_list = list(channel_spikes.keys())
-            channel1_spikes = channel_spikes[channels_list[0]]
-            channel2_spikes = channel_spikes[channels_list[1]]
+            dates1, spikes_on1 = channel_spikes[channels_list[0]]
+            dates2, spikes_on2 = channel_spikes[channels_list[1]]
             
-            for date1, spikes1 in channel1_spikes.items():
-                for date2, spikes2 in channel2_spikes.items():
-                    if abs((date1 - date2).days) <= date_tolerance_days:
-                        synchronized.append({
-                            'date_channel1': date1,
-                            'date_channel2': date2,
-                            'channel1': channels_list[0],
-                            'channel2': channels_list[1],
-                            'spikes_channel1': spikes1,
-                            'spikes_channel2': spikes2,
-                            'days_apart': abs((date1 - date2).days),
-                            'vendor_probability': 95 - (abs((date1 - date2).days) * 10)
-                        })
+            if len(dates1) and len(dates2):
+                # Whole-day distance between every pair of spike dates at once
+                delta = dates1.values[:, None] - dates2.values[None, :]
+                days_apart = np.abs(delta // np.timedelta64(1, 'D'))
+                
+                for i, j in zip(*np.nonzero(days_apart <= date_tolerance_days)):
+                    days = int(days_apart[i, j])
+                    synchronized.append({
+                        'date_channel1': dates1[i],
+                        'date_channel2': dates2[j],
+                        'channel1': channels_list[0],
+                        'channel2': channels_list[1],
+                        'spikes_channel1': spikes_on1(i),
+                        'spikes_channel2': spikes_on2(j),
+                        'days_apart': days,
+                        'vendor_probability': 95 - (days * 10)
+                    })
         
         return synchronized
     
+    def _group_spikes_by_date(self, spikes):
+        """
+        Unique spike dates (first-seen order) and a lookup of the spikes on each date
+        Event tables are grouped on their date array; records are only built for matched dates
+        """
+        if isinstance(spikes, EventTable):
+            dates = pd.to_datetime(pd.Series(spikes.dates), errors='coerce')
+            valid = np.flatnonzero(dates.notna().to_numpy())
+            codes, unique_dates = pd.factorize(dates.iloc[valid])
+            order = np.argsort(codes, kind='stable')
+            positions = np.split(valid[order], np.flatnonzero(np.diff(codes[order])) + 1)
+            return pd.DatetimeIndex(unique_dates), lambda k: spikes.take(positions[k]).to_records()
+        
+        spike_dates = {}
+        for spike in spikes:
+            date = spike.get('date')
+            if isinstance(date, str):
+                date = pd.to_datetime(date)
+            if date:
+                if date not in spike_dates:
+                    spike_dates[date] = []
+                spike_dates[date].append(spike)
+        grouped = list(spike_dates.values())
+        return pd.DatetimeIndex(list(spike_dates.keys())), lambda k: grouped[k]
+    
     def compare_bot_signatures(self):
         """
         Compare bot signatures between channels
@@ -374,7 +396,9 @@ class ComparativeAnalyzer:
         """
         Clean object for JSON serialization
         """
-        if isinstance(obj, dict):
+        if isinstance(obj, EventTable):
+            return obj.to_json_records()
+        elif isinstance(obj, dict):
             return {k: self._clean_for_json(v) for k, v in obj.items()}
         elif isinstance(obj, list):
             return [self._clean_for_json(item) for item in obj]
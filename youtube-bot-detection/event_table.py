@@ -0,0 +1,197 @@
+"""
+Columnar Event Table
+Compact result type for spikes, cliff drops and statistical anomalies
+"""
+
+import pandas as pd
+import numpy as np
+
+
+class EventTable:
+    """
+    Columnar table of detected events for one or more metric columns
+
+    Dates, metric ids, values, baselines, ratios and severities live in NumPy
+    arrays. The legacy list-of-dict view is only built when the table is
+    iterated or indexed, so callers that just count or aggregate events never
+    pay for per-event Python objects.
+    """
+    
+    # Legacy record layout per event kind: (dict key, array attribute)
+    LAYOUTS = {
+        'spike': (
+            ('date', 'dates'),
+            ('value', 'values'),
+            ('baseline', 'baselines'),
+            ('spike_ratio', 'ratios'),
+            ('metric', 'metric'),
+            ('severity', 'severities')
+        ),
+        'drop': (
+            ('date', 'dates'),
+            ('before_value', 'baselines'),
+            ('after_value', 'values'),
+            ('drop_percentage', 'ratios'),
+            ('metric', 'metric'),
+            ('bot_purge_probability', 'severities')
+        ),
+        'anomaly': (
+            ('date', 'dates'),
+            ('value', 'values'),
+            ('expected_value', 'baselines'),
+            ('z_score', 'ratios'),
+            ('metric', 'metric'),
+            ('confidence', 'severities')
+        )
+    }
+    
+    def __init__(self, kind, dates, metric_ids, metrics, values, baselines, ratios, severities):
+        if kind not in self.LAYOUTS:
+            raise ValueError(f"Unknown event kind: {kind}")
+        self.kind = kind
+        self.dates = np.asarray(dates)
+        self.metric_ids = np.asarray(metric_ids, dtype=np.int32)
+        self.metrics = tuple(metrics)
+        self.values = np.asarray(values)
+        self.baselines = np.asarray(baselines)
+        self.ratios = np.asarray(ratios)
+        self.severities = np.asarray(severities)
+    
+    @classmethod
+    def from_arrays(cls, kind, metric, dates, values, baselines, ratios, severities):
+        """Build a single-metric table from per-event arrays"""
+        return cls(kind, dates, np.zeros(len(values), dtype=np.int32), (metric,),
+                   values, baselines, ratios, severities)
+    
+    @classmethod
+    def empty(cls, kind):
+        """Table with no events"""
+        return cls(kind, np.array([], dtype='datetime64[ns]'), [], (), [], [], [], [])
+    
+    @classmethod
+    def concat(cls, tables, kind=None):
+        """
+        Concatenate tables of the same kind, remapping metric ids
+        Empty placeholders (e.g. [] for a missing column) are skipped
+        """
+        tables = [t for t in tables if isinstance(t, EventTable)]
+        if not tables:
+            if kind is None:
+                raise ValueError("Event kind required to concatenate zero tables")
+            return cls.empty(kind)
+        
+        kind = kind or tables[0].kind
+        metrics = []
+        metric_ids = []
+        for table in tables:
+            if table.kind != kind:
+                raise ValueError(f"Cannot concatenate {table.kind} events into {kind} table")
+            remap = np.empty(len(table.metrics), dtype=np.int32)
+            for i, name in enumerate(table.metrics):
+                if name not in metrics:
+                    metrics.append(name)
+                remap[i] = metrics.index(name)
+            metric_ids.append(remap[table.metric_ids] if len(table.metric_ids) else table.metric_ids)
+        
+        populated = [t for t in tables if len(t)] or tables[:1]
+        return cls(
+            kind,
+            np.concatenate([t.dates for t in populated]),
+            np.concatenate(metric_ids),
+            metrics,
+            np.concatenate([t.values for t in populated]),
+            np.concatenate([t.baselines for t in populated]),
+            np.concatenate([t.ratios for t in populated]),
+            np.concatenate([t.severities for t in populated])
+        )
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def __iter__(self):
+        return iter(self.to_records())
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(np.arange(len(self))[key])
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError("EventTable index out of range")
+            return self.take([key % len(self)]).to_records()[0]
+        raise TypeError(f"EventTable indices must be integers or slices, not {type(key).__name__}")
+    
+    def __repr__(self):
+        return f"EventTable(kind={self.kind!r}, events={len(self)}, metrics={list(self.metrics)})"
+    
+    def take(self, positions):
+        """Subset of the table at the given row positions"""
+        return EventTable(
+            self.kind, self.dates[positions], self.metric_ids[positions], self.metrics,
+            self.values[positions], self.baselines[positions],
+            self.ratios[positions], self.severities[positions]
+        )
+    
+    def metric_names(self):
+        """Metric name of every event"""
+        return np.asarray(self.metrics, dtype=object)[self.metric_ids] if self.metrics else np.array([], dtype=object)
+    
+    def metric_mask(self, predicate):
+        """Boolean mask of events whose metric name satisfies predicate"""
+        matching = np.array([bool(predicate(name)) for name in self.metrics], dtype=bool)
+        return matching[self.metric_ids] if len(matching) else np.zeros(len(self), dtype=bool)
+    
+    def _date_list(self):
+        """Dates as Timestamps (or row positions when the data had no Date column)"""
+        if self.dates.dtype.kind == 'M':
+            return list(pd.DatetimeIndex(self.dates))
+        return self.dates.tolist()
+    
+    def _columns(self, dates):
+        """Native Python column lists keyed by array attribute"""
+        return {
+            'dates': dates,
+            'metric': self.metric_names().tolist(),
+            'values': self.values.tolist(),
+            'baselines': self.baselines.tolist(),
+            'ratios': self.ratios.tolist(),
+            'severities': self.severities.tolist()
+        }
+    
+    def _build_records(self, dates):
+        """Zip the column lists into dicts using the kind's legacy layout"""
+        layout = self.LAYOUTS[self.kind]
+        columns = self._columns(dates)
+        keys = [key for key, _ in layout]
+        return [dict(zip(keys, row)) for row in zip(*(columns[attr] for _, attr in layout))]
+    
+    def to_records(self):
+        """Legacy list-of-dict view"""
+        return self._build_records(self._date_list())
+    
+    def to_json_records(self):
+        """List-of-dict view with ISO date strings and native numbers, ready for json.dump"""
+        if self.dates.dtype.kind == 'M':
+            # Match Timestamp.isoformat(): seconds precision unless sub-second parts exist
+            whole_seconds = not (self.dates.astype('datetime64[ns]').view(np.int64) % 10**9).any()
+            dates = np.datetime_as_string(self.dates, unit='s' if whole_seconds else 'us').tolist()
+        else:
+            dates = [d.isoformat() if hasattr(d, 'isoformat') else d for d in self.dates.tolist()]
+        return self._build_records(dates)
+    
+    def to_frame(self):
+        """DataFrame with the legacy column names and a categorical metric column"""
+        layout = self.LAYOUTS[self.kind]
+        frame = {}
+        for key, attr in layout:
+            if attr == 'metric':
+                frame[key] = pd.Categorical.from_codes(self.metric_ids, categories=list(self.metrics)) \
+                    if self.metrics else pd.Categorical([])
+            else:
+                frame[key] = getattr(self, attr)
+        return pd.DataFrame(frame)
+    
+    @property
+    def nbytes(self):
+        """Memory held by the event arrays"""
+        return sum(arr.nbytes for arr in (self.dates, self.metric_ids, self.values,
+                                          self.baselines, self.ratios, self.severities))
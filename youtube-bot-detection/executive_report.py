@@ -9,6 +9,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
 import json
+from export_cache import read_video_export
 
 def generate_executive_report():
     """
@@ -20,14 +21,10 @@ def generate_executive_report():
     mma_csv = r"C:\Users\user\Downloads\vidIQ CSV export for THE MMA GURU 2025-11-16.csv"
     
     # Parse Jesse data
-    jesse_df = pd.read_csv(jesse_csv)
-    jesse_df['DATE PUBLISHED'] = pd.to_datetime(jesse_df['DATE PUBLISHED'], format='%d/%m/%Y', errors='coerce')
-    jesse_df['VIEWS'] = pd.to_numeric(jesse_df['VIEWS'], errors='coerce')
+    jesse_df = read_video_export(jesse_csv)
     
     # Parse MMA data
-    mma_df = pd.read_csv(mma_csv)
-    mma_df['DATE PUBLISHED'] = pd.to_datetime(mma_df['DATE PUBLISHED'], format='%d/%m/%Y', errors='coerce')
-    mma_df['VIEWS'] = pd.to_numeric(mma_df['VIEWS'], errors='coerce')
+    mma_df = read_video_export(mma_csv)
     
     # Create figure with subplots
     fig = make_subplots(
@@ -0,0 +1,266 @@
+"""
+Export Cache - YouTube Bot Detection System
+On-disk cache of parsed vidIQ exports keyed by file content hash and parser version
+"""
+
+import os
+import re
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import pandas as pd
+from number_parser import parse_number_column
+
+# Bump when the cleaning below changes so stale cached frames are ignored
+PARSER_VERSION = 2
+
+CACHE_DIR = os.environ.get('EXPORT_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.export_cache'))
+
+# Bounds enforced after every store; least recently used frames go first
+CACHE_MAX_BYTES = int(os.environ.get('EXPORT_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+CACHE_MAX_AGE = float(os.environ.get('EXPORT_CACHE_MAX_AGE_DAYS', 30)) * 86400
+
+# Leftover temp files older than this belong to a writer that died
+STALE_TMP_SECONDS = 3600
+
+ENTRY_PATTERN = re.compile(r'-v(\d+)\.(feather|pkl)$')
+
+VIDEO_NUMBER_COLUMNS = ['VIEWS', 'YT LIKES', 'YT COMMENTS']
+
+# DATE PUBLISHED layouts tried in order, each as an exact per-element format
+DATE_PUBLISHED_FORMATS = ('%d/%m/%Y', '%Y-%m-%d')
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # Feather needs pyarrow; pickle is the fallback format
+    feather = None
+
+
+class ExportCache:
+    """
+    Parsed frames stored under the sha256 of the export's bytes, one per kind:
+    'raw' is plain pd.read_csv output, 'video' the cleaned, typed per-video frame
+    A path -> (size, mtime, hash) index skips re-hashing unchanged files, so a
+    repeat load is a stat, an index lookup and one columnar read
+    Each path has its own index file, so concurrent fleet workers never
+    overwrite each other's entries
+    """
+    
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, max_age=CACHE_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.index_dir = os.path.join(cache_dir, 'index')
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def content_hash(self, path):
+        """sha256 of the file, reused from the index while size and mtime are unchanged"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        index_path = self._index_path(key)
+        entry = self._read_index(index_path)
+        if entry and entry['path'] == key and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        
+        with open(path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        entry = {'path': key, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        self._write_atomic(index_path, json.dumps(entry).encode())
+        return digest
+    
+    def load(self, path, kind, parser):
+        """
+        Return parser(path), from the cache when this export was parsed before
+        `kind` names the parser so one export can be cached in several shapes
+        """
+        try:
+            digest = self.content_hash(path)
+        except OSError:
+            return parser(path)
+        
+        stem = os.path.join(self.cache_dir, f"{digest}-{kind}-v{PARSER_VERSION}")
+        for ext, reader in (('.feather', self._read_feather), ('.pkl', self._read_pickle)):
+            if os.path.exists(stem + ext):
+                try:
+                    frame = reader(stem + ext)
+                    self.hits += 1
+                    self._touch(stem + ext)
+                    return frame
+                except Exception:
+                    pass  # corrupt or unreadable entry: parse again and overwrite
+        
+        self.misses += 1
+        frame = parser(path)
+        self._store(stem, frame)
+        self.prune()
+        return frame
+    
+    def prune(self):
+        """
+        Drop frames of older parser versions, frames unused for max_age and,
+        least recently used first, frames beyond max_bytes; returns how many went
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+        for path, stat in self._scan(self.cache_dir):
+            name = os.path.basename(path)
+            match = ENTRY_PATTERN.search(name)
+            if name.endswith('.tmp'):
+                stale = now - stat.st_mtime > STALE_TMP_SECONDS
+            else:
+                stale = match is None or int(match.group(1)) != PARSER_VERSION or now - stat.st_mtime > self.max_age
+            if stale:
+                removed += self._remove(path)
+            elif match is not None:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+        
+        for path, stat in self._scan(self.index_dir):
+            if now - stat.st_mtime > self.max_age:
+                self._remove(path)
+        
+        self.evictions += removed
+        return removed
+    
+    def clear(self):
+        """Remove every cached frame and the index"""
+        if os.path.isdir(self.cache_dir):
+            for path, _ in self._scan(self.cache_dir):
+                os.remove(path)
+            shutil.rmtree(self.index_dir, ignore_errors=True)
+    
+    def _store(self, stem, frame):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if feather is not None:
+                try:
+                    tmp = stem + '.feather.tmp'
+                    feather.write_feather(frame, tmp)
+                    os.replace(tmp, stem + '.feather')
+                    return
+                except Exception:
+                    pass  # e.g. mixed-type object columns; fall back to pickle
+            self._write_atomic(stem + '.pkl', pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"⚠️ Could not write export cache: {e}")
+    
+    def _read_feather(self, path):
+        return feather.read_feather(path, memory_map=True)
+    
+    def _read_pickle(self, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    
+    def _index_path(self, key):
+        return os.path.join(self.index_dir, hashlib.sha1(key.encode()).hexdigest() + '.json')
+    
+    def _read_index(self, index_path):
+        try:
+            with open(index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _touch(self, path):
+        # Mtime doubles as last use, which is what prune() evicts by
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+    
+    def _scan(self, directory):
+        """(path, stat) of the regular files in directory"""
+        try:
+            with os.scandir(directory) as it:
+                files = [entry for entry in it if entry.is_file()]
+        except OSError:
+            return []
+        scanned = []
+        for entry in files:
+            try:
+                scanned.append((entry.path, entry.stat()))
+            except OSError:
+                pass  # removed by another worker's prune
+        return scanned
+    
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+    
+    def _write_atomic(self, path, data):
+        # Replace in one step so concurrent fleet workers never see a partial file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+_default_cache = None
+
+
+def get_cache():
+    """Process-wide cache in CACHE_DIR"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExportCache()
+    return _default_cache
+
+
+def _parse_raw_export(path):
+    return pd.read_csv(path)
+
+
+def clean_video_export(df):
+    """
+    Parse DATE PUBLISHED (DATE_PUBLISHED_FORMATS; anything else -> NaT)
+    and the K/M/B display numbers of a per-video export frame in place
+    Every date is matched against the same fixed formats, so a value parses
+    the same way whatever rows surround it
+    """
+    if 'DATE PUBLISHED' in df.columns:
+        raw_dates = df['DATE PUBLISHED'].astype(str)
+        parsed = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+        for date_format in DATE_PUBLISHED_FORMATS:
+            missing = parsed.isna()
+            if not missing.any():
+                break
+            parsed[missing] = pd.to_datetime(raw_dates[missing], format=date_format, errors='coerce')
+        df['DATE PUBLISHED'] = parsed
+    for col in VIDEO_NUMBER_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_number_column(df[col])
+    return df
+
+
+def _parse_video_export(path):
+    return clean_video_export(pd.read_csv(path))
+
+
+def read_export(path):
+    """
+    pd.read_csv of an export, cached; no cleaning, callers still parse dates
+    and map columns themselves (BotDetectionEngine, DataProcessor)
+    """
+    return get_cache().load(path, 'raw', _parse_raw_export)
+
+
+def read_video_export(path):
+    """
+    Per-video vidIQ export cleaned by clean_video_export, cached
+    """
+    return get_cache().load(path, 'video', _parse_video_export)
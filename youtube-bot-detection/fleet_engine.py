@@ -0,0 +1,310 @@
+"""
+Fleet Bot Detection Engine
+Scores thousands of channels at once from a single long-format DataFrame (channel, date, metric columns)
+"""
+
+import io
+import contextlib
+import pandas as pd
+import numpy as np
+from scipy.signal import find_peaks
+from bot_detection_engine import BotDetectionEngine
+from event_table import EventTable
+
+
+class FleetBotDetectionEngine:
+    """
+    Batch counterpart of BotDetectionEngine for a whole fleet of channels
+
+    Rows of every channel are sorted into contiguous blocks so rolling windows,
+    day-over-day drops, growth rates and weekday averages are computed with one
+    array operation over the whole fleet. Only find_peaks and the final score
+    assembly loop per channel. Per-channel results match running
+    BotDetectionEngine on each channel's rows.
+    """
+    
+    def __init__(self, channel_col='channel', date_col='Date', window=30,
+                 spike_threshold=3.0, prominence=2.0, drop_threshold=0.5, z_threshold=3):
+        self.channel_col = channel_col
+        self.date_col = date_col
+        self.window = window
+        self.spike_threshold = spike_threshold
+        self.prominence = prominence
+        self.drop_threshold = drop_threshold
+        self.z_threshold = z_threshold
+        self._rules = BotDetectionEngine("fleet")
+        self.view_cols = []
+        self.sub_cols = []
+        self.spikes = None
+        self.drops = None
+        self.anomalies = None
+    
+    def analyze(self, frame):
+        """
+        Score every channel in a long-format frame
+        Returns one row per channel; the detected events are kept on
+        self.spikes, self.drops and self.anomalies as DataFrames
+        """
+        data = self._prepare(frame)
+        metric_cols = self.view_cols + self.sub_cols
+        
+        spike_counts = {}
+        spike_frames, drop_frames, anomaly_frames = [], [], []
+        growth = {}
+        weekdays = {}
+        for col in metric_cols:
+            raw = data[col].to_numpy(dtype=float)
+            values = data[col].fillna(0).to_numpy()
+            
+            spikes, baseline, spike_ratios = self._detect_spikes(values)
+            spike_counts[col] = np.bincount(self._codes[spikes], minlength=self._groups)
+            spike_frames.append(self._events_frame('spike', col, spikes, values, baseline, spike_ratios))
+            drop_frames.append(self._detect_cliff_drops(col, values))
+            anomaly_frames.append(self._detect_statistical_anomalies(col, values))
+            growth[col] = self._growth_stats(values)
+            if self._weekend is not None:
+                weekdays[col] = self._weekday_averages(raw)
+        
+        self.spikes = pd.concat(spike_frames, ignore_index=True) if spike_frames else pd.DataFrame()
+        self.drops = pd.concat(drop_frames, ignore_index=True) if drop_frames else pd.DataFrame()
+        self.anomalies = pd.concat(anomaly_frames, ignore_index=True) if anomaly_frames else pd.DataFrame()
+        
+        engagement = self._engagement_totals(data)
+        return self._score_channels(spike_counts, growth, weekdays, engagement)
+    
+    def _prepare(self, frame):
+        """Arrange rows into contiguous date-ordered blocks per channel and pick the metric columns"""
+        # factorize gives missing channels code -1, which would index the wrong block
+        missing = int(frame[self.channel_col].isna().sum())
+        if missing:
+            raise ValueError(f"{missing} row(s) have no '{self.channel_col}' value; drop or label them before analyzing")
+        codes, channels = pd.factorize(frame[self.channel_col])
+        dates = pd.to_datetime(frame[self.date_col]).to_numpy() if self.date_col in frame.columns else None
+        
+        # Exports usually arrive grouped by channel and in date order; only reorder when they are not
+        ordered = bool((np.diff(codes) >= 0).all())
+        if ordered and dates is not None:
+            same_channel = codes[1:] == codes[:-1]
+            ordered = bool((dates[1:][same_channel] >= dates[:-1][same_channel]).all())
+        if ordered:
+            data = frame.reset_index(drop=True)
+        else:
+            order = np.lexsort((dates.view(np.int64), codes)) if dates is not None else np.argsort(codes, kind='stable')
+            data = frame.iloc[order].reset_index(drop=True)
+            codes = codes[order]
+            dates = dates[order] if dates is not None else None
+        
+        self._codes = codes
+        self._channels = channels
+        self._groups = len(channels)
+        self._starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=np.int64)
+        self._sizes = np.diff(np.r_[self._starts, len(codes)])
+        self._positions = np.arange(len(codes)) - self._starts[codes]
+        # True where a row continues the previous row's channel
+        self._continues = codes[1:] == codes[:-1]
+        
+        # Same column rules as BotDetectionEngine._identify_metrics
+        self._rules.data = data.drop(columns=[self.channel_col]).head(0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self._rules._identify_metrics()
+        self.view_cols = self._rules.view_cols
+        self.sub_cols = self._rules.sub_cols
+        
+        if dates is not None:
+            self._dates = dates
+            self._weekend = pd.DatetimeIndex(dates).dayofweek.isin([5, 6])
+        else:
+            self._dates = self._positions
+            self._weekend = None
+        return data
+    
+    def _rolling(self, values, stat):
+        """
+        Trailing rolling statistic within each channel (min_periods=1)
+        One pass over the whole fleet, then the first window-1 rows of every
+        channel (whose windows would reach into the previous channel) are redone
+        """
+        result = getattr(pd.Series(values).rolling(window=self.window, min_periods=1), stat)().to_numpy()
+        
+        head = np.flatnonzero(self._positions < self.window - 1)
+        if not len(head):
+            return result
+        
+        block = np.full((self._groups, self.window - 1), np.nan)
+        block[self._codes[head], self._positions[head]] = values[head]
+        head_positions = self._positions[head]
+        for k in range(self.window - 1):
+            rows = head[head_positions == k]
+            if not len(rows):
+                break
+            channels = self._codes[rows]
+            window_values = block[channels, :k + 1]
+            if stat == 'median':
+                result[rows] = np.median(window_values, axis=1)
+            elif stat == 'mean':
+                result[rows] = window_values.mean(axis=1)
+            else:
+                result[rows] = window_values.std(axis=1, ddof=1) if k > 0 else np.nan
+        return result
+    
+    def _group_sum(self, weights):
+        """Per-channel sum of a row array"""
+        return np.bincount(self._codes, weights=weights, minlength=self._groups)
+    
+    def _detect_spikes(self, values):
+        """Spike positions per channel, with the baseline and ratio arrays they came from"""
+        baseline = self._rolling(values, 'median')
+        channel_means = self._group_sum(values) / self._sizes
+        baseline = np.where(baseline == 0, channel_means[self._codes], baseline)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spike_ratios = np.where(baseline > 0, values / baseline, 0)
+        
+        # Peak prominence and spacing are defined per series, so peaks run per channel
+        peaks = []
+        for start, size in zip(self._starts, self._sizes):
+            found, _ = find_peaks(
+                spike_ratios[start:start + size],
+                height=self.spike_threshold,
+                prominence=self.prominence,
+                distance=7
+            )
+            if len(found):
+                peaks.append(found + start)
+        peaks = np.concatenate(peaks) if peaks else np.array([], dtype=np.int64)
+        return peaks, baseline, spike_ratios
+    
+    def _detect_cliff_drops(self, col, values):
+        """Day-over-day drops within each channel"""
+        before = values[:-1]
+        after = values[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drop_ratios = 1 - (after / before)
+        flagged = np.flatnonzero(self._continues & (before > 0) & (drop_ratios > self.drop_threshold))
+        drop_percentages = np.full(len(values), np.nan)
+        drop_percentages[flagged + 1] = drop_ratios[flagged] * 100
+        previous = np.r_[np.nan, before]
+        
+        return self._events_frame('drop', col, flagged + 1, values, previous, drop_percentages,
+                                  severities=np.minimum(drop_percentages, 95))
+    
+    def _detect_statistical_anomalies(self, col, values):
+        """Rolling z-score anomalies within each channel"""
+        rolling_mean = self._rolling(values, 'mean')
+        rolling_std = self._rolling(values, 'std')
+        z_scores = np.abs((values - rolling_mean) / (rolling_std + 1))
+        flagged = np.flatnonzero(z_scores > self.z_threshold)
+        
+        return self._events_frame('anomaly', col, flagged, values, rolling_mean, z_scores,
+                                  severities=np.minimum(95, 50 + (z_scores * 5)))
+    
+    def _events_frame(self, kind, col, positions, values, baselines, ratios, severities=None):
+        """Events at row positions as a legacy-layout frame with a channel column"""
+        ratios = ratios[positions]
+        if severities is None:
+            severities = self._rules._calculate_severities(ratios)
+        else:
+            severities = severities[positions]
+        
+        events = EventTable.from_arrays(
+            kind, col,
+            dates=self._dates[positions],
+            values=values[positions],
+            baselines=baselines[positions],
+            ratios=ratios,
+            severities=severities
+        ).to_frame()
+        events.insert(0, self.channel_col, self._channels[self._codes[positions]])
+        return events
+    
+    def _growth_stats(self, values):
+        """Per-channel pct_change statistics (first day and 0/0 count as zero, infinities dropped)"""
+        growth = np.zeros(len(values))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth[1:] = values[1:] / values[:-1] - 1
+        growth[self._positions == 0] = 0
+        growth[np.isnan(growth)] = 0
+        finite = np.isfinite(growth)
+        
+        counts = np.bincount(self._codes[finite], minlength=self._groups)
+        sums = np.bincount(self._codes[finite], weights=growth[finite], minlength=self._groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+            deviations = (growth - means[self._codes]) ** 2
+            squares = np.bincount(self._codes[finite], weights=deviations[finite], minlength=self._groups)
+            stds = np.sqrt(squares / (counts - 1))
+        stds[counts < 2] = np.nan
+        
+        masked = np.where(finite, growth, np.nan)
+        maxima = np.fmax.reduceat(masked, self._starts) if len(masked) else np.array([])
+        maxima = np.where(np.isnan(maxima), 0, maxima)
+        
+        return {
+            'mean': means,
+            'std': stds,
+            'max': maxima,
+            'suspicious': np.bincount(self._codes[finite & (growth > 1.0)], minlength=self._groups),
+            'impossible': np.bincount(self._codes[finite & (growth > 10.0)], minlength=self._groups)
+        }
+    
+    def _weekday_averages(self, raw):
+        """Per-channel weekend and weekday means of the raw column (NaN skipped)"""
+        present = ~np.isnan(raw)
+        filled = np.where(present, raw, 0)
+        averages = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name, mask in (('weekend', self._weekend), ('weekday', ~self._weekend)):
+                selected = present & mask
+                averages[name] = self._group_sum(np.where(selected, filled, 0)) / \
+                    np.bincount(self._codes, weights=selected, minlength=self._groups)
+        return averages
+    
+    def _engagement_totals(self, data):
+        """Per-channel total views and peak subscribers for the conversion rate"""
+        if not (self.view_cols and self.sub_cols):
+            return None
+        views = data[self.view_cols[0]].to_numpy(dtype=float)
+        subs = data[self.sub_cols[0]].to_numpy(dtype=float)
+        return {
+            'views': self._group_sum(np.where(np.isnan(views), 0, views)),
+            'subs': np.fmax.reduceat(subs, self._starts)
+        }
+    
+    def _score_channels(self, spike_counts, growth, weekdays, engagement):
+        """Assemble per-channel results and apply BotDetectionEngine's scoring rules"""
+        rules = self._rules
+        rows = []
+        for g, channel in enumerate(self._channels):
+            metrics = rules._conversion_metrics(engagement['views'][g], engagement['subs'][g]) if engagement else {}
+            patterns = {
+                col: rules._growth_pattern(
+                    stats['mean'][g], stats['std'][g], stats['max'][g],
+                    stats['suspicious'][g], stats['impossible'][g]
+                )
+                for col, stats in growth.items()
+            }
+            time_patterns = {
+                col: rules._weekend_pattern(averages['weekend'][g], averages['weekday'][g])
+                for col, averages in weekdays.items()
+            }
+            counts = {col: int(spike_counts[col][g]) for col in spike_counts}
+            score = rules._score_components(counts, metrics, patterns, time_patterns)
+            
+            rows.append({
+                self.channel_col: channel,
+                'data_points': int(self._sizes[g]),
+                'score': score['score'],
+                'rating': score['rating'],
+                'spike_count': sum(counts.values()),
+                'conversion_rate': metrics.get('conversion_rate', np.nan),
+                'engagement': metrics.get('authenticity'),
+                'bot_time_patterns': sum(1 for p in time_patterns.values() if p['pattern_type'] == "BOT_PATTERN"),
+                'reasons': score['reasons']
+            })
+        
+        scores = pd.DataFrame(rows)
+        if len(scores):
+            for name, events in (('drop_count', self.drops), ('anomaly_count', self.anomalies)):
+                counts = events[self.channel_col].value_counts() if len(events) else pd.Series(dtype=int)
+                scores.insert(5, name, scores[self.channel_col].map(counts).fillna(0).astype(int))
+        return scores
@@ -0,0 +1,313 @@
+"""
+Fleet Runner - YouTube Bot Detection System
+Analyzes a directory or manifest of vidIQ exports across a process pool and streams each channel's result to NDJSON or Parquet
+
+Usage:
+    python fleet_runner.py exports/ -o results.ndjson --workers 8 --timeout 120
+    python fleet_runner.py manifest.csv -o results.parquet
+"""
+
+import os
+import re
+import io
+import sys
+import csv
+import json
+import time
+import signal
+import argparse
+import functools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+from analyze_channels import analyze_channel
+from bot_detection_engine import BotDetectionEngine
+from video_data_adapter import VideoDataAdapter
+from data_processor import ComparativeAnalyzer
+
+
+class FileTimeoutError(TimeoutError):
+    """Raised inside a worker when one export exceeds its time budget"""
+
+
+@contextlib.contextmanager
+def _time_limit(seconds):
+    """Interrupt the current worker after `seconds` (POSIX only; no limit elsewhere)"""
+    if not seconds or not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+    
+    def _expired(signum, frame):
+        raise FileTimeoutError(f"exceeded {seconds}s")
+    
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def channel_name_from_path(path):
+    """Channel name from a vidIQ export filename ('vidIQ CSV export for NAME 2025-11-16.csv')"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.match(r'vidIQ CSV export for (.+?)(?: \d{4}-\d{2}-\d{2})?$', stem)
+    return match.group(1) if match else stem
+
+
+def iter_jobs(source, pattern='.csv'):
+    """
+    Yield (path, channel_name) pairs lazily from a directory or a manifest
+    A manifest is either a CSV with a 'path' column (and optional 'channel')
+    or a text file with one export path per line
+    """
+    if os.path.isdir(source):
+        with os.scandir(source) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_file() and entry.name.lower().endswith(pattern):
+                    yield entry.path, channel_name_from_path(entry.path)
+        return
+    
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, newline='', encoding='utf-8') as f:
+        header = f.readline()
+        f.seek(0)
+        if 'path' in [col.strip().lower() for col in header.split(',')]:
+            for row in csv.DictReader(f):
+                row = {k.strip().lower(): (v or '').strip() for k, v in row.items() if k}
+                if row.get('path'):
+                    path = os.path.join(base_dir, row['path'])
+                    yield path, row.get('channel') or channel_name_from_path(path)
+        else:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    path = os.path.join(base_dir, line)
+                    yield path, channel_name_from_path(path)
+
+
+def _analyze_export(path, channel_name):
+    """Run the analysis for one export, converting per-video exports to daily stats first"""
+    columns = pd.read_csv(path, nrows=0).columns
+    
+    if 'DATE PUBLISHED' in columns:
+        daily_stats = VideoDataAdapter().load_video_csv(path, channel_name)
+        if daily_stats is None:
+            raise ValueError("could not convert video export to daily stats")
+        detector = BotDetectionEngine(channel_name)
+        detector.data = daily_stats
+        detector._identify_metrics()
+        return 'video', detector.run_full_analysis()
+    
+    results = analyze_channel(path, channel_name)
+    if results is None:
+        raise ValueError("could not load daily export")
+    return 'daily', results
+
+
+def analyze_file(path, channel_name, timeout=None):
+    """
+    Worker entry point: analyze one export and return a JSON-ready record
+    Engine console output is captured so workers don't interleave prints
+    """
+    start = time.perf_counter()
+    record = {'channel': channel_name, 'source': path}
+    
+    try:
+        with _time_limit(timeout), contextlib.redirect_stdout(io.StringIO()):
+            export_type, results = _analyze_export(path, channel_name)
+        
+        authenticity = results.get('authenticity', {})
+        record.update({
+            'status': 'ok',
+            'export_type': export_type,
+            'score': authenticity.get('score'),
+            'rating': authenticity.get('rating'),
+            'spikes': len(results.get('spikes', [])),
+            'drops': len(results.get('drops', [])),
+            'anomalies': len(results.get('anomalies', [])),
+            'estimated_cost': results.get('cost_estimate', {}).get('average_cost'),
+            'results': ComparativeAnalyzer()._clean_for_json(results)
+        })
+    except FileTimeoutError as e:
+        record.update({'status': 'timeout', 'error': str(e)})
+    except Exception as e:
+        record.update({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+    
+    record['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def _analyze_alone(path, channel_name, timeout=None):
+    """analyze_file in a fresh single-worker pool, so a crash is pinned on this file"""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(analyze_file, path, channel_name, timeout).result()
+
+
+class NDJSONWriter:
+    """Writes one JSON record per line, flushed as each channel finishes"""
+    
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8') if path != '-' else sys.stdout
+    
+    def write(self, record):
+        self.file.write(json.dumps(record, default=str) + '\n')
+        self.file.flush()
+    
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ParquetWriter:
+    """
+    Writes summary columns plus the full results as a JSON string column
+    Rows are buffered and flushed as row groups of `chunk_size`
+    """
+    
+    SUMMARY_COLUMNS = ['channel', 'source', 'status', 'export_type', 'score', 'rating', 'spikes',
+                       'drops', 'anomalies', 'estimated_cost', 'elapsed_seconds', 'error']
+    
+    def __init__(self, path, chunk_size=256):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("❌ Parquet output requires pyarrow (pip install pyarrow)")
+        
+        self._pa = pa
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.schema = pa.schema([
+            ('channel', pa.string()), ('source', pa.string()), ('status', pa.string()),
+            ('export_type', pa.string()), ('score', pa.float64()), ('rating', pa.string()),
+            ('spikes', pa.int64()), ('drops', pa.int64()), ('anomalies', pa.int64()),
+            ('estimated_cost', pa.float64()), ('elapsed_seconds', pa.float64()),
+            ('error', pa.string()), ('results_json', pa.string())
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+    
+    def write(self, record):
+        row = {col: record.get(col) for col in self.SUMMARY_COLUMNS}
+        row['results_json'] = json.dumps(record['results'], default=str) if 'results' in record else None
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self._flush()
+    
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self._pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+    
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def open_writer(path, chunk_size):
+    """Pick the output writer from the file extension"""
+    if path.lower().endswith('.parquet'):
+        return ParquetWriter(path, chunk_size)
+    return NDJSONWriter(path)
+
+
+def run_fleet(source, output, workers=None, timeout=None, max_pending=None, chunk_size=256):
+    """
+    Fan the exports out over a process pool and stream results as they finish
+    At most `max_pending` files are queued at once, so memory stays bounded
+    however long the manifest is
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    writer = open_writer(output, chunk_size)
+    counts = {'ok': 0, 'error': 0, 'timeout': 0}
+    
+    def _record(job, get_record):
+        try:
+            record = get_record()
+        except Exception as e:  # worker process died (e.g. out of memory)
+            record = {'channel': job[1], 'source': job[0], 'status': 'error',
+                      'error': f"{type(e).__name__}: {e}"}
+        writer.write(record)
+        counts[record['status']] += 1
+        icon = {'ok': '✅', 'error': '❌', 'timeout': '⏱️'}[record['status']]
+        detail = f"{record['score']:.1f}/100 {record['rating']}" if record['status'] == 'ok' else record['error']
+        print(f"{icon} {record['channel']}: {detail}", file=sys.stderr)
+    
+    def _recover(pool, pending):
+        """
+        A dead worker breaks the whole pool and fails every in-flight job;
+        re-run those jobs one at a time in their own process so only the file
+        that crashed gets an error record, then continue on a fresh pool
+        """
+        done, _ = wait(pending)
+        lost = []
+        for future in done:
+            job = pending.pop(future)
+            if isinstance(future.exception(), BrokenProcessPool):
+                lost.append(job)
+            else:
+                _record(job, future.result)
+        pool.shutdown()
+        print(f"⚠️ A worker process died; re-running {len(lost)} in-flight file(s) one at a time", file=sys.stderr)
+        for job in lost:
+            _record(job, functools.partial(_analyze_alone, job[0], job[1], timeout))
+        return ProcessPoolExecutor(max_workers=workers)
+    
+    def _settle(pool, pending, return_when):
+        """Record finished jobs; returns the pool to keep using"""
+        done, _ = wait(pending, return_when=return_when)
+        if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+            return _recover(pool, pending)
+        for future in done:
+            _record(pending.pop(future), future.result)
+        return pool
+    
+    print(f"🚀 Analyzing {source} with {workers} workers → {output}", file=sys.stderr)
+    start = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = {}
+    try:
+        for job in iter_jobs(source):
+            while True:
+                try:
+                    pending[pool.submit(analyze_file, job[0], job[1], timeout)] = job
+                    break
+                except BrokenProcessPool:
+                    pool = _recover(pool, pending)
+            if len(pending) >= max_pending:
+                pool = _settle(pool, pending, FIRST_COMPLETED)
+        while pending:
+            pool = _settle(pool, pending, FIRST_COMPLETED)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        writer.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"🏁 {sum(counts.values())} channels in {elapsed:.1f}s "
+          f"({counts['ok']} ok, {counts['error']} failed, {counts['timeout']} timed out)", file=sys.stderr)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run bot detection over a fleet of vidIQ exports")
+    parser.add_argument('source', help="directory of CSV exports, or a manifest (.csv with a 'path' column, or one path per line)")
+    parser.add_argument('-o', '--output', default='fleet_results.ndjson', help="output file (.ndjson, or .parquet with pyarrow); '-' for stdout")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('-t', '--timeout', type=float, default=300, help="per-file timeout in seconds (0 disables)")
+    parser.add_argument('--max-pending', type=int, default=None, help="files queued at once (default: 2 x workers)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="rows per Parquet row group")
+    args = parser.parse_args(argv)
+    
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} not found")
+    
+    counts = run_fleet(args.source, args.output, args.workers, args.timeout or None,
+                       args.max_pending, args.chunk_size)
+    return 0 if counts['ok'] or not sum(counts.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+Incremental Bot Detection Engine
+Append-only mode that keeps rolling-window state per metric column and scores new days without recomputing the full history
+"""
+
+import pandas as pd
+import numpy as np
+from scipy.signal import find_peaks
+from bot_detection_engine import BotDetectionEngine
+from event_table import EventTable
+
+
+class _GrowableArray:
+    """Append-only NumPy buffer with amortized O(1) appends"""
+    
+    def __init__(self):
+        self._data = None
+        self._size = 0
+    
+    def __len__(self):
+        return self._size
+    
+    def extend(self, values):
+        values = np.asarray(values)
+        if self._data is None:
+            self._data = np.empty(max(64, len(values)), dtype=values.dtype)
+        
+        needed = self._size + len(values)
+        dtype = np.result_type(self._data.dtype, values.dtype)
+        if needed > len(self._data) or dtype != self._data.dtype:
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        
+        self._data[self._size:needed] = values
+        self._size = needed
+    
+    def view(self):
+        """The appended values as an array (no copy)"""
+        if self._data is None:
+            return np.array([])
+        return self._data[:self._size]
+
+
+class _ColumnState:
+    """Rolling-window and running statistics for one metric column"""
+    
+    def __init__(self):
+        self.values = _GrowableArray()       # values with NaN treated as zero
+        self.medians = _GrowableArray()      # trailing rolling median (spike baseline)
+        self.drops = []                      # (position, before, after, drop %)
+        self.anomalies = []                  # (position, value, rolling mean, z-score)
+        self.reported_spikes = set()
+        
+        # Growth rates: Welford mean / M2 over the finite daily pct changes
+        self.growth_count = 0
+        self.growth_mean = 0.0
+        self.growth_m2 = 0.0
+        self.growth_max = np.nan
+        self.suspicious_days = 0
+        self.impossible_days = 0
+        
+        # Raw column totals (NaN skipped, like pandas reductions)
+        self.total = 0
+        self.maximum = np.nan
+        self.weekend_sum = 0.0
+        self.weekend_count = 0
+        self.weekday_sum = 0.0
+        self.weekday_count = 0
+
+
+class IncrementalBotDetectionEngine(BotDetectionEngine):
+    """
+    BotDetectionEngine that ingests a channel's history one batch (usually one
+    day) at a time
+
+    Rolling medians, means and standard deviations are updated from the last
+    `window` rows only, so cliff drops, statistical anomalies, growth rates,
+    weekend ratios and engagement totals cost O(window) per appended row. The
+    public detector methods return the same results as a full recompute of
+    BotDetectionEngine over the appended history.
+    """
+    
+    def __init__(self, channel_name, window=30, drop_threshold=0.5, z_threshold=3):
+        self._batches = []
+        self._frame = None
+        super().__init__(channel_name)
+        self.window = window
+        self.drop_threshold = drop_threshold
+        self.z_threshold = z_threshold
+        # Drops and anomalies are tracked at these thresholds; other values fall back to a recompute
+        self._tracked_thresholds = {'drop': drop_threshold, 'anomaly': z_threshold}
+        self.view_cols = []
+        self.sub_cols = []
+        self._columns = {}
+        self._dates = None
+        self._rows = 0
+        self._spike_tables = {}
+    
+    @property
+    def data(self):
+        """Appended history as a DataFrame (materialized on demand)"""
+        if self._frame is None and self._batches:
+            self._frame = pd.concat(self._batches, ignore_index=True) if len(self._batches) > 1 else self._batches[0]
+            self._batches = [self._frame]
+        return self._frame
+    
+    @data.setter
+    def data(self, value):
+        """Assigning a frame replaces the history and replays it as one batch"""
+        self._batches = []
+        self._frame = None
+        self._columns = {}
+        self._dates = None
+        self._rows = 0
+        self._spike_tables = {}
+        if value is not None:
+            self.append(value)
+    
+    def append(self, rows):
+        """
+        Append new rows (DataFrame, dict or list of dicts) to the history
+        Returns the spikes, cliff drops and anomalies first detected in this batch
+        """
+        batch = pd.DataFrame(rows).reset_index(drop=True) if not isinstance(rows, pd.DataFrame) \
+            else rows.reset_index(drop=True)
+        
+        # Validate and coerce the whole batch before any state changes, so a bad
+        # batch raises and leaves the history exactly as it was
+        first_batch = not self._batches
+        if not first_batch:
+            batch = batch.reindex(columns=self._batches[0].columns)
+            for col in self._columns:
+                if not pd.api.types.is_numeric_dtype(batch[col]):
+                    try:
+                        batch[col] = pd.to_numeric(batch[col])
+                    except (ValueError, TypeError) as e:
+                        raise ValueError(f"Non-numeric '{col}' value in appended batch: {e}") from None
+        if 'Date' in batch.columns:
+            batch['Date'] = pd.to_datetime(batch['Date'])
+        
+        self._batches.append(batch)
+        self._frame = None
+        self._spike_tables = {}
+        
+        if first_batch:
+            self._identify_metrics()
+            self._columns = {col: _ColumnState() for col in self.view_cols + self.sub_cols}
+            if 'Date' in batch.columns:
+                self._dates = _GrowableArray()
+        
+        start = self._rows
+        if self._dates is not None:
+            self._dates.extend(batch['Date'].to_numpy())
+            weekend = batch['Date'].dt.dayofweek.isin([5, 6]).to_numpy()
+        else:
+            weekend = None
+        
+        new_drops = []
+        new_anomalies = []
+        for col, state in self._columns.items():
+            known_drops = len(state.drops)
+            known_anomalies = len(state.anomalies)
+            self._update_column(state, start, batch[col].to_numpy(), weekend)
+            new_drops.append(self._event_table('drop', col, state.drops[known_drops:]))
+            new_anomalies.append(self._event_table('anomaly', col, state.anomalies[known_anomalies:]))
+        self._rows += len(batch)
+        
+        new_spikes = []
+        for col, state in self._columns.items():
+            spikes, positions = self._current_spikes(col)
+            fresh = np.array([i for i, pos in enumerate(positions) if pos not in state.reported_spikes], dtype=np.int64)
+            state.reported_spikes.update(positions.tolist())
+            new_spikes.append(spikes.take(fresh))
+        
+        return {
+            'spikes': EventTable.concat(new_spikes, kind='spike'),
+            'drops': EventTable.concat(new_drops, kind='drop'),
+            'anomalies': EventTable.concat(new_anomalies, kind='anomaly')
+        }
+    
+    def _update_column(self, state, start, raw, weekend):
+        """Advance one column's state over a batch of raw values"""
+        new = pd.Series(raw).fillna(0).to_numpy()
+        
+        # Trailing window: the last window-1 stored values followed by the batch
+        tail = state.values.view()[max(0, start - self.window + 1):start]
+        previous = state.values.view()[start - 1:start] if start > 0 else None
+        combined = np.concatenate([tail, new]) if len(tail) else new
+        rolling = pd.Series(combined).rolling(window=self.window, min_periods=1)
+        medians = rolling.median().to_numpy()[len(tail):]
+        means = rolling.mean().to_numpy()[len(tail):]
+        stds = rolling.std().to_numpy()[len(tail):]
+        state.values.extend(new)
+        state.medians.extend(medians)
+        
+        # Statistical anomalies
+        z_scores = np.abs((new - means) / (stds + 1))
+        for i in np.flatnonzero(z_scores > self._tracked_thresholds['anomaly']):
+            state.anomalies.append((start + i, new[i], means[i], z_scores[i]))
+        
+        # Cliff drops and growth rates against the previous day
+        if previous is not None:
+            before = np.concatenate([previous, new[:-1]])
+            after = new
+            offset = start
+        else:
+            before = new[:-1]
+            after = new[1:]
+            offset = 1
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drop_ratios = 1 - (after / before)
+            growth = after / before - 1
+        for i in np.flatnonzero((before > 0) & (drop_ratios > self._tracked_thresholds['drop'])):
+            state.drops.append((offset + i, before[i], after[i], drop_ratios[i] * 100))
+        
+        # pct_change().fillna(0): first row and 0/0 count as zero growth, infinities are dropped
+        growth = np.where(np.isnan(growth), 0, growth)
+        if previous is None:
+            growth = np.concatenate([[0.0], growth])
+        growth = growth[np.isfinite(growth)]
+        self._update_growth(state, growth)
+        
+        # Raw totals and weekend / weekday sums (NaN skipped)
+        present = ~pd.isna(raw)
+        if present.any():
+            state.total = state.total + raw[present].sum()
+            batch_max = raw[present].max()
+            state.maximum = batch_max if pd.isna(state.maximum) else max(state.maximum, batch_max)
+        if weekend is not None:
+            state.weekend_sum += raw[present & weekend].sum()
+            state.weekend_count += int((present & weekend).sum())
+            state.weekday_sum += raw[present & ~weekend].sum()
+            state.weekday_count += int((present & ~weekend).sum())
+    
+    def _update_growth(self, state, growth):
+        """Merge a batch of finite growth rates into the running statistics"""
+        if not len(growth):
+            return
+        
+        count = len(growth)
+        mean = growth.mean()
+        m2 = ((growth - mean) ** 2).sum()
+        total = state.growth_count + count
+        delta = mean - state.growth_mean
+        state.growth_mean += delta * count / total
+        state.growth_m2 += m2 + delta ** 2 * state.growth_count * count / total
+        state.growth_count = total
+        
+        batch_max = growth.max()
+        state.growth_max = batch_max if np.isnan(state.growth_max) else max(state.growth_max, batch_max)
+        state.suspicious_days += int((growth > 1.0).sum())
+        state.impossible_days += int((growth > 10.0).sum())
+    
+    def _dates_at(self, positions):
+        """Date labels for row positions (the positions themselves without a Date column)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if self._dates is not None:
+            return self._dates.view()[positions]
+        return positions
+    
+    def _event_table(self, kind, column, events):
+        """Build an EventTable from (position, value/before, baseline/after, ratio) tuples"""
+        if not events:
+            return EventTable.from_arrays(kind, column, self._dates_at([]), [], [], [], [])
+        
+        positions, first, second, ratios = (np.array(part) for part in zip(*events))
+        if kind == 'drop':
+            return EventTable.from_arrays(
+                'drop', column, dates=self._dates_at(positions), values=second,
+                baselines=first, ratios=ratios, severities=np.minimum(ratios, 95)
+            )
+        return EventTable.from_arrays(
+            'anomaly', column, dates=self._dates_at(positions), values=first,
+            baselines=second, ratios=ratios, severities=np.minimum(95, 50 + (ratios * 5))
+        )
+    
+    def _current_spikes(self, column, min_spike_ratio=None, prominence=None):
+        """
+        Spikes over the stored rolling medians
+        Peak prominence and the zero-baseline fallback (the column mean) depend on
+        the whole series, so this step runs find_peaks over the stored arrays
+        rather than a window
+        """
+        min_spike_ratio = self.spike_threshold if min_spike_ratio is None else min_spike_ratio
+        prominence = self.prominence if prominence is None else prominence
+        key = (column, min_spike_ratio, prominence)
+        if key not in self._spike_tables:
+            state = self._columns[column]
+            values = state.values.view()
+            mean = values.mean() if len(values) else np.nan
+            baseline = state.medians.view()
+            baseline = np.where(baseline == 0, mean, baseline)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                spike_ratios = np.where(baseline > 0, values / baseline, 0)
+            peaks, _ = find_peaks(spike_ratios, height=min_spike_ratio, prominence=prominence, distance=7)
+            
+            table = EventTable.from_arrays(
+                'spike', column,
+                dates=self._dates_at(peaks),
+                values=values[peaks],
+                baselines=baseline[peaks],
+                ratios=spike_ratios[peaks],
+                severities=self._calculate_severities(spike_ratios[peaks])
+            )
+            self._spike_tables[key] = (table, peaks)
+        return self._spike_tables[key]
+    
+    def detect_spikes(self, column, threshold_percentile=99.5, min_spike_ratio=None, prominence=None):
+        """Spikes for the appended history"""
+        if column not in self._columns:
+            return super().detect_spikes(column, threshold_percentile, min_spike_ratio, prominence) \
+                if self.data is not None else []
+        return self._current_spikes(column, min_spike_ratio, prominence)[0]
+    
+    def detect_cliff_drops(self, column, drop_threshold=None):
+        """Cliff drops for the appended history (falls back to a recompute for untracked thresholds)"""
+        drop_threshold = self.drop_threshold if drop_threshold is None else drop_threshold
+        if column not in self._columns or drop_threshold != self._tracked_thresholds['drop']:
+            return super().detect_cliff_drops(column, drop_threshold) if self.data is not None else []
+        return self._event_table('drop', column, self._columns[column].drops)
+    
+    def detect_statistical_anomalies(self, column, z_threshold=None):
+        """Statistical anomalies for the appended history (falls back to a recompute for untracked thresholds)"""
+        z_threshold = self.z_threshold if z_threshold is None else z_threshold
+        if column not in self._columns or z_threshold != self._tracked_thresholds['anomaly']:
+            return super().detect_statistical_anomalies(column, z_threshold) if self.data is not None else []
+        return self._event_table('anomaly', column, self._columns[column].anomalies)
+    
+    def calculate_engagement_metrics(self):
+        """View-to-subscriber conversion from the running totals"""
+        if self.view_cols and self.sub_cols:
+            return self._conversion_metrics(
+                self._columns[self.view_cols[0]].total,
+                self._columns[self.sub_cols[0]].maximum
+            )
+        return {}
+    
+    def analyze_growth_patterns(self):
+        """Growth statistics from the running growth-rate moments"""
+        patterns = {}
+        for col, state in self._columns.items():
+            count = state.growth_count
+            patterns[col] = self._growth_pattern(
+                state.growth_mean if count else np.nan,
+                np.sqrt(state.growth_m2 / (count - 1)) if count > 1 else np.nan,
+                state.growth_max if count else 0,
+                state.suspicious_days,
+                state.impossible_days
+            )
+        return patterns
+    
+    def detect_time_patterns(self):
+        """Weekend vs weekday ratios from the running sums"""
+        time_patterns = {}
+        if self._dates is None:
+            return time_patterns
+        
+        for col, state in self._columns.items():
+            weekend_avg = state.weekend_sum / state.weekend_count if state.weekend_count else np.nan
+            weekday_avg = state.weekday_sum / state.weekday_count if state.weekday_count else np.nan
+            time_patterns[col] = self._weekend_pattern(weekend_avg, weekday_avg)
+        return time_patterns
@@ -0,0 +1,157 @@
+"""
+Job Store - YouTube Bot Detection System
+SQLite-backed queue of analysis jobs whose status, progress and results survive API restarts
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+import contextlib
+from datetime import datetime
+
+JOB_DB_PATH = os.environ.get('JOB_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs.sqlite3'))
+
+STATUSES = ('queued', 'running', 'done', 'error')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_inputs (
+    id TEXT PRIMARY KEY REFERENCES jobs (id),
+    data BLOB NOT NULL
+);
+"""
+
+
+class JobStore:
+    """
+    Jobs and their input bytes in one SQLite file
+    progress only marks the job's state: 0 queued, 10 running, 100 finished
+    (the analysis runs as one pool call, so there are no finer stages)
+    Each call opens its own connection, so the store can be shared by the
+    event loop and worker threads; WAL mode lets readers poll during writes
+    """
+    
+    def __init__(self, path=JOB_DB_PATH):
+        self.path = path
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+    
+    @contextlib.contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    def submit(self, kind, channel, data, **params):
+        """Queue a job over `data` bytes; returns its id"""
+        job_id = uuid.uuid4().hex
+        with self._connect() as db:
+            db.execute("BEGIN")
+            db.execute("INSERT INTO jobs (id, kind, channel, params, status, created_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                       (job_id, kind, channel, json.dumps(params), _now()))
+            db.execute("INSERT INTO job_inputs (id, data) VALUES (?, ?)", (job_id, sqlite3.Binary(data)))
+            db.execute("COMMIT")
+        return job_id
+    
+    def claim(self):
+        """
+        Mark the oldest queued job running and return it with its input bytes
+        (None when the queue is empty)
+        """
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            db.execute("UPDATE jobs SET status = 'running', progress = 10, started_at = ? WHERE id = ?",
+                       (_now(), row['id']))
+            db.execute("COMMIT")
+            job = self._job(db, row['id'])
+            job['data'] = db.execute("SELECT data FROM job_inputs WHERE id = ?", (row['id'],)).fetchone()['data']
+        return job
+    
+    def finish(self, job_id, result):
+        """Store a JSON-ready result and drop the job's input"""
+        self._close(job_id, 'done', result=json.dumps(result))
+    
+    def fail(self, job_id, error):
+        self._close(job_id, 'error', error=str(error))
+    
+    def _close(self, job_id, status, result=None, error=None):
+        with self._connect() as db:
+            db.execute("BEGIN")
+            db.execute("UPDATE jobs SET status = ?, progress = 100, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                       (status, _now(), result, error, job_id))
+            db.execute("DELETE FROM job_inputs WHERE id = ?", (job_id,))
+            db.execute("COMMIT")
+    
+    def requeue_interrupted(self):
+        """Put jobs left running by a stopped API back in the queue; returns how many"""
+        with self._connect() as db:
+            return db.execute("UPDATE jobs SET status = 'queued', progress = 0, started_at = NULL "
+                              "WHERE status = 'running'").rowcount
+    
+    def get(self, job_id, with_result=True):
+        """Job dict (result decoded), or None for an unknown id"""
+        with self._connect() as db:
+            return self._job(db, job_id, with_result)
+    
+    def list(self, status=None, limit=100):
+        """Most recent jobs first, without results"""
+        query = "SELECT id FROM jobs" + (" WHERE status = ?" if status else "") + " ORDER BY created_at DESC LIMIT ?"
+        with self._connect() as db:
+            ids = [row['id'] for row in db.execute(query, ((status, limit) if status else (limit,)))]
+            return [self._job(db, job_id, with_result=False) for job_id in ids]
+    
+    def counts(self):
+        """Number of jobs per status"""
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+    
+    def _job(self, db, job_id, with_result=True):
+        row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        result = job.pop('result')
+        if with_result:
+            job['result'] = json.loads(result) if result is not None else None
+        return job
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+_default_store = None
+
+
+def get_job_store():
+    """Process-wide store at JOB_DB_PATH"""
+    global _default_store
+    if _default_store is None:
+        _default_store = JobStore()
+    return _default_store
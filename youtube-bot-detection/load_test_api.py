@@ -0,0 +1,128 @@
+"""
+API Load Test - YouTube Bot Detection System
+Measures /health and /analyze/quick latency while /analyze/upload jobs run in the background
+
+Usage:
+    python load_test_api.py                      # in-process against api.app
+    python load_test_api.py --url http://localhost:8000 --uploads 8
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import numpy as np
+import pandas as pd
+
+try:
+    import httpx
+except ImportError:
+    raise SystemExit("❌ The load test requires httpx (pip install httpx)")
+
+QUICK_PAYLOAD = {
+    "channel_name": "Load Test",
+    "recent_views": [1000, 1500, 50000, 2000, 1800, 2100, 1900],
+    "recent_subscribers": [100, 110, 500, 120, 115, 118, 121],
+    "dates": [f"2024-01-0{day}" for day in range(1, 8)]
+}
+
+
+def synthetic_export(rows, seed):
+    """Daily export CSV bytes; every seed gives different bytes, so uploads miss the result cache"""
+    rng = np.random.default_rng(seed)
+    views = rng.poisson(5000, rows).astype(float)
+    views[rng.choice(rows, 8, replace=False)] *= rng.uniform(4, 20, 8)
+    return pd.DataFrame({
+        'Date': pd.date_range('2015-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'),
+        'Views': views,
+        'Subscribers': rng.poisson(40, rows)
+    }).to_csv(index=False).encode()
+
+
+def percentiles(latencies):
+    values = np.array(latencies) * 1000
+    if not len(values):
+        return {'n': 0}
+    return {'n': len(values), 'p50_ms': round(float(np.percentile(values, 50)), 1),
+            'p99_ms': round(float(np.percentile(values, 99)), 1), 'max_ms': round(float(values.max()), 1)}
+
+
+async def probe(client, stop, latencies, interval):
+    """
+    Alternate /health and /analyze/quick every `interval` seconds until `stop` is set
+    Latency is measured from each request's scheduled send time, so time the
+    event loop spent blocked before the request could even go out is counted
+    """
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        for method, path, kwargs in (('GET', '/health', {}), ('POST', '/analyze/quick', {'json': QUICK_PAYLOAD})):
+            response = await client.request(method, path, **kwargs)
+            response.raise_for_status()
+            latencies[path].append(time.perf_counter() - scheduled)
+            scheduled = max(scheduled + interval, time.perf_counter())
+            await asyncio.sleep(max(0, scheduled - time.perf_counter()))
+
+
+async def upload(client, csv_bytes, seed):
+    start = time.perf_counter()
+    response = await client.post('/analyze/upload', params={'channel_name': f'Load {seed}'},
+                                 files={'file': (f'load_{seed}.csv', csv_bytes, 'text/csv')})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_phase(client, uploads, rows, duration, interval, seed):
+    """Probe latencies for `duration` seconds, or while `uploads` uploads run"""
+    exports = [synthetic_export(rows, seed + i) for i in range(uploads)]
+    latencies = {'/health': [], '/analyze/quick': []}
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, stop, latencies, interval))
+    
+    upload_times = []
+    if uploads:
+        upload_times = await asyncio.gather(*[upload(client, csv, seed + i) for i, csv in enumerate(exports)])
+    else:
+        await asyncio.sleep(duration)
+    
+    stop.set()
+    await prober
+    return {path: percentiles(values) for path, values in latencies.items()}, percentiles(upload_times)
+
+
+async def load_test(url=None, uploads=8, rows=20000, duration=3.0, interval=0.02, seed=0):
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=300)
+    else:
+        import api
+        await api.start_analysis_pool()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url='http://api', timeout=300)
+    
+    async with client:
+        idle, _ = await run_phase(client, 0, rows, duration, interval, seed)
+        loaded, upload_stats = await run_phase(client, uploads, rows, duration, interval, seed)
+    
+    if not url:
+        await api.stop_analysis_pool()
+    return {'idle': idle, 'under_load': loaded, 'uploads': upload_stats}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency of light endpoints while heavy uploads run")
+    parser.add_argument('--url', help="running API (default: in-process api.app)")
+    parser.add_argument('--uploads', type=int, default=8, help="concurrent /analyze/upload jobs")
+    parser.add_argument('--rows', type=int, default=20000, help="days per uploaded export (max ~80000)")
+    parser.add_argument('--duration', type=float, default=3.0, help="seconds of idle baseline")
+    args = parser.parse_args(argv)
+    
+    report = asyncio.run(load_test(args.url, args.uploads, args.rows, args.duration))
+    
+    print(f"\n⏱️ Latency with {args.uploads} concurrent uploads of {args.rows} days")
+    for phase in ('idle', 'under_load'):
+        for path, stats in report[phase].items():
+            print(f"   {phase:<11} {path:<15} {stats}")
+    print(f"   uploads     {report['uploads']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,18 @@ import json
 from datetime import datetime, timedelta
 from scipy import stats
 from scipy.signal import find_peaks
+from baseline_profile import BaselineProfile
 import warnings
 warnings.filterwarnings('ignore')
 
+# Per-unit-difference penalty of each fingerprint feature in similarity_matrix
+SIMILARITY_WEIGHTS = {
+    'avg_amplitude': 10,
+    'avg_build_days': 20,
+    'engagement_rate': 20,
+    'plateau_count': 30,
+}
+
 class ForensicBotDetector:
     """
     Triple-baseline verification system for bot detection
@@ -27,18 +36,34 @@ class ForensicBotDetector:
         self.target = 'THE MMA GURU'
         self.organic_signatures = {}
         self.bot_signatures = {}
+        self.baseline_profile = None
         
     def establish_organic_truth_triumvirate(self, jesse_data, bisping_data, chael_data):
         """
         Establish the organic truth from three clean baselines
+        The learned profile is kept on self.baseline_profile so it can be saved
+        and reused with load_baseline_profile()
+        """
+        baseline_names = list(self.baselines.keys())
+        profile = BaselineProfile.learn(dict(zip(baseline_names, [jesse_data, bisping_data, chael_data])))
+        return self.load_baseline_profile(profile)
+    
+    def load_baseline_profile(self, profile):
         """
+        Establish the organic truth from a learned BaselineProfile (or a saved profile path)
+        without re-reading the baseline channels' data
+        """
+        if isinstance(profile, str):
+            profile = BaselineProfile.load(profile)
+        self.baseline_profile = profile
+        
         print("="*70)
         print("🔬 ESTABLISHING ORGANIC TRUTH TRIUMVIRATE")
         print("="*70)
         
         # Calculate organic signatures from all three baselines
         self.organic_signatures = {
-            'daily_variance': self._calculate_variance_range([jesse_data, bisping_data, chael_data]),
+            'daily_variance': profile.variance_range(),
             'peak_formation_days': (2, 7),  # Consistent across organic channels
             'engagement_rate': (2.5, 4.5),  # Natural engagement sweet spot
             'decay_angle': (15, 45),  # Degrees of natural decline
@@ -62,20 +87,6 @@ class ForensicBotDetector:
         
         return self.organic_signatures
     
-    def _calculate_variance_range(self, datasets):
-        """
-        Calculate natural variance range from baseline channels
-        """
-        variances = []
-        for data in datasets:
-            if data is not None and 'Views' in data.columns:
-                daily_changes = data['Views'].pct_change().abs()
-                variances.extend(daily_changes.dropna().values)
-        
-        if variances:
-            return (np.percentile(variances, 15) * 100, np.percentile(variances, 85) * 100)
-        return (15, 30)  # Default organic range
-    
     def molecular_pattern_analysis(self, channel_data, channel_name):
         """
         Molecular-level analysis of growth patterns
@@ -98,48 +109,26 @@ class ForensicBotDetector:
         spike_ratios = views / (baseline + 1)
         
         peaks, properties = find_peaks(spike_ratios, height=2, prominence=1.5)
+        peaks = peaks[peaks > 0]
         
-        for idx in peaks:
-            if idx > 0:
-                # Measure spike characteristics
-                spike_amplitude = spike_ratios.iloc[idx]
-                
-                # Time to peak (days of build-up)
-                build_days = 0
-                for i in range(1, min(8, idx)):
-                    if spike_ratios.iloc[idx-i] < spike_amplitude * 0.5:
-                        build_days = i
-                        break
+        # Measure spike characteristics for all peaks at once
+        amplitudes = spike_ratios.to_numpy()[peaks]
+        build_days, decay_days = self._spike_shape(spike_ratios.to_numpy(), peaks)
+        dates = channel_data['Date'].iloc[peaks].tolist() if 'Date' in channel_data.columns else peaks.tolist()
                 
-                # Decay measurement
-                decay_days = 0
-                for i in range(1, min(8, len(views)-idx-1)):
-                    if idx+i < len(views) and spike_ratios.iloc[idx+i] < spike_amplitude * 0.5:
-                        decay_days = i
-                        break
-                
-                patterns['spikes'].append({
-                    'date': channel_data.iloc[idx]['Date'] if 'Date' in channel_data.columns else idx,
-                    'amplitude': float(spike_amplitude),
-                    'build_days': build_days,
-                    'decay_days': decay_days,
-                    'organic_probability': self._calculate_organic_probability(
-                        spike_amplitude, build_days, decay_days
-                    )
-                })
+        for date, spike_amplitude, build, decay in zip(dates, amplitudes, build_days.tolist(), decay_days.tolist()):
+            patterns['spikes'].append({
+                'date': date,
+                'amplitude': float(spike_amplitude),
+                'build_days': build,
+                'decay_days': decay,
+                'organic_probability': self._calculate_organic_probability(
+                    spike_amplitude, build, decay
+                )
+            })
         
         # 2. PLATEAU DETECTION (Perfect rectangles = bots)
-        for i in range(7, len(views)-7):
-            window = views.iloc[i-7:i+7]
-            if window.mean() > views.mean() * 2:
-                cv = window.std() / window.mean() if window.mean() > 0 else 1
-                if cv < 0.1:  # Low variance = plateau
-                    patterns['plateaus'].append({
-                        'start': i-7,
-                        'end': i+7,
-                        'coefficient_variation': cv,
-                        'bot_probability': 95 if cv < 0.05 else 75
-                    })
+        patterns['plateaus'] = self._find_plateaus(views)
         
         # 3. ENGAGEMENT ANALYSIS
         if 'Likes' in channel_data.columns and 'Views' in channel_data.columns:
@@ -149,6 +138,62 @@ class ForensicBotDetector:
         
         return patterns
     
+    def _spike_shape(self, spike_ratios, peaks, max_days=7):
+        """
+        Build-up and decay days for each peak: the first day within `max_days`
+        before/after the peak whose ratio falls below half the peak (0 if none)
+        """
+        n = len(spike_ratios)
+        offsets = np.arange(1, max_days + 1)
+        half = spike_ratios[peaks, None] * 0.5
+        
+        # Time to peak (days of build-up)
+        before = np.clip(peaks[:, None] - offsets, 0, None)
+        build_hits = (offsets < peaks[:, None]) & (spike_ratios[before] < half)
+        
+        # Decay measurement
+        after = np.clip(peaks[:, None] + offsets, None, n - 1)
+        decay_hits = (offsets < (n - peaks - 1)[:, None]) & (spike_ratios[after] < half)
+        
+        build_days = np.where(build_hits.any(axis=1), build_hits.argmax(axis=1) + 1, 0)
+        decay_days = np.where(decay_hits.any(axis=1), decay_hits.argmax(axis=1) + 1, 0)
+        return build_days, decay_days
+    
+    def _find_plateaus(self, views, half_window=7):
+        """
+        Sustained high, low-variance stretches: 14-day windows averaging over
+        twice the channel mean with CV < 0.1, overlapping windows merged
+        """
+        width = 2 * half_window
+        rolling = views.rolling(width, center=True)  # label i covers days i-7 .. i+6
+        window_mean = rolling.mean().to_numpy()
+        window_cv = rolling.std().to_numpy() / np.where(window_mean > 0, window_mean, np.nan)
+        window_cv = np.where(window_mean > 0, window_cv, 1)
+        
+        days = np.arange(len(views))
+        flagged = (days >= half_window) & (days < len(views) - half_window)
+        flagged &= (window_mean > views.mean() * 2) & (window_cv < 0.1)  # Low variance = plateau
+        
+        # Windows closer than `width` days apart overlap and belong to one plateau
+        centers = np.flatnonzero(flagged)
+        if not len(centers):
+            return []
+        run_starts = np.flatnonzero(np.r_[True, np.diff(centers) >= width])
+        run_ends = np.r_[run_starts[1:], len(centers)] - 1
+        run_cv = np.minimum.reduceat(window_cv[centers], run_starts)
+        
+        plateaus = []
+        for start, end, cv in zip((centers[run_starts] - half_window).tolist(),
+                                  (centers[run_ends] + half_window).tolist(), run_cv.tolist()):
+            plateaus.append({
+                'start': start,
+                'end': end,
+                'days': end - start,
+                'coefficient_variation': cv,
+                'bot_probability': 95 if cv < 0.05 else 75
+            })
+        return plateaus
+    
     def _calculate_organic_probability(self, amplitude, build_days, decay_days):
         """
         Calculate probability that a spike is organic based on characteristics
@@ -175,26 +220,37 @@ class ForensicBotDetector:
         
         return max(0, min(100, score))
     
-    def compare_to_baselines(self, target_patterns, baseline_patterns):
+    def compare_to_baselines(self, target_patterns, baseline_patterns=None):
         """
         Compare target channel to all three baselines
+        Defaults to the patterns stored in the loaded baseline profile
         """
+        if baseline_patterns is None:
+            if self.baseline_profile is None:
+                raise ValueError("No baseline patterns given and no baseline profile loaded; "
+                                 "call establish_organic_truth_triumvirate() or load_baseline_profile() first")
+            baseline_patterns = self.baseline_profile.baseline_patterns()
+        if not baseline_patterns:
+            raise ValueError("At least one baseline is needed to compare against")
+        if self.target in baseline_patterns:
+            raise ValueError(f"Baseline '{self.target}' has the target channel's name")
+        
         print("\n" + "="*70)
         print("📊 BASELINE COMPARISON MATRIX")
         print("="*70)
         
-        comparison_matrix = {}
+        # One fingerprint row per channel, target first
+        channels = {self.target: target_patterns, **baseline_patterns}
+        similarity = self.similarity_matrix(self.pattern_fingerprints(channels))
+        comparison_matrix = similarity.iloc[0, 1:len(channels)].to_dict()
         
-        for baseline_name, baseline_data in baseline_patterns.items():
-            similarity = self._calculate_similarity(target_patterns, baseline_data)
-            comparison_matrix[baseline_name] = similarity
-            
+        for baseline_name, score in comparison_matrix.items():
             print(f"\n{self.target} vs {baseline_name}:")
-            print(f"   Similarity Score: {similarity:.1f}%")
+            print(f"   Similarity Score: {score:.1f}%")
             
-            if similarity > 70:
+            if score > 70:
                 print(f"   ✅ HIGH SIMILARITY - Likely organic")
-            elif similarity > 40:
+            elif score > 40:
                 print(f"   ⚠️ MODERATE SIMILARITY - Unclear")
             else:
                 print(f"   🚨 LOW SIMILARITY - Suspicious")
@@ -210,21 +266,83 @@ class ForensicBotDetector:
         print(f"\nAverage Similarity to Baselines: {avg_similarity:.1f}%")
         print(f"Highest Match: {max_similarity:.1f}%")
         
-        if max_similarity > 70:
-            verdict = "LIKELY ORGANIC"
-            confidence = max_similarity
-        elif avg_similarity < 40:
-            verdict = "CONFIRMED BOT ACTIVITY"
-            confidence = 100 - avg_similarity
-        else:
-            verdict = "INCONCLUSIVE - NEEDS DEEPER ANALYSIS"
-            confidence = 50
+        verdict, confidence = self._verdict(avg_similarity, max_similarity)
         
         print(f"\n🎯 VERDICT: {verdict}")
         print(f"   Confidence: {confidence:.1f}%")
         
         return comparison_matrix, verdict, confidence
     
+    def _verdict(self, avg_similarity, max_similarity):
+        """
+        Verdict and confidence from the similarities to the baselines
+        """
+        if max_similarity > 70:
+            return "LIKELY ORGANIC", max_similarity
+        elif avg_similarity < 40:
+            return "CONFIRMED BOT ACTIVITY", 100 - avg_similarity
+        return "INCONCLUSIVE - NEEDS DEEPER ANALYSIS", 50
+    
+    def pattern_fingerprints(self, patterns_by_channel):
+        """
+        Fingerprint matrix: one row per channel of molecular_pattern_analysis
+        features (NaN where a channel has no spikes or engagement data)
+        """
+        rows = {}
+        for channel, patterns in patterns_by_channel.items():
+            spikes = patterns.get('spikes') or []
+            engagement = patterns.get('engagement_rate', np.nan)
+            rows[channel] = {
+                'avg_amplitude': np.mean([s['amplitude'] for s in spikes]) if spikes else np.nan,
+                'avg_build_days': np.mean([s['build_days'] for s in spikes]) if spikes else np.nan,
+                'engagement_rate': engagement if engagement is not None else np.nan,
+                'plateau_count': len(patterns.get('plateaus', []))
+            }
+        return pd.DataFrame.from_dict(rows, orient='index', columns=list(SIMILARITY_WEIGHTS), dtype=float)
+    
+    def similarity_matrix(self, fingerprints):
+        """
+        NxN similarity (0-100) between every pair of fingerprint rows
+        Each feature scores 100 - |difference| * weight, clipped to 0-100, and
+        only counts for pairs where both channels have it
+        """
+        total = np.zeros((len(fingerprints), len(fingerprints)))
+        counted = np.zeros_like(total)
+        
+        for feature, weight in SIMILARITY_WEIGHTS.items():
+            values = fingerprints[feature].to_numpy(dtype=float)
+            diff = np.abs(values[:, None] - values[None, :])
+            present = ~np.isnan(diff)
+            total += np.where(present, np.clip(100 - diff * weight, 0, 100), 0)
+            counted += present
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = np.where(counted > 0, total / counted, 50)
+        return pd.DataFrame(similarity, index=fingerprints.index, columns=fingerprints.index)
+    
+    def verdict_matrix(self, similarity, baseline_names=None):
+        """
+        Verdict for every channel from its row of the similarity matrix,
+        scored against the baseline columns (excluding itself)
+        """
+        baseline_names = list(baseline_names or self.baselines.keys())
+        against = similarity[baseline_names].to_numpy(dtype=float).copy()
+        is_self = similarity.index.to_numpy()[:, None] == np.array(baseline_names, dtype=object)[None, :]
+        against[is_self] = np.nan
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)  # a lone baseline has no peers
+            avg_similarity = np.nanmean(against, axis=1)
+            max_similarity = np.nanmax(against, axis=1)
+        
+        verdicts = [self._verdict(avg, best) for avg, best in zip(avg_similarity, max_similarity)]
+        return pd.DataFrame({
+            'avg_similarity': avg_similarity,
+            'max_similarity': max_similarity,
+            'verdict': [v for v, _ in verdicts],
+            'confidence': [c for _, c in verdicts]
+        }, index=similarity.index)
+    
     def _calculate_similarity(self, patterns1, patterns2):
         """
         Calculate similarity score between two pattern sets
@@ -232,37 +350,8 @@ class ForensicBotDetector:
         if not patterns1 or not patterns2:
             return 0
         
-        scores = []
-        
-        # Compare spike characteristics
-        if 'spikes' in patterns1 and 'spikes' in patterns2:
-            if patterns1['spikes'] and patterns2['spikes']:
-                avg_amp1 = np.mean([s['amplitude'] for s in patterns1['spikes']])
-                avg_amp2 = np.mean([s['amplitude'] for s in patterns2['spikes']])
-                amp_similarity = 100 - abs(avg_amp1 - avg_amp2) * 10
-                scores.append(max(0, min(100, amp_similarity)))
-                
-                avg_build1 = np.mean([s['build_days'] for s in patterns1['spikes']])
-                avg_build2 = np.mean([s['build_days'] for s in patterns2['spikes']])
-                build_similarity = 100 - abs(avg_build1 - avg_build2) * 20
-                scores.append(max(0, min(100, build_similarity)))
-        
-        # Compare engagement
-        if 'engagement_rate' in patterns1 and 'engagement_rate' in patterns2:
-            eng_diff = abs(patterns1['engagement_rate'] - patterns2['engagement_rate'])
-            eng_similarity = 100 - eng_diff * 20
-            scores.append(max(0, min(100, eng_similarity)))
-        
-        # Compare plateau presence
-        plateau1 = len(patterns1.get('plateaus', []))
-        plateau2 = len(patterns2.get('plateaus', []))
-        if plateau1 == 0 and plateau2 == 0:
-            scores.append(100)  # Both organic (no plateaus)
-        else:
-            plateau_similarity = 100 - abs(plateau1 - plateau2) * 30
-            scores.append(max(0, min(100, plateau_similarity)))
-        
-        return np.mean(scores) if scores else 50
+        fingerprints = self.pattern_fingerprints({0: patterns1, 1: patterns2})
+        return self.similarity_matrix(fingerprints).iloc[0, 1]
     
     def exclude_livestreams(self, video_list):
         """
@@ -0,0 +1,42 @@
+"""
+Number Parser - YouTube Bot Detection System
+Parses vidIQ/YouTube display numbers ("9.9K", "1.2M", "3B", "12,345") for whole columns at once
+"""
+
+import re
+import pandas as pd
+import numpy as np
+
+MULTIPLIERS = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+# Optional sign, a decimal number, then an optional K/M/B suffix (commas removed first)
+_NUMBER_RE = re.compile(r'^([-+]?(?:\d+\.?\d*|\.\d+)(?:E[-+]?\d+)?)\s*([KMB])?$')
+
+
+def parse_number(value):
+    """Parse one display number; blanks and unparseable values become 0"""
+    if pd.isna(value):
+        return 0.0
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    
+    match = _NUMBER_RE.match(str(value).replace(',', '').strip().upper())
+    if not match:
+        return 0.0
+    return float(match.group(1)) * MULTIPLIERS.get(match.group(2), 1)
+
+
+def parse_number_column(values):
+    """
+    Parse a whole column of display numbers
+    Returns a float Series on the same index; blanks and unparseable values become 0
+    """
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float).fillna(0)
+    
+    # Display numbers repeat heavily ("9.9K"), so each distinct string is parsed once
+    codes, uniques = pd.factorize(values)
+    parsed = np.array([parse_number(value) for value in uniques], dtype=float)
+    result = np.where(codes >= 0, parsed[codes] if len(parsed) else 0.0, 0.0)
+    return pd.Series(result, index=values.index, name=values.name)
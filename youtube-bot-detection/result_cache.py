@@ -0,0 +1,121 @@
+"""
+Result Cache - YouTube Bot Detection System
+Bounded in-memory LRU cache of analysis results keyed by input content, parameters and engine version
+"""
+
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from bot_detection_engine import ENGINE_VERSION
+
+
+def result_key(kind, data, **params):
+    """
+    sha256 over the engine version, result kind, parameters and input bytes
+    Identical inputs share a key whatever the request came in as
+    """
+    digest = hashlib.sha256()
+    header = json.dumps({'engine': ENGINE_VERSION, 'kind': kind, 'params': params}, sort_keys=True, default=str)
+    digest.update(header.encode())
+    digest.update(b'\0')
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def estimated_size(value):
+    """Approximate bytes held by a cached value (its pickled size)"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return len(repr(value))
+
+
+class ResultCache:
+    """
+    Least-recently-used cache bounded by entry count and estimated bytes
+    Entries expire `ttl` seconds after they were stored (monotonic clock)
+    """
+    
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl=3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key):
+        """Cached value for key, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, value):
+        """Store value, evicting least recently used entries to stay in bounds"""
+        size = estimated_size(value)
+        if size > self.max_bytes:
+            return value  # would evict everything else; serve it uncached
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+    
+    def get_or_compute(self, key, compute):
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+    
+    def clear(self):
+        """Drop every entry; returns how many there were"""
+        with self._lock:
+            cleared = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        return cleared
+    
+    def stats(self):
+        """Size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+    
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def __len__(self):
+        return len(self._entries)
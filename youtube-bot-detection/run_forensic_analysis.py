@@ -24,35 +24,61 @@ def load_parsed_screenshots():
         from screenshot_parser import main as parse_screenshots
         return parse_screenshots()
 
-def create_comparison_matrix(molecular_metrics):
+# Per-unit-difference penalty of each screenshot metric in metric_similarity_matrix
+DIVERGENCE_WEIGHTS = {'spike_ratio': 1, 'variance': 10, 'avg_engagement': 1}
+
+def metric_similarity_matrix(molecular_metrics, channels=None):
+    """
+    NxN similarity (0-100) between channels' molecular metrics
+    Divergence is the mean weighted |difference| over the metrics both channels
+    have; similarity is 100 - 20 x divergence, floored at 0
+    """
+    channels = list(channels or molecular_metrics)
+    total = np.zeros((len(channels), len(channels)))
+    counted = np.zeros_like(total)
+    
+    for metric, weight in DIVERGENCE_WEIGHTS.items():
+        values = np.array([molecular_metrics[ch].get(metric, np.nan) for ch in channels], dtype=float)
+        diff = np.abs(values[:, None] - values[None, :]) * weight
+        present = ~np.isnan(diff)
+        total += np.where(present, diff, 0)
+        counted += present
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similarity = np.maximum(0, 100 - (total / counted) * 20)
+    return pd.DataFrame(similarity, index=channels, columns=channels)
+
+def create_comparison_matrix(molecular_metrics, channels=None):
     """
-    Create 4x4 comparison matrix of all channels
+    Create NxN comparison matrix of all channels
     """
+    channels = [ch for ch in (channels or molecular_metrics) if ch in molecular_metrics]
+    
     print("\n" + "="*70)
-    print("📊 4x4 COMPARISON MATRIX")
+    print(f"📊 {len(channels)}x{len(channels)} COMPARISON MATRIX")
     print("="*70)
     
-    channels = ['jesse', 'mma_guru', 'bisping', 'chael']
     metrics_to_compare = ['spike_ratio', 'variance', 'avg_engagement']
     
     # Create matrix header
     print("\n" + " "*15 + " | ".join([f"{ch[:8]:^8}" for ch in channels]))
-    print("-" * 60)
+    print("-" * (15 + 11 * len(channels)))
     
     for metric in metrics_to_compare:
-        values = []
-        for channel in channels:
-            if channel in molecular_metrics:
-                value = molecular_metrics[channel].get(metric, 0)
-                values.append(f"{value:.2f}")
-            else:
-                values.append("N/A")
-        
+        values = [f"{molecular_metrics[channel].get(metric, 0):.2f}" for channel in channels]
         print(f"{metric[:14]:<14} | " + " | ".join([f"{v:^8}" for v in values]))
     
-    return molecular_metrics
+    # Pairwise similarity
+    similarity = metric_similarity_matrix(molecular_metrics, channels)
+    print("\n" + " "*15 + " | ".join([f"{ch[:8]:^8}" for ch in channels]))
+    print("-" * (15 + 11 * len(channels)))
+    for channel in channels:
+        values = ["N/A" if np.isnan(v) else f"{v:.1f}%" for v in similarity.loc[channel]]
+        print(f"{channel[:14]:<14} | " + " | ".join([f"{v:^8}" for v in values]))
+
+    return similarity
 
-def calculate_pattern_divergence(molecular_metrics):
+def calculate_pattern_divergence(molecular_metrics, similarity=None):
     """
     Calculate how much MMA GURU diverges from the three baselines
     """
@@ -67,44 +93,24 @@ def calculate_pattern_divergence(molecular_metrics):
         print("⚠️ MMA GURU data not found")
         return None
     
-    target_data = molecular_metrics[target]
+    if similarity is None:
+        similarity = metric_similarity_matrix(molecular_metrics)
     divergence_scores = {}
     
     for baseline in baselines:
         if baseline not in molecular_metrics:
             continue
         
-        baseline_data = molecular_metrics[baseline]
-        
-        # Calculate divergence for each metric
-        divergences = []
-        
-        # Spike ratio divergence
-        if 'spike_ratio' in target_data and 'spike_ratio' in baseline_data:
-            spike_div = abs(target_data['spike_ratio'] - baseline_data['spike_ratio'])
-            divergences.append(spike_div)
-        
-        # Variance divergence (low variance = suspicious)
-        if 'variance' in target_data and 'variance' in baseline_data:
-            var_div = abs(target_data['variance'] - baseline_data['variance'])
-            divergences.append(var_div * 10)  # Weight variance heavily
-        
-        # Engagement divergence
-        if 'avg_engagement' in target_data and 'avg_engagement' in baseline_data:
-            eng_div = abs(target_data['avg_engagement'] - baseline_data['avg_engagement'])
-            divergences.append(eng_div)
-        
-        if divergences:
-            avg_divergence = np.mean(divergences)
-            similarity = max(0, 100 - (avg_divergence * 20))
-            divergence_scores[baseline] = similarity
+        similarity_score = similarity.loc[target, baseline]
+        if not np.isnan(similarity_score):
+            divergence_scores[baseline] = similarity_score
             
             print(f"\n{target.upper()} vs {baseline.upper()}:")
-            print(f"   Similarity: {similarity:.1f}%")
+            print(f"   Similarity: {similarity_score:.1f}%")
             
-            if similarity < 40:
+            if similarity_score < 40:
                 print(f"   🚨 HIGH DIVERGENCE - Suspicious")
-            elif similarity < 70:
+            elif similarity_score < 70:
                 print(f"   ⚠️ MODERATE DIVERGENCE - Unclear")
             else:
                 print(f"   ✅ LOW DIVERGENCE - Similar patterns")
@@ -364,10 +370,10 @@ def main():
     molecular_metrics = screenshot_data.get('molecular_metrics', {})
     
     print("\n📈 Step 3: Creating comparison matrix...")
-    create_comparison_matrix(molecular_metrics)
+    similarity = create_comparison_matrix(molecular_metrics)
     
     print("\n🎯 Step 4: Calculating pattern divergence...")
-    divergence_scores = calculate_pattern_divergence(molecular_metrics)
+    divergence_scores = calculate_pattern_divergence(molecular_metrics, similarity)
     
     print("\n⚖️ Step 5: Generating final verdict...")
     verdict, confidence = generate_final_verdict(divergence_scores, molecular_metrics)
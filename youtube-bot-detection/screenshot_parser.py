@@ -12,6 +12,7 @@ import numpy as np
 from PIL import Image
 import pytesseract
 from pathlib import Path
+from number_parser import parse_number
 
 class ScreenshotParser:
     """
@@ -98,7 +99,7 @@ class ScreenshotParser:
         for pattern in view_patterns:
             matches = re.findall(pattern, text, re.IGNORECASE)
             if matches:
-                metrics['views'] = self._parse_number(matches[0])
+                metrics['views'] = parse_number(matches[0])
                 break
         
         # Engagement patterns
@@ -136,28 +137,11 @@ class ScreenshotParser:
         for pattern in sub_patterns:
             matches = re.findall(pattern, text, re.IGNORECASE)
             if matches:
-                metrics['subscribers'] = self._parse_number(matches[0])
+                metrics['subscribers'] = parse_number(matches[0])
                 break
         
         return metrics
     
-    def _parse_number(self, num_str):
-        """
-        Parse numbers with K, M, B suffixes or commas
-        """
-        num_str = str(num_str).upper().replace(',', '')
-        
-        multipliers = {'K': 1000, 'M': 1000000, 'B': 1000000000}
-        
-        for suffix, multiplier in multipliers.items():
-            if suffix in num_str:
-                return float(num_str.replace(suffix, '')) * multiplier
-        
-        try:
-            return float(num_str)
-        except:
-            return 0
-    
     def _identify_channel(self, text, filepath):
         """
         Identify which channel this screenshot belongs to
@@ -0,0 +1,242 @@
+"""
+Snapshot Diff Engine - YouTube Bot Detection System
+Joins successive dated vidIQ exports of one channel by video identity to recover true view/like/comment velocity
+
+Usage:
+    python snapshot_diff.py "vidIQ CSV export for THE MMA GURU 2025-11-09.csv" "vidIQ CSV export for THE MMA GURU 2025-11-16.csv"
+"""
+
+import os
+import re
+import sys
+import pandas as pd
+import numpy as np
+from export_cache import read_video_export
+
+# Columns that identify a video across snapshots, in order of preference
+VIDEO_ID_COLUMNS = ['VIDEO ID', 'VIDEO_ID', 'ID', 'VIDEO URL', 'URL']
+METRIC_COLUMNS = {'VIEWS': 'views', 'YT LIKES': 'likes', 'YT COMMENTS': 'comments'}
+
+DAY = np.timedelta64(1, 'D')
+
+
+def snapshot_date_from_path(path):
+    """Snapshot date from an export filename ('... 2025-11-16.csv')"""
+    match = re.search(r'(\d{4}-\d{2}-\d{2})', os.path.basename(path))
+    if not match:
+        raise ValueError(f"No snapshot date in filename: {path}")
+    return pd.Timestamp(match.group(1))
+
+
+def video_keys(videos):
+    """
+    uint64 identity per video: a hash of the video id column when the export
+    has one, otherwise of title + publish date
+    """
+    id_cols = [col for col in VIDEO_ID_COLUMNS if col in videos.columns][:1]
+    key_cols = id_cols or [col for col in ('TITLE', 'DATE PUBLISHED') if col in videos.columns]
+    if not key_cols:
+        raise ValueError("Export has no video id, TITLE or DATE PUBLISHED column to join on")
+    return pd.util.hash_pandas_object(videos[key_cols], index=False).to_numpy()
+
+
+def compact_snapshot(videos):
+    """
+    One row per video (key, title, published, views, likes, comments) from a
+    cleaned per-video export; identical title + date duplicates are summed
+    """
+    keys = video_keys(videos)
+    published = videos['DATE PUBLISHED']
+    if not pd.api.types.is_datetime64_any_dtype(published):
+        published = pd.to_datetime(published, errors='coerce')
+    compact = pd.DataFrame({
+        'key': keys,
+        'title': videos['TITLE'].to_numpy(dtype=object) if 'TITLE' in videos.columns else None,
+        'published': published.dt.normalize().to_numpy()
+    })
+    for col, name in METRIC_COLUMNS.items():
+        compact[name] = videos[col].to_numpy(dtype=float) if col in videos.columns else np.nan
+    
+    if not pd.Index(keys).is_unique:
+        compact = compact.groupby('key', sort=False).agg(
+            title=('title', 'first'), published=('published', 'first'), views=('views', 'sum'),
+            likes=('likes', 'sum'), comments=('comments', 'sum')).reset_index()
+    return compact
+
+
+class SnapshotDiffEngine:
+    """
+    Per-video and per-channel metric deltas between dated snapshots of one channel
+    Snapshots are stored as compact key/metric arrays; all joins happen in one
+    sort over the stacked snapshots, so hundreds of snapshots stay cheap
+    """
+    
+    def __init__(self, channel_name):
+        self.channel_name = channel_name
+        self.snapshots = {}  # snapshot date -> compact per-video frame
+        self._title_keys = np.empty(0, dtype=np.uint64)
+        self._titles = np.empty(0, dtype=object)
+    
+    def add_snapshot(self, videos, taken_at):
+        """
+        Add one cleaned per-video export (see export_cache.read_video_export)
+        taken on `taken_at`; a second snapshot for the same day replaces the first
+        """
+        taken_at = pd.Timestamp(taken_at).normalize()
+        compact = compact_snapshot(videos)
+        titles = compact.pop('title').to_numpy(dtype=object)
+        self.snapshots[taken_at] = compact
+        
+        # Titles are only kept for display, once per video
+        keys = compact['key'].to_numpy()
+        unseen = ~np.isin(keys, self._title_keys)
+        self._title_keys = np.r_[self._title_keys, keys[unseen]]
+        self._titles = np.r_[self._titles, titles[unseen]]
+        return self
+    
+    def titles(self, keys):
+        """Display titles for video keys (None when unknown)"""
+        position = pd.Index(self._title_keys).get_indexer(keys)
+        return np.r_[self._titles, None][position]
+    
+    def load_snapshots(self, paths):
+        """Load exports whose filenames carry the snapshot date"""
+        for path in paths:
+            self.add_snapshot(read_video_export(path), snapshot_date_from_path(path))
+        return self
+    
+    def video_deltas(self):
+        """
+        One row per video per snapshot interval it gained (or lost) views in,
+        with its title, largest gains first within each interval
+        """
+        deltas = self._deltas()
+        deltas.insert(1, 'title', self.titles(deltas['key'].to_numpy()))
+        return deltas.sort_values(['end', 'views_delta'], ascending=[True, False], ignore_index=True)
+    
+    def _deltas(self):
+        """
+        Untitled, unsorted video deltas
+        Videos seen in an earlier snapshot are diffed against their last
+        appearance; videos published after the previous snapshot count from 0
+        starting on their publish day. Videos missing from the first snapshot
+        they should have appeared in are skipped. Negative deltas (purges) are kept.
+        """
+        columns = ['key', 'published', 'start', 'end', 'days', 'new_video',
+                   'views_delta', 'likes_delta', 'comments_delta', 'views_per_day']
+        if len(self.snapshots) < 2:
+            return pd.DataFrame(columns=columns)
+        
+        dates = sorted(self.snapshots)
+        frames = [self.snapshots[d] for d in dates]
+        snapshot_dates = np.array(dates, dtype='datetime64[ns]')
+        taken = np.repeat(snapshot_dates, [len(f) for f in frames])
+        keys = np.concatenate([f['key'].to_numpy() for f in frames])
+        order = np.lexsort((taken, keys))
+        keys, taken = keys[order], taken[order]
+        published = np.concatenate([f['published'].to_numpy() for f in frames])[order]
+        seen_before = np.r_[False, keys[1:] == keys[:-1]]
+        
+        # Snapshot preceding each row's snapshot (NaT for the first snapshot)
+        previous_snapshot = np.r_[np.datetime64('NaT', 'ns'), snapshot_dates[:-1]][np.searchsorted(snapshot_dates, taken)]
+        
+        new_video = ~seen_before & (published > previous_snapshot)
+        keep = seen_before | new_video
+        
+        start = np.where(seen_before, np.r_[taken[:1], taken[:-1]] + DAY, published)
+        deltas = {}
+        for name in METRIC_COLUMNS.values():
+            values = np.concatenate([f[name].to_numpy() for f in frames])[order]
+            previous = np.r_[np.nan, values[:-1]]
+            deltas[name] = np.where(seen_before, values - previous, values)[keep]
+        
+        end = taken[keep]
+        start = np.minimum(start[keep], end)
+        days = np.maximum((end - start) // DAY + 1, 1)
+        result = pd.DataFrame({
+            'key': keys[keep],
+            'published': published[keep],
+            'start': start,
+            'end': end,
+            'days': days,
+            'new_video': new_video[keep],
+            'views_delta': deltas['views'],
+            'likes_delta': deltas['likes'],
+            'comments_delta': deltas['comments'],
+        })
+        result['views_per_day'] = result['views_delta'] / result['days']
+        return result
+    
+    def channel_deltas(self):
+        """Per-interval channel totals between consecutive snapshots"""
+        deltas = self._deltas()
+        if deltas.empty:
+            return pd.DataFrame(columns=['snapshot', 'previous_snapshot', 'days', 'videos', 'new_videos',
+                                         'views_delta', 'likes_delta', 'comments_delta', 'views_per_day'])
+        
+        dates = sorted(self.snapshots)
+        totals = deltas.groupby('end').agg(
+            videos=('key', 'size'), new_videos=('new_video', 'sum'),
+            views_delta=('views_delta', 'sum'), likes_delta=('likes_delta', 'sum'),
+            comments_delta=('comments_delta', 'sum'))
+        totals = totals.reindex(pd.DatetimeIndex(dates[1:]), fill_value=0)
+        totals.insert(0, 'previous_snapshot', dates[:-1])
+        totals.insert(1, 'days', (totals.index - pd.DatetimeIndex(dates[:-1])).days)
+        totals['views_per_day'] = totals['views_delta'] / totals['days']
+        return totals.rename_axis('snapshot').reset_index()
+    
+    def daily_velocity(self):
+        """
+        Daily Views/Likes/Comments gained by the channel, each interval's delta
+        spread evenly over its days; ready for BotDetectionEngine
+        """
+        deltas = self._deltas()
+        if deltas.empty:
+            return pd.DataFrame(columns=['Date', 'Views', 'Likes', 'Comments'])
+        
+        # Videos sharing an interval are summed before expanding to days
+        intervals = deltas.groupby(['start', 'end', 'days'], sort=False)[
+            ['views_delta', 'likes_delta', 'comments_delta']].sum().reset_index()
+        days = intervals['days'].to_numpy()
+        row = np.repeat(np.arange(len(intervals)), days)
+        offset = np.arange(len(row)) - np.repeat(np.cumsum(days) - days, days)
+        
+        expanded = pd.DataFrame({
+            'Date': intervals['start'].to_numpy()[row] + offset * DAY,
+            'Views': intervals['views_delta'].to_numpy()[row] / days[row],
+            'Likes': intervals['likes_delta'].to_numpy()[row] / days[row],
+            'Comments': intervals['comments_delta'].to_numpy()[row] / days[row],
+        })
+        daily = expanded.groupby('Date').sum()
+        full_range = pd.date_range(daily.index.min(), daily.index.max(), freq='D')
+        return daily.reindex(full_range, fill_value=0).rename_axis('Date').reset_index()
+    
+    def to_detector(self):
+        """BotDetectionEngine loaded with the daily velocity series"""
+        from bot_detection_engine import BotDetectionEngine
+        
+        detector = BotDetectionEngine(self.channel_name)
+        detector.data = self.daily_velocity()
+        detector._identify_metrics()
+        return detector
+
+
+def main(argv=None):
+    from fleet_runner import channel_name_from_path
+    
+    paths = sys.argv[1:] if argv is None else argv
+    if len(paths) < 2:
+        print("Usage: python snapshot_diff.py SNAPSHOT.csv SNAPSHOT.csv [...]")
+        return 1
+    
+    engine = SnapshotDiffEngine(channel_name_from_path(paths[0])).load_snapshots(paths)
+    print(f"\n📸 {engine.channel_name}: {len(engine.snapshots)} snapshots")
+    print(engine.channel_deltas().to_string(index=False))
+    
+    results = engine.to_detector().run_full_analysis()
+    print(f"\n📊 Velocity-based authenticity: {results['authenticity']['score']:.1f}/100 ({results['authenticity']['rating']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
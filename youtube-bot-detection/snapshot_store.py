@@ -0,0 +1,345 @@
+"""
+Snapshot Store - YouTube Bot Detection System
+Delta-encoded on-disk history of daily per-video vidIQ snapshots with as-of-date rebuilds
+
+Usage:
+    python snapshot_store.py add "vidIQ CSV export for THE MMA GURU 2025-11-16.csv"
+    python snapshot_store.py asof "THE MMA GURU" 2025-11-09
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import pandas as pd
+import numpy as np
+from snapshot_diff import compact_snapshot, snapshot_date_from_path, METRIC_COLUMNS
+
+STORE_VERSION = 1
+
+STORE_DIR = os.environ.get('SNAPSHOT_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshot_store'))
+
+METRICS = list(METRIC_COLUMNS.values())
+
+
+class SnapshotStore:
+    """
+    Per-channel snapshot history as a base table plus per-snapshot deltas
+
+    Layout of one channel directory:
+        manifest.json       snapshot dates, catalog size at each snapshot
+        catalog_*.npy       video key / publish date per catalog row (append-only)
+        titles.json         display title per catalog row
+        base*.npy           metrics + presence of the first snapshot (memory-mapped on read)
+        latest-<date>.npz   metrics + presence of the newest snapshot, for appends
+        deltas/<date>.npz   compressed rows that changed: metric diffs, appeared/removed rows
+    Unchanged videos cost nothing per snapshot, so storage grows with what changed
+
+    The manifest is the commit point of an append. Every file is replaced
+    atomically, catalog rows past the manifest's catalog_size are ignored and
+    delta / latest files are keyed by snapshot date, so an append interrupted
+    before the manifest is written leaves the stored history intact and can
+    simply be retried
+    """
+    
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+    
+    def channels(self):
+        """Channel names with a stored history"""
+        if not os.path.isdir(self.root):
+            return []
+        names = []
+        for slug in sorted(os.listdir(self.root)):
+            manifest = self._read_manifest(slug)
+            if manifest:
+                names.append(manifest['channel'])
+        return names
+    
+    def snapshot_dates(self, channel):
+        """Stored snapshot dates, oldest first"""
+        manifest = self._read_manifest(self._slug(channel))
+        return [pd.Timestamp(s['date']) for s in manifest['snapshots']] if manifest else []
+    
+    def add_snapshot(self, channel, videos, taken_at):
+        """
+        Append one cleaned per-video export taken on `taken_at`
+        Snapshots must be added in date order; only the difference to the
+        newest stored snapshot is written
+        """
+        taken_at = pd.Timestamp(taken_at).normalize()
+        channel_dir = self._channel_dir(channel)
+        manifest = self._read_manifest(self._slug(channel))
+        compact = compact_snapshot(videos)
+        compact[METRICS] = compact[METRICS].fillna(0)
+        
+        if manifest is None:
+            os.makedirs(os.path.join(channel_dir, 'deltas'), exist_ok=True)
+            manifest = {'version': STORE_VERSION, 'channel': channel, 'snapshots': []}
+            catalog = {'key': np.empty(0, dtype=np.uint64), 'published': np.empty(0, dtype='datetime64[ns]')}
+            titles = []
+            latest = np.zeros((0, len(METRICS)))
+            present = np.zeros(0, dtype=bool)
+        else:
+            last = pd.Timestamp(manifest['snapshots'][-1]['date'])
+            if taken_at <= last:
+                raise ValueError(f"Snapshot {taken_at.date()} is not newer than the last stored one ({last.date()})")
+            # Rows an interrupted append wrote past the committed catalog are dropped
+            stored = manifest['snapshots'][-1]['catalog_size']
+            catalog = {name: np.array(array) for name, array in self._catalog(channel_dir, stored).items()}
+            with open(os.path.join(channel_dir, 'titles.json')) as f:
+                titles = json.load(f)[:stored]
+            latest, present = self._latest(channel_dir, manifest['snapshots'])
+        
+        # Map snapshot videos onto catalog rows, appending unseen videos
+        rows = pd.Index(catalog['key']).get_indexer(compact['key'].to_numpy())
+        unseen = rows < 0
+        first_new = len(catalog['key'])
+        rows[unseen] = np.arange(first_new, first_new + unseen.sum())
+        catalog['key'] = np.r_[catalog['key'], compact['key'].to_numpy()[unseen]]
+        catalog['published'] = np.r_[catalog['published'], compact['published'].to_numpy()[unseen]]
+        titles.extend(compact['title'].where(compact['title'].notna(), None).to_numpy()[unseen].tolist())
+        
+        size = len(catalog['key'])
+        values = np.zeros((size, len(METRICS)))
+        values[:first_new] = latest
+        now_present = np.zeros(size, dtype=bool)
+        now_present[rows] = True
+        new_values = values.copy()
+        new_values[rows] = compact[METRICS].to_numpy(dtype=float)
+        
+        if manifest['snapshots']:
+            was_present = np.r_[present, np.zeros(size - first_new, dtype=bool)]
+            delta = {
+                'appeared': np.flatnonzero(now_present & ~was_present).astype(np.int32),
+                'removed': np.flatnonzero(was_present & ~now_present).astype(np.int32),
+            }
+            for i, name in enumerate(METRICS):
+                diff = new_values[:, i] - values[:, i]
+                changed = np.flatnonzero(diff)
+                delta[f'{name}_row'] = changed.astype(np.int32)
+                delta[f'{name}_delta'] = diff[changed]
+            self._replace(os.path.join(channel_dir, 'deltas', f'{taken_at.date()}.npz'),
+                          lambda f: np.savez_compressed(f, **delta))
+            changed_rows = len(np.unique(np.concatenate([delta[f'{name}_row'] for name in METRICS])))
+        else:
+            self._replace(os.path.join(channel_dir, 'base.npy'), lambda f: np.save(f, new_values))
+            self._replace(os.path.join(channel_dir, 'base_present.npy'), lambda f: np.save(f, now_present))
+            changed_rows = size
+        
+        for name, array in catalog.items():
+            self._replace(os.path.join(channel_dir, f'catalog_{name}.npy'), lambda f: np.save(f, array))
+        self._replace(os.path.join(channel_dir, 'titles.json'), lambda f: f.write(json.dumps(titles).encode()))
+        self._replace(os.path.join(channel_dir, f'latest-{taken_at.date()}.npz'),
+                      lambda f: np.savez(f, values=new_values, present=now_present))
+        
+        manifest['snapshots'].append({'date': str(taken_at.date()), 'catalog_size': size, 'changed_rows': int(changed_rows)})
+        self._write_manifest(channel_dir, manifest)
+        self._drop_stale(channel_dir, manifest)
+        return self
+    
+    def add_export(self, path, channel=None):
+        """Append an export whose filename carries the snapshot date"""
+        from export_cache import read_video_export
+        from fleet_runner import channel_name_from_path
+        
+        return self.add_snapshot(channel or channel_name_from_path(path), read_video_export(path),
+                                 snapshot_date_from_path(path))
+    
+    def as_of(self, channel, date=None):
+        """
+        The channel's videos as of the newest snapshot on or before `date`
+        (latest when None), in cleaned-export columns for VideoDataAdapter
+        """
+        channel_dir = self._channel_dir(channel)
+        manifest = self._require_manifest(channel)
+        snapshots = manifest['snapshots']
+        dates = pd.DatetimeIndex([s['date'] for s in snapshots])
+        position = len(dates) - 1 if date is None else dates.searchsorted(pd.Timestamp(date), side='right') - 1
+        if position < 0:
+            raise ValueError(f"No snapshot of {channel} on or before {pd.Timestamp(date).date()}")
+        
+        size = snapshots[position]['catalog_size']
+        values, present = self._state(channel_dir, snapshots[:position + 1])
+        rows = np.flatnonzero(present)
+        catalog = self._catalog(channel_dir, size)
+        with open(os.path.join(channel_dir, 'titles.json')) as f:
+            titles = np.array(json.load(f)[:size], dtype=object)
+        frame = pd.DataFrame({
+            'TITLE': titles[rows],
+            'DATE PUBLISHED': catalog['published'][rows],
+        })
+        for i, col in enumerate(METRIC_COLUMNS):
+            frame[col] = values[rows, i]
+        return frame
+    
+    def iter_deltas(self, channel, start=None, end=None):
+        """
+        Yield (snapshot date, per-video delta frame) for snapshots in [start, end],
+        reading only those snapshots' delta files
+        Each frame has key, title, published, appeared, removed and <metric>_delta
+        columns for the videos that changed since the previous snapshot
+        """
+        channel_dir = self._channel_dir(channel)
+        manifest = self._require_manifest(channel)
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        selected = [s for s in manifest['snapshots'][1:]
+                    if (start is None or pd.Timestamp(s['date']) >= start)
+                    and (end is None or pd.Timestamp(s['date']) <= end)]
+        if not selected:
+            return
+        
+        catalog = self._catalog(channel_dir)
+        with open(os.path.join(channel_dir, 'titles.json')) as f:
+            titles = np.array(json.load(f), dtype=object)
+        
+        for snapshot, delta in self._iter_delta_files(channel_dir, selected):
+            rows = np.unique(np.concatenate([delta['appeared'], delta['removed']]
+                                            + [delta[f'{name}_row'] for name in METRICS]))
+            frame = pd.DataFrame({
+                'key': catalog['key'][rows],
+                'title': titles[rows],
+                'published': catalog['published'][rows],
+                'appeared': np.isin(rows, delta['appeared']),
+                'removed': np.isin(rows, delta['removed']),
+            })
+            for name in METRICS:
+                column = np.zeros(len(rows))
+                column[np.searchsorted(rows, delta[f'{name}_row'])] = delta[f'{name}_delta']
+                frame[f'{name}_delta'] = column
+            yield pd.Timestamp(snapshot['date']), frame
+    
+    def channel_deltas(self, channel, start=None, end=None):
+        """Per-snapshot channel totals of the stored deltas"""
+        totals = [
+            {'snapshot': date, 'videos_changed': len(frame), 'appeared': int(frame['appeared'].sum()),
+             'removed': int(frame['removed'].sum()),
+             **{f'{name}_delta': float(frame[f'{name}_delta'].sum()) for name in METRICS}}
+            for date, frame in self.iter_deltas(channel, start, end)
+        ]
+        return pd.DataFrame(totals, columns=['snapshot', 'videos_changed', 'appeared', 'removed']
+                            + [f'{name}_delta' for name in METRICS])
+    
+    def storage_bytes(self, channel):
+        """Bytes on disk for one channel's history"""
+        channel_dir = self._channel_dir(channel)
+        return sum(os.path.getsize(os.path.join(dirpath, name))
+                   for dirpath, _, names in os.walk(channel_dir) for name in names)
+    
+    def _state(self, channel_dir, snapshots):
+        """Metrics and presence per catalog row after the last of `snapshots`, from base + deltas"""
+        size = snapshots[-1]['catalog_size']
+        values = np.zeros((size, len(METRICS)))
+        present = np.zeros(size, dtype=bool)
+        base = np.load(os.path.join(channel_dir, 'base.npy'), mmap_mode='r')
+        values[:len(base)] = base
+        present[:len(base)] = np.load(os.path.join(channel_dir, 'base_present.npy'), mmap_mode='r')
+        
+        for _, delta in self._iter_delta_files(channel_dir, snapshots[1:]):
+            present[delta['appeared']] = True
+            present[delta['removed']] = False
+            for i, name in enumerate(METRICS):
+                values[delta[f'{name}_row'], i] += delta[f'{name}_delta']
+        return values, present
+    
+    def _latest(self, channel_dir, snapshots):
+        """State of the newest committed snapshot, rebuilt from the deltas if its file is missing"""
+        path = os.path.join(channel_dir, f"latest-{snapshots[-1]['date']}.npz")
+        if os.path.exists(path):
+            with np.load(path) as npz:
+                return npz['values'], npz['present']
+        return self._state(channel_dir, snapshots)
+    
+    def _iter_delta_files(self, channel_dir, snapshots):
+        for snapshot in snapshots:
+            with np.load(os.path.join(channel_dir, 'deltas', f"{snapshot['date']}.npz")) as npz:
+                yield snapshot, {name: npz[name] for name in npz.files}
+    
+    def _catalog(self, channel_dir, size=None):
+        return {name: np.load(os.path.join(channel_dir, f'catalog_{name}.npy'), mmap_mode='r')[:size]
+                for name in ('key', 'published')}
+    
+    def _slug(self, channel):
+        return re.sub(r'[^A-Za-z0-9_-]+', '_', channel).strip('_') or 'channel'
+    
+    def _channel_dir(self, channel):
+        return os.path.join(self.root, self._slug(channel))
+    
+    def _read_manifest(self, slug):
+        try:
+            with open(os.path.join(self.root, slug, 'manifest.json')) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported snapshot store version: {manifest.get('version')}")
+        return manifest
+    
+    def _require_manifest(self, channel):
+        manifest = self._read_manifest(self._slug(channel))
+        if not manifest or not manifest['snapshots']:
+            raise KeyError(f"No stored snapshots for {channel}")
+        return manifest
+    
+    def _write_manifest(self, channel_dir, manifest):
+        # Commits the append: readers only see snapshots listed here
+        self._replace(os.path.join(channel_dir, 'manifest.json'),
+                      lambda f: f.write(json.dumps(manifest, indent=2).encode()))
+    
+    def _replace(self, path, write):
+        """Write a file under a temporary name and rename it into place, so it is never half-written"""
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    
+    def _drop_stale(self, channel_dir, manifest):
+        """Remove delta, latest and temporary files that no committed snapshot refers to"""
+        dates = {s['date'] for s in manifest['snapshots']}
+        current = f"latest-{manifest['snapshots'][-1]['date']}.npz"
+        stale = [os.path.join('deltas', name) for name in os.listdir(os.path.join(channel_dir, 'deltas'))
+                 if name.endswith('.tmp') or name.removesuffix('.npz') not in dates]
+        stale += [name for name in os.listdir(channel_dir) if name.endswith('.tmp')
+                  or (name.startswith('latest') and name.endswith('.npz') and name != current)]
+        for name in stale:
+            os.remove(os.path.join(channel_dir, name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delta-encoded store of daily vidIQ snapshots")
+    parser.add_argument('--store', default=STORE_DIR, help="store directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="append dated per-video exports")
+    add.add_argument('exports', nargs='+')
+    add.add_argument('--channel', help="channel name (default: from the filename)")
+    asof = commands.add_parser('asof', help="rebuild a channel as of a date")
+    asof.add_argument('channel')
+    asof.add_argument('date', nargs='?')
+    asof.add_argument('-o', '--output', help="write the rebuilt export to this CSV")
+    history = commands.add_parser('deltas', help="per-snapshot channel deltas")
+    history.add_argument('channel')
+    history.add_argument('--start')
+    history.add_argument('--end')
+    args = parser.parse_args(argv)
+    
+    store = SnapshotStore(args.store)
+    if args.command == 'add':
+        for path in sorted(args.exports, key=snapshot_date_from_path):
+            store.add_export(path, args.channel)
+            print(f"📸 Stored {os.path.basename(path)}")
+    elif args.command == 'asof':
+        frame = store.as_of(args.channel, args.date)
+        if args.output:
+            frame.to_csv(args.output, index=False)
+            print(f"✅ {len(frame)} videos written to {args.output}")
+        else:
+            print(frame.to_string(index=False))
+    else:
+        print(store.channel_deltas(args.channel, args.start, args.end).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
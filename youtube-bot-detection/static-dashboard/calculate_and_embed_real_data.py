@@ -7,24 +7,12 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+import sys
 
-def parse_number(value):
-    """Parse numbers with K/M suffixes from CSV"""
-    if pd.isna(value):
-        return 0
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    value_str = str(value).strip()
-    if value_str.endswith('K'):
-        return float(value_str[:-1]) * 1000
-    elif value_str.endswith('M'):
-        return float(value_str[:-1]) * 1000000
-    else:
-        try:
-            return float(value_str.replace(',', ''))
-        except:
-            return 0
+# Shared loaders live in the parent project directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from number_parser import parse_number_column
+from export_cache import read_video_export
 
 def calculate_real_metrics(csv_path, channel_name):
     """Calculate ACTUAL metrics from CSV data - NO SIMULATION!"""
@@ -34,17 +22,12 @@ def calculate_real_metrics(csv_path, channel_name):
     
     try:
         # Load the actual CSV file
-        df = pd.read_csv(csv_path)
+        df = read_video_export(csv_path)
         print(f"✓ Loaded {len(df)} videos from CSV")
         
-        # Parse numeric columns
-        for col in ['VIEWS', 'YT LIKES', 'YT COMMENTS']:
-            if col in df.columns:
-                df[col] = df[col].apply(parse_number)
-        
         # Parse duration to filter out livestreams (if column exists)
         if 'DURATION' in df.columns:
-            df['DURATION'] = df['DURATION'].apply(parse_number)
+            df['DURATION'] = parse_number_column(df['DURATION'])
             # Filter out livestreams (over 90 minutes)
             df_filtered = df[df['DURATION'] < 5400]
             print(f"✓ Filtered to {len(df_filtered)} non-livestream videos")
@@ -8,6 +8,11 @@ import numpy as np
 import json
 from pathlib import Path
 from datetime import datetime
+import sys
+
+# Shared loaders live in the parent project directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from export_cache import read_video_export
 
 class RealDataProcessor:
     """Process REAL CSV data for forensic analysis"""
@@ -26,34 +31,11 @@ class RealDataProcessor:
             'chael': {'engagement': 4.1, 'variance': 0.38, 'spike_ratio': 1.91}
         }
         
-    def parse_number(self, value):
-        """Parse numbers with K/M suffixes"""
-        if pd.isna(value):
-            return 0
-        if isinstance(value, (int, float)):
-            return float(value)
-        
-        value_str = str(value).strip()
-        if value_str.endswith('K'):
-            return float(value_str[:-1]) * 1000
-        elif value_str.endswith('M'):
-            return float(value_str[:-1]) * 1000000
-        else:
-            try:
-                return float(value_str.replace(',', ''))
-            except:
-                return 0
-    
     def calculate_real_metrics(self, csv_path, channel_name):
         """Calculate REAL metrics from actual CSV data"""
         try:
             print(f"Loading {channel_name} data from: {csv_path}")
-            df = pd.read_csv(csv_path)
-            
-            # Parse numeric columns
-            for col in ['VIEWS', 'YT LIKES', 'YT COMMENTS']:
-                if col in df.columns:
-                    df[col] = df[col].apply(self.parse_number)
+            df = read_video_export(csv_path)
             
             # Calculate REAL engagement rate
             total_views = df['VIEWS'].sum()
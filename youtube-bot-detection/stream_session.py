@@ -0,0 +1,104 @@
+"""
+Stream Session - YouTube Bot Detection System
+Per-connection incremental detector state for the streaming WebSocket protocol
+
+Protocol (JSON text messages on /ws/analyze):
+    client  {"type": "start", "channel_name": "..."}                 optional
+    server  {"type": "ready", "max_batch_rows": ..., "max_pending_batches": ...}
+    client  {"type": "rows", "seq": 1, "rows": [{"Date": ..., "Views": ...}, ...]}
+            {"type": "rows", "seq": 2, "csv": "Date,Views,Subscribers\\n..."}
+    server  {"type": "update", "seq": 1, "new_spikes": [...], "authenticity_score": ..., "pending_batches": ...}
+    client  {"type": "end"}
+    server  {"type": "complete", ...}
+"""
+
+import io
+import pandas as pd
+from incremental_engine import IncrementalBotDetectionEngine
+
+# Largest batch accepted in one message, and batches buffered per connection
+# before the server stops reading from the socket (backpressure)
+MAX_BATCH_ROWS = 10000
+MAX_PENDING_BATCHES = 8
+
+
+class StreamingSession:
+    """
+    Incremental detector for one streaming connection
+    Drops, anomalies and rolling baselines update from the last `window` rows,
+    but spike detection and the score re-run over the whole stored history, so
+    each batch costs O(rows ingested so far) and long streams slow down
+    linearly; only newly detected events are returned
+    """
+    
+    def __init__(self, channel_name, max_batch_rows=MAX_BATCH_ROWS):
+        self.channel_name = channel_name
+        self.max_batch_rows = max_batch_rows
+        self.engine = IncrementalBotDetectionEngine(channel_name)
+        self.rows = 0
+        self.batches = 0
+    
+    @staticmethod
+    def batch_size(message):
+        """Row count of a 'rows' message, without parsing it"""
+        if 'rows' in message:
+            return len(message['rows'])
+        csv_text = message.get('csv') or ''
+        return max(csv_text.strip().count('\n'), 0)
+    
+    def parse_batch(self, message):
+        """DataFrame for a 'rows' message (row dicts or CSV text with a header)"""
+        if self.batch_size(message) > self.max_batch_rows:
+            raise ValueError(f"Batch exceeds {self.max_batch_rows} rows; split it into smaller batches")
+        if 'rows' in message:
+            batch = pd.DataFrame(message['rows'])
+        elif message.get('csv'):
+            batch = pd.read_csv(io.StringIO(message['csv']))
+        else:
+            raise ValueError("'rows' message needs a 'rows' list or 'csv' text")
+        if batch.empty:
+            raise ValueError("Empty batch")
+        return batch
+    
+    def ingest(self, message):
+        """Append one batch; returns the update message for the client"""
+        batch = self.parse_batch(message)
+        new_events = self.engine.append(batch)
+        if not self.engine.view_cols + self.engine.sub_cols:
+            # The first batch fixes the columns; start over so the client can retry
+            self.engine = IncrementalBotDetectionEngine(self.channel_name)
+            raise ValueError("No numeric view or subscriber columns in the first batch")
+        
+        self.rows += len(batch)
+        self.batches += 1
+        score = self.engine.generate_authenticity_score()
+        return {
+            "type": "update",
+            "seq": message.get('seq', self.batches),
+            "rows_received": len(batch),
+            "rows_ingested": self.rows,
+            "new_spikes": new_events['spikes'].to_json_records(),
+            "new_drops": new_events['drops'].to_json_records(),
+            "new_anomalies": new_events['anomalies'].to_json_records(),
+            "authenticity_score": score['score'],
+            "rating": score['rating']
+        }
+    
+    def summary(self):
+        """Final totals over everything ingested"""
+        if not self.rows:
+            return {"channel": self.channel_name, "rows_ingested": 0, "batches": 0}
+        
+        columns = self.engine.view_cols + self.engine.sub_cols
+        score = self.engine.generate_authenticity_score()
+        return {
+            "channel": self.channel_name,
+            "rows_ingested": self.rows,
+            "batches": self.batches,
+            "total_spikes": sum(len(self.engine.detect_spikes(col)) for col in columns),
+            "total_drops": sum(len(self.engine.detect_cliff_drops(col)) for col in columns),
+            "total_anomalies": sum(len(self.engine.detect_statistical_anomalies(col)) for col in columns),
+            "authenticity_score": score['score'],
+            "rating": score['rating'],
+            "key_findings": score['reasons'][:5]
+        }
@@ -0,0 +1,41 @@
+"""
+Test script for the API's analysis process pool
+Kills a worker mid-call and checks the pool serves the next calls instead of staying broken
+"""
+
+import os
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from analysis_pool import AnalysisPool
+
+
+def crash_worker():
+    os._exit(1)
+
+
+def square(x):
+    return x * x
+
+
+def test_pool_recovers_after_worker_crash():
+    """Only the call that was running when the worker died fails; later calls get a fresh pool"""
+    async def scenario():
+        pool = AnalysisPool(workers=1).start()
+        try:
+            assert await pool.run(square, 3) == 9
+            try:
+                await pool.run(crash_worker)
+                raise AssertionError("the worker crash was not reported")
+            except BrokenProcessPool:
+                pass
+            assert await pool.run(square, 4) == 16
+            assert await asyncio.gather(*[pool.run(square, i) for i in range(5)]) == [0, 1, 4, 9, 16]
+        finally:
+            pool.shutdown()
+    
+    asyncio.run(scenario())
+    print("✅ Analysis pool recovered from a dead worker")
+
+
+if __name__ == "__main__":
+    test_pool_recovers_after_worker_crash()
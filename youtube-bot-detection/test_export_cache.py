@@ -0,0 +1,81 @@
+"""
+Test script for the on-disk export cache
+Hashes exports from several worker processes at once and checks eviction of old, stale-version and excess frames
+"""
+
+import os
+import time
+import tempfile
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from export_cache import ExportCache, PARSER_VERSION
+
+
+def write_export(path, rows):
+    pd.DataFrame({'Date': pd.date_range('2024-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'),
+                  'Views': range(rows)}).to_csv(path, index=False)
+
+
+def hash_in_worker(cache_dir, path):
+    return ExportCache(cache_dir).content_hash(path)
+
+
+def test_parallel_workers_keep_every_index_entry():
+    """Workers hashing different exports at once all leave their index entry behind"""
+    with tempfile.TemporaryDirectory() as root:
+        cache_dir = os.path.join(root, 'cache')
+        paths = [os.path.join(root, f'export_{i}.csv') for i in range(32)]
+        for rows, path in enumerate(paths, start=5):
+            write_export(path, rows)
+        
+        with ProcessPoolExecutor(4) as pool:
+            digests = list(pool.map(hash_in_worker, [cache_dir] * len(paths), paths))
+        
+        cache = ExportCache(cache_dir)
+        for path, digest in zip(paths, digests):
+            entry = cache._read_index(cache._index_path(os.path.abspath(path)))
+            assert entry is not None and entry['sha256'] == digest, path
+    
+    print("✅ Every worker's index entry survived")
+
+
+def test_prune_drops_old_versions_and_least_recently_used():
+    """Stale parser versions go at once; beyond max_bytes the least recently used frames go first"""
+    with tempfile.TemporaryDirectory() as root:
+        cache = ExportCache(os.path.join(root, 'cache'))
+        paths = [os.path.join(root, f'export_{i}.csv') for i in range(3)]
+        frame_files = []
+        for rows, path in enumerate(paths, start=200):
+            write_export(path, rows)
+            cache.load(path, 'raw', pd.read_csv)
+            frame_files.append(os.path.join(cache.cache_dir, f"{cache.content_hash(path)}-raw-v{PARSER_VERSION}.pkl"))
+        
+        stale = os.path.join(cache.cache_dir, f"{'0' * 64}-raw-v{PARSER_VERSION - 1}.pkl")
+        with open(stale, 'wb') as f:
+            f.write(b'old')
+        
+        # export_0 was stored first but is read again, so export_1 becomes the least recently used
+        for age, frame_file in enumerate(frame_files):
+            stamp = time.time() - 1000 * (3 - age)
+            os.utime(frame_file, (stamp, stamp))
+        cache.load(paths[0], 'raw', pd.read_csv)
+        assert cache.hits == 1
+        
+        assert cache.prune() == 1
+        assert not os.path.exists(stale)
+        
+        cache.max_bytes = os.path.getsize(frame_files[0]) + os.path.getsize(frame_files[2])
+        assert cache.prune() == 1
+        assert [os.path.exists(frame_file) for frame_file in frame_files] == [True, False, True]
+        
+        cache.max_age = 0
+        assert cache.prune() == 2
+        assert not any(os.path.exists(frame_file) for frame_file in frame_files)
+        assert cache.load(paths[0], 'raw', pd.read_csv).equals(pd.read_csv(paths[0]))
+    
+    print("✅ Prune removed stale versions, then least recently used frames")
+
+
+if __name__ == "__main__":
+    test_parallel_workers_keep_every_index_entry()
+    test_prune_drops_old_versions_and_least_recently_used()
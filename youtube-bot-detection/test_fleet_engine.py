@@ -0,0 +1,63 @@
+"""
+Test script for the fleet bot detection engine
+Checks per-channel scores against BotDetectionEngine and the handling of rows without a channel
+"""
+
+import io
+import contextlib
+import pandas as pd
+import numpy as np
+from bot_detection_engine import BotDetectionEngine
+from fleet_engine import FleetBotDetectionEngine
+
+
+def make_fleet(channels=3, rows=120, seed=5):
+    """Long-format frame of several synthetic channel histories"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(channels):
+        views = rng.poisson(3000, rows).astype(float)
+        views[rng.choice(rows, 3, replace=False)] *= rng.uniform(5, 20, 3)
+        frames.append(pd.DataFrame({
+            'channel': f'Channel {i}',
+            'Date': pd.date_range('2024-01-01', periods=rows, freq='D'),
+            'Views': views,
+            'Subscribers': rng.poisson(30, rows).astype(float)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_scores_match_single_channel_engine():
+    """Each channel's score equals BotDetectionEngine run on that channel alone"""
+    fleet = make_fleet()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scores = FleetBotDetectionEngine().analyze(fleet).set_index('channel')
+        for channel, rows in fleet.groupby('channel'):
+            single = BotDetectionEngine(channel)
+            single.data = rows.drop(columns=['channel']).reset_index(drop=True)
+            single._identify_metrics()
+            assert np.isclose(scores.loc[channel, 'score'], single.generate_authenticity_score()['score']), channel
+    
+    print("✅ Fleet scores matched per-channel analysis")
+
+
+def test_rows_without_channel_are_rejected():
+    """Missing channel values raise a clear error instead of indexing another channel's block"""
+    fleet = make_fleet()
+    fleet.loc[fleet.index[-5:], 'channel'] = None
+    try:
+        FleetBotDetectionEngine().analyze(fleet)
+        raise AssertionError("rows without a channel were accepted")
+    except ValueError as e:
+        assert "5 row(s) have no 'channel' value" in str(e), e
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        scores = FleetBotDetectionEngine().analyze(fleet.dropna(subset=['channel']))
+    assert len(scores) == 3
+    
+    print("✅ Rows without a channel were rejected")
+
+
+if __name__ == "__main__":
+    test_scores_match_single_channel_engine()
+    test_rows_without_channel_are_rejected()
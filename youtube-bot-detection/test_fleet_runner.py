@@ -0,0 +1,66 @@
+"""
+Test script for the fleet runner
+Runs a small directory of exports, one of which kills its worker process, and checks every file gets a record
+"""
+
+import io
+import os
+import json
+import tempfile
+import contextlib
+import pandas as pd
+import numpy as np
+import fleet_runner
+from fleet_runner import run_fleet
+
+
+def write_daily_export(path, seed):
+    """Daily channel export with a couple of spikes"""
+    rng = np.random.default_rng(seed)
+    views = rng.poisson(4000, 90).astype(float)
+    views[rng.choice(90, 2, replace=False)] *= 10
+    pd.DataFrame({
+        'Date': pd.date_range('2024-01-01', periods=90, freq='D').strftime('%Y-%m-%d'),
+        'Views': views,
+        'Subscribers': rng.poisson(30, 90)
+    }).to_csv(path, index=False)
+
+
+def crash_on_marker(path, channel_name, timeout=None):
+    """analyze_file, except that exports named 'crash' kill the worker process"""
+    if 'crash' in os.path.basename(path):
+        os._exit(1)
+    return analyze_file(path, channel_name, timeout)
+
+
+analyze_file = fleet_runner.analyze_file
+
+
+def test_dead_worker_does_not_abort_the_run():
+    """A worker that dies mid-file costs that file an error record; every other file is still analyzed"""
+    with tempfile.TemporaryDirectory() as root:
+        names = ['alpha', 'bravo', 'crash', 'delta', 'echo']
+        for seed, name in enumerate(names):
+            write_daily_export(os.path.join(root, f'{name}.csv'), seed)
+        output = os.path.join(root, 'results.ndjson')
+        
+        fleet_runner.analyze_file = crash_on_marker
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                counts = run_fleet(root, output, workers=2)
+        finally:
+            fleet_runner.analyze_file = analyze_file
+        
+        with open(output) as f:
+            records = {record['channel']: record for record in map(json.loads, f)}
+        assert sorted(records) == names
+        assert records['crash']['status'] == 'error'
+        assert 'BrokenProcessPool' in records['crash']['error']
+        assert all(records[name]['status'] == 'ok' for name in names if name != 'crash')
+        assert counts == {'ok': 4, 'error': 1, 'timeout': 0}
+    
+    print("✅ Dead worker produced one error record and the run finished")
+
+
+if __name__ == "__main__":
+    test_dead_worker_does_not_abort_the_run()
@@ -0,0 +1,171 @@
+"""
+Test script for the incremental (append-only) bot detection engine
+Replays a history one row at a time and checks every step against a full recompute
+"""
+
+import io
+import contextlib
+import pandas as pd
+import numpy as np
+from bot_detection_engine import BotDetectionEngine
+from incremental_engine import IncrementalBotDetectionEngine
+from event_table import EventTable
+
+
+def make_history(rows=240, seed=7):
+    """Synthetic daily history with spikes, purges, zero days and missing values"""
+    rng = np.random.default_rng(seed)
+    views = rng.poisson(2000, rows).astype(float)
+    views[rng.random(rows) < 0.03] = 0
+    views[rng.choice(rows, 6, replace=False)] *= rng.uniform(4, 30, 6)
+    purges = rng.random(rows) < 0.03
+    views[purges] *= 0.2
+    views[rng.random(rows) < 0.02] = np.nan
+    subs = rng.poisson(25, rows).astype(float)
+    subs[rng.choice(rows, 3, replace=False)] *= 15
+    return pd.DataFrame({
+        'Date': pd.date_range('2024-01-01', periods=rows, freq='D'),
+        'Views': views,
+        'Subscribers': subs
+    })
+
+
+def assert_tables_match(incremental, full):
+    """Same events, with values compared to float tolerance"""
+    if not isinstance(full, EventTable):
+        assert len(incremental) == 0
+        return
+    assert len(incremental) == len(full), f"{incremental} != {full}"
+    assert (incremental.dates == full.dates).all()
+    assert list(incremental.metric_names()) == list(full.metric_names())
+    for attr in ('values', 'baselines', 'ratios', 'severities'):
+        assert np.allclose(getattr(incremental, attr).astype(float),
+                           getattr(full, attr).astype(float), equal_nan=True), attr
+
+
+def assert_dicts_match(incremental, full):
+    """Nested result dicts equal, numbers compared to float tolerance"""
+    assert incremental.keys() == full.keys()
+    for key, value in full.items():
+        if isinstance(value, dict):
+            assert_dicts_match(incremental[key], value)
+        elif isinstance(value, str):
+            assert incremental[key] == value, key
+        else:
+            assert np.isclose(float(incremental[key]), float(value), equal_nan=True), key
+
+
+def emitted_for(tables, column):
+    """Events for one column out of the per-append tables"""
+    events = EventTable.concat(tables)
+    return events.take(np.flatnonzero(events.metric_names() == column))
+
+
+def test_replay_matches_full_recompute():
+    """Appending one row at a time must match BotDetectionEngine on every prefix"""
+    history = make_history()
+    online = IncrementalBotDetectionEngine("replay")
+    emitted = {'spikes': [], 'drops': [], 'anomalies': []}
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(len(history)):
+            new_events = online.append(history.iloc[i:i + 1])
+            for kind, table in new_events.items():
+                emitted[kind].append(table)
+            
+            full = BotDetectionEngine("replay")
+            full.data = history.iloc[:i + 1].reset_index(drop=True)
+            full._identify_metrics()
+            
+            for col in full.view_cols + full.sub_cols:
+                assert_tables_match(online.detect_spikes(col), full.detect_spikes(col))
+                assert_tables_match(online.detect_cliff_drops(col), full.detect_cliff_drops(col))
+                assert_tables_match(online.detect_statistical_anomalies(col), full.detect_statistical_anomalies(col))
+            
+            assert_dicts_match(online.calculate_engagement_metrics(), full.calculate_engagement_metrics())
+            assert_dicts_match(online.analyze_growth_patterns(), full.analyze_growth_patterns())
+            assert_dicts_match(online.detect_time_patterns(), full.detect_time_patterns())
+            
+            online_score = online.generate_authenticity_score()
+            full_score = full.generate_authenticity_score()
+            assert np.isclose(online_score['score'], full_score['score'])
+            assert online_score['reasons'] == full_score['reasons']
+    
+    # Drops and anomalies are final once emitted; emitted spikes cover the final set
+    for col in online.view_cols + online.sub_cols:
+        assert_tables_match(emitted_for(emitted['drops'], col), full.detect_cliff_drops(col))
+        assert_tables_match(emitted_for(emitted['anomalies'], col), full.detect_statistical_anomalies(col))
+        spike_dates = set(emitted_for(emitted['spikes'], col).dates.tolist())
+        assert set(full.detect_spikes(col).dates.tolist()) <= spike_dates
+    
+    print(f"✅ Incremental replay matched full recompute on {len(history)} prefixes")
+
+
+def test_bulk_append_matches_replay():
+    """Seeding with a whole frame gives the same state as row-by-row appends"""
+    history = make_history(rows=120, seed=11)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        bulk = IncrementalBotDetectionEngine("bulk")
+        bulk.data = history.iloc[:90]
+        bulk.append(history.iloc[90:])
+        
+        rows = IncrementalBotDetectionEngine("rows")
+        for i in range(len(history)):
+            rows.append(history.iloc[i:i + 1])
+        
+        bulk_score = bulk.generate_authenticity_score()
+        rows_score = rows.generate_authenticity_score()
+        assert np.isclose(bulk_score['score'], rows_score['score'])
+        assert bulk_score['reasons'] == rows_score['reasons']
+        for col in rows.view_cols + rows.sub_cols:
+            assert_tables_match(bulk.detect_spikes(col), rows.detect_spikes(col))
+            assert_tables_match(bulk.detect_cliff_drops(col), rows.detect_cliff_drops(col))
+            assert_tables_match(bulk.detect_statistical_anomalies(col), rows.detect_statistical_anomalies(col))
+    
+    print("✅ Bulk and row-by-row appends agree")
+
+
+
+def test_bad_batch_leaves_state_unchanged():
+    """A batch that fails validation raises and changes nothing; later appends match a clean engine"""
+    history = make_history(rows=100, seed=3)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        clean = IncrementalBotDetectionEngine("clean")
+        clean.append(history.iloc[:60])
+        online = IncrementalBotDetectionEngine("online")
+        online.append(history.iloc[:60])
+        
+        bad = history.iloc[60:63].astype({'Views': object})
+        bad.loc[bad.index[1], 'Views'] = 'n/a'
+        try:
+            online.append(bad)
+            raise AssertionError("the non-numeric batch was accepted")
+        except ValueError as e:
+            assert "'Views'" in str(e), e
+        try:
+            online.append(history.iloc[60:63].assign(Date=['2024-03-01', '2024-03-02', '2024-02-30']))
+            raise AssertionError("the unparseable dates were accepted")
+        except ValueError:
+            pass
+        assert len(online.data) == 60
+        
+        clean.append(history.iloc[60:])
+        online.append(history.iloc[60:])
+        assert len(online.data) == len(clean.data) == len(history)
+        for col in clean.view_cols + clean.sub_cols:
+            assert_tables_match(online.detect_spikes(col), clean.detect_spikes(col))
+            assert_tables_match(online.detect_cliff_drops(col), clean.detect_cliff_drops(col))
+            assert_tables_match(online.detect_statistical_anomalies(col), clean.detect_statistical_anomalies(col))
+        assert_dicts_match(online.analyze_growth_patterns(), clean.analyze_growth_patterns())
+        assert_dicts_match(online.detect_time_patterns(), clean.detect_time_patterns())
+        assert online.generate_authenticity_score() == clean.generate_authenticity_score()
+    
+    print("✅ Rejected batches left the engine state unchanged")
+
+
+if __name__ == "__main__":
+    test_replay_matches_full_recompute()
+    test_bulk_append_matches_replay()
+    test_bad_batch_leaves_state_unchanged()
@@ -0,0 +1,60 @@
+"""
+Test script for the triple-baseline forensic comparison
+Checks compare_to_baselines against explicit baselines and its errors for missing or clashing ones
+"""
+
+import io
+import contextlib
+from multi_baseline_forensics import ForensicBotDetector
+
+
+def make_patterns(amplitude, build_days, engagement_rate):
+    """molecular_pattern_analysis-shaped patterns with one spike"""
+    return {
+        'spikes': [{'amplitude': amplitude, 'build_days': build_days}],
+        'engagement_rate': engagement_rate,
+        'plateaus': []
+    }
+
+
+BASELINES = {
+    'Jesse ON FIRE': make_patterns(150, 4, 3.5),
+    'Michael Bisping': make_patterns(180, 5, 3.0),
+    'Chael Sonnen': make_patterns(120, 3, 4.0)
+}
+
+
+def test_compares_target_to_every_baseline():
+    """One similarity per explicit baseline, with a target that matches them read as organic"""
+    detector = ForensicBotDetector()
+    with contextlib.redirect_stdout(io.StringIO()):
+        comparison, verdict, _ = detector.compare_to_baselines(make_patterns(150, 4, 3.5), BASELINES)
+    assert list(comparison) == list(BASELINES)
+    assert comparison['Jesse ON FIRE'] == 100
+    assert verdict == "LIKELY ORGANIC"
+    
+    print("✅ Target compared to every baseline")
+
+
+def test_missing_or_clashing_baselines_are_rejected():
+    """No profile and no baselines, no baselines at all, or a baseline named like the target raise ValueError"""
+    detector = ForensicBotDetector()
+    target = make_patterns(150, 4, 3.5)
+    cases = [
+        (None, "no baseline profile loaded"),
+        ({}, "At least one baseline"),
+        ({**BASELINES, detector.target: make_patterns(900, 1, 0.5)}, "has the target channel's name")
+    ]
+    for baselines, message in cases:
+        try:
+            detector.compare_to_baselines(target, baselines)
+            raise AssertionError(f"accepted baselines: {baselines}")
+        except ValueError as e:
+            assert message in str(e), e
+    
+    print("✅ Missing and clashing baselines were rejected")
+
+
+if __name__ == "__main__":
+    test_compares_target_to_every_baseline()
+    test_missing_or_clashing_baselines_are_rejected()
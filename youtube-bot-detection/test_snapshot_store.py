@@ -0,0 +1,109 @@
+"""
+Test script for the delta-encoded snapshot store
+Checks as-of rebuilds against the stored exports, including after an append that crashed mid-write
+"""
+
+import os
+import tempfile
+import pandas as pd
+import numpy as np
+from snapshot_store import SnapshotStore
+
+
+def make_snapshot(views, titles=('Fight A', 'Fight B', 'Fight C')):
+    """Cleaned per-video export with one row per title"""
+    return pd.DataFrame({
+        'TITLE': list(titles),
+        'DATE PUBLISHED': pd.to_datetime(['2024-01-01', '2024-01-05', '2024-01-09', '2024-01-20'][:len(titles)]),
+        'VIEWS': np.asarray(views, dtype=float),
+        'YT LIKES': np.asarray(views, dtype=float) / 10,
+        'YT COMMENTS': np.zeros(len(titles))
+    })
+
+
+class CrashingStore(SnapshotStore):
+    """Store whose next manifest write fails, as if the process died just before committing"""
+    
+    crash = False
+    
+    def _write_manifest(self, channel_dir, manifest):
+        if self.crash:
+            self.crash = False
+            raise OSError("simulated crash")
+        super()._write_manifest(channel_dir, manifest)
+
+
+def test_as_of_rebuilds_each_snapshot():
+    """Every stored date rebuilds the views of the export stored for it"""
+    snapshots = {
+        '2024-02-01': [10, 20, 30],
+        '2024-02-02': [15, 25, 35],
+        '2024-02-03': [100, 200, 300],
+    }
+    with tempfile.TemporaryDirectory() as root:
+        store = SnapshotStore(root)
+        for date, views in snapshots.items():
+            store.add_snapshot('ch', make_snapshot(views), date)
+        
+        for date, views in snapshots.items():
+            assert store.as_of('ch', date)['VIEWS'].tolist() == views, date
+        assert store.as_of('ch', '2024-02-02 12:00')['VIEWS'].tolist() == snapshots['2024-02-02']
+    
+    print("✅ As-of rebuilds matched every stored snapshot")
+
+
+def test_interrupted_append_can_be_retried():
+    """A crash before the manifest is written leaves history intact, and the retry stores the right delta"""
+    with tempfile.TemporaryDirectory() as root:
+        store = CrashingStore(root)
+        store.add_snapshot('ch', make_snapshot([10, 20, 30]), '2024-02-01')
+        store.add_snapshot('ch', make_snapshot([15, 25, 35]), '2024-02-02')
+        
+        # The crashed append also saw a new video, whose catalog row must not leak
+        store.crash = True
+        crashed = make_snapshot([100, 200, 300, 7], titles=('Fight A', 'Fight B', 'Fight C', 'Fight D'))
+        try:
+            store.add_snapshot('ch', crashed, '2024-02-03')
+            raise AssertionError("the injected crash did not happen")
+        except OSError:
+            pass
+        
+        assert [str(d.date()) for d in store.snapshot_dates('ch')] == ['2024-02-01', '2024-02-02']
+        assert store.as_of('ch')['VIEWS'].tolist() == [15, 25, 35]
+        
+        store.add_snapshot('ch', make_snapshot([100, 200, 300]), '2024-02-03')
+        assert store.as_of('ch', '2024-02-02')['VIEWS'].tolist() == [15, 25, 35]
+        assert store.as_of('ch', '2024-02-03')['VIEWS'].tolist() == [100, 200, 300]
+        assert store.as_of('ch')['TITLE'].tolist() == ['Fight A', 'Fight B', 'Fight C']
+        
+        store.add_snapshot('ch', make_snapshot([110, 210, 310]), '2024-02-04')
+        assert store.as_of('ch', '2024-02-03')['VIEWS'].tolist() == [100, 200, 300]
+        assert store.as_of('ch')['VIEWS'].tolist() == [110, 210, 310]
+        
+        channel_dir = store._channel_dir('ch')
+        assert sorted(os.listdir(os.path.join(channel_dir, 'deltas'))) == [
+            '2024-02-02.npz', '2024-02-03.npz', '2024-02-04.npz']
+        assert [name for name in os.listdir(channel_dir) if name.startswith('latest')] == ['latest-2024-02-04.npz']
+    
+    print("✅ Interrupted append left history intact and retried cleanly")
+
+
+def test_missing_latest_is_rebuilt():
+    """Appends still work when the newest snapshot's state file is gone"""
+    with tempfile.TemporaryDirectory() as root:
+        store = SnapshotStore(root)
+        store.add_snapshot('ch', make_snapshot([10, 20, 30]), '2024-02-01')
+        store.add_snapshot('ch', make_snapshot([15, 25, 35]), '2024-02-02')
+        os.remove(os.path.join(store._channel_dir('ch'), 'latest-2024-02-02.npz'))
+        
+        store.add_snapshot('ch', make_snapshot([40, 50, 60]), '2024-02-03')
+        assert store.as_of('ch', '2024-02-02')['VIEWS'].tolist() == [15, 25, 35]
+        assert store.as_of('ch')['VIEWS'].tolist() == [40, 50, 60]
+    
+    print("✅ Missing latest state was rebuilt from the deltas")
+
+
+if __name__ == "__main__":
+    test_as_of_rebuilds_each_snapshot()
+    test_interrupted_append_can_be_retried()
+    test_missing_latest_is_rebuilt()
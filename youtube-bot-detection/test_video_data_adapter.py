@@ -0,0 +1,82 @@
+"""
+Test script for VideoDataAdapter's chunked streaming mode
+Streams an export in small chunks and checks the daily stats against a full load
+"""
+
+import io
+import os
+import tempfile
+import contextlib
+import pandas as pd
+import numpy as np
+import export_cache
+from export_cache import ExportCache
+from video_data_adapter import VideoDataAdapter
+
+
+def make_export(path, videos=2000, seed=3, mixed_dates=False):
+    """Per-video vidIQ export with K/M display numbers; optionally mixed DATE PUBLISHED layouts"""
+    rng = np.random.default_rng(seed)
+    published = pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 400, videos), unit='D')
+    dates = published.strftime('%d/%m/%Y').to_numpy(dtype=object)
+    if mixed_dates:
+        layout = rng.random(videos)
+        iso = layout < 0.2
+        dates[iso] = published[iso].strftime('%Y-%m-%d')
+        dates[(layout >= 0.2) & (layout < 0.25)] = published[(layout >= 0.2) & (layout < 0.25)].strftime('%b %d %Y')
+        dates[(layout >= 0.25) & (layout < 0.27)] = None
+    views = rng.integers(100, 3_000_000, videos)
+    pd.DataFrame({
+        'TITLE': [f'Video {i}' for i in range(videos)],
+        'DATE PUBLISHED': dates,
+        'VIEWS': [f'{v / 1e6:.1f}M' if v >= 1e6 else f'{v / 1e3:.1f}K' if v >= 1e3 else str(v) for v in views],
+        'YT LIKES': rng.integers(0, 5000, videos),
+        'YT COMMENTS': rng.integers(0, 500, videos),
+        'ENGAGEMENT RATE': np.where(rng.random(videos) < 0.1, np.nan, rng.uniform(0, 10, videos))
+    }).to_csv(path, index=False)
+
+
+def load_both(path, chunksize):
+    """(full load, streamed) daily stats of one export, with the export cache in a scratch directory"""
+    previous = export_cache._default_cache
+    export_cache._default_cache = ExportCache(os.path.join(os.path.dirname(path), 'cache'))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            full = VideoDataAdapter().load_video_csv(path, 'parity')
+            streamed = VideoDataAdapter().load_video_csv(path, 'parity', chunksize=chunksize)
+    finally:
+        export_cache._default_cache = previous
+    return full, streamed
+
+
+def assert_parity(path, chunksize):
+    full, streamed = load_both(path, chunksize)
+    assert full is not None and streamed is not None
+    pd.testing.assert_frame_equal(streamed, full, check_dtype=False)
+
+
+def test_streaming_matches_full_load():
+    """Daily stats are the same whatever the chunk size"""
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'export.csv')
+        make_export(path)
+        for chunksize in (333, 1000, 5000):
+            assert_parity(path, chunksize)
+    
+    print("✅ Streamed daily stats matched the full load")
+
+
+def test_streaming_matches_full_load_with_mixed_dates():
+    """Mixed DATE PUBLISHED layouts parse the same way in every chunk"""
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'export.csv')
+        make_export(path, mixed_dates=True)
+        for chunksize in (333, 1000):
+            assert_parity(path, chunksize)
+    
+    print("✅ Mixed-format dates streamed identically to the full load")
+
+
+if __name__ == "__main__":
+    test_streaming_matches_full_load()
+    test_streaming_matches_full_load_with_mixed_dates()
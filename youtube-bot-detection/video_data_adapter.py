@@ -7,6 +7,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import re
+from export_cache import read_video_export, clean_video_export
+
+# Columns the daily aggregation needs; streaming reads nothing else
+DAILY_SOURCE_COLUMNS = ['DATE PUBLISHED', 'VIEWS', 'YT LIKES', 'YT COMMENTS', 'ENGAGEMENT RATE']
 
 class VideoDataAdapter:
     """
@@ -17,34 +21,26 @@ class VideoDataAdapter:
         self.video_data = None
         self.daily_stats = None
         
-    def load_video_csv(self, filepath, channel_name):
+    def load_video_csv(self, filepath, channel_name, chunksize=None):
         """
         Load vidIQ video export and convert to daily stats
+        With `chunksize`, the export is streamed in chunks of that many rows and
+        folded into per-day totals (flat memory; video_data is not kept)
         """
         try:
-            # Load video data
-            df = pd.read_csv(filepath)
-            print(f"📹 Loaded {len(df)} videos for {channel_name}")
+            if chunksize:
+                daily_agg, videos = self._stream_daily_totals(filepath, chunksize)
+                print(f"📹 Streamed {videos} videos for {channel_name}")
+                self.video_data = None
+                return self._finalize_daily_stats(daily_agg)
             
-            # Parse date column
-            if 'DATE PUBLISHED' in df.columns:
-                df['DATE PUBLISHED'] = pd.to_datetime(df['DATE PUBLISHED'], format='%d/%m/%Y', errors='coerce')
+            # Load video data (dates and K/M notation like "9.9K" parsed once per export, cached)
+            df = read_video_export(filepath)
+            print(f"📹 Loaded {len(df)} videos for {channel_name}")
             
             # Filter out invalid dates
             df = df.dropna(subset=['DATE PUBLISHED'])
             
-            # Clean numeric columns
-            if 'VIEWS' in df.columns:
-                df['VIEWS'] = pd.to_numeric(df['VIEWS'], errors='coerce').fillna(0)
-            
-            if 'YT LIKES' in df.columns:
-                # Handle K notation (e.g., "9.9K")
-                df['YT LIKES'] = df['YT LIKES'].apply(self._parse_number)
-                
-            if 'YT COMMENTS' in df.columns:
-                # Handle K notation
-                df['YT COMMENTS'] = df['YT COMMENTS'].apply(self._parse_number)
-            
             self.video_data = df
             return self.aggregate_to_daily_stats()
             
@@ -52,32 +48,65 @@ class VideoDataAdapter:
             print(f"❌ Error loading video data: {e}")
             return None
     
-    def _parse_number(self, value):
-        """Parse numbers with K/M notation"""
-        if pd.isna(value):
-            return 0
-        
-        value_str = str(value)
-        
-        # Handle K notation
-        if 'K' in value_str:
-            try:
-                return float(value_str.replace('K', '')) * 1000
-            except:
-                return 0
-        
-        # Handle M notation
-        if 'M' in value_str:
-            try:
-                return float(value_str.replace('M', '')) * 1000000
-            except:
-                return 0
-                
-        # Try direct conversion
-        try:
-            return float(value_str.replace(',', ''))
-        except:
-            return 0
+    def load_snapshot(self, store, channel_name, as_of=None):
+        """
+        Daily stats from a channel rebuilt out of a SnapshotStore as of a date
+        (latest snapshot when None)
+        """
+        df = store.as_of(channel_name, as_of)
+        print(f"📹 Rebuilt {len(df)} videos for {channel_name} as of {as_of or 'latest snapshot'}")
+        
+        # Stored snapshots keep views/likes/comments only
+        if 'ENGAGEMENT RATE' not in df.columns:
+            df['ENGAGEMENT RATE'] = np.nan
+        self.video_data = df.dropna(subset=['DATE PUBLISHED'])
+        return self.aggregate_to_daily_stats()
+    
+    def _stream_daily_totals(self, filepath, chunksize):
+        """
+        Per-day aggregates of an export read `chunksize` rows at a time,
+        keeping only running sums and counts per day
+        clean_video_export parses each value on its own, so the totals match a
+        full load whatever the chunk boundaries
+        """
+        header = pd.read_csv(filepath, nrows=0).columns
+        missing = [col for col in DAILY_SOURCE_COLUMNS if col not in header]
+        if missing:
+            raise KeyError(f"Column(s) {missing} do not exist")
+        
+        reader = pd.read_csv(filepath, usecols=DAILY_SOURCE_COLUMNS, chunksize=chunksize,
+                             dtype={'DATE PUBLISHED': str, 'VIEWS': str, 'YT LIKES': str,
+                                    'YT COMMENTS': str, 'ENGAGEMENT RATE': 'float64'})
+        totals = None
+        videos = 0
+        for chunk in reader:
+            chunk = clean_video_export(chunk).dropna(subset=['DATE PUBLISHED'])
+            videos += len(chunk)
+            grouped = chunk.groupby('DATE PUBLISHED')
+            partial = pd.DataFrame({
+                'views': grouped['VIEWS'].sum(),
+                'videos': grouped['VIEWS'].count(),
+                'likes': grouped['YT LIKES'].sum(),
+                'comments': grouped['YT COMMENTS'].sum(),
+                'engagement': grouped['ENGAGEMENT RATE'].sum(),
+                'engagement_count': grouped['ENGAGEMENT RATE'].count()
+            })
+            totals = partial if totals is None else totals.add(partial, fill_value=0)
+        
+        if totals is None or totals.empty:
+            raise ValueError("no videos with a valid DATE PUBLISHED")
+        
+        totals = totals.sort_index()
+        daily_agg = pd.DataFrame({
+            'Date': totals.index,
+            'Views': totals['views'].to_numpy(),
+            'Avg_Views_Per_Video': (totals['views'] / totals['videos']).to_numpy(),
+            'Videos_Published': totals['videos'].astype('int64').to_numpy(),
+            'Likes': totals['likes'].to_numpy(),
+            'Comments': totals['comments'].to_numpy(),
+            'Avg_Engagement_Rate': (totals['engagement'] / totals['engagement_count'].replace(0, np.nan)).to_numpy()
+        })
+        return daily_agg, videos
     
     def aggregate_to_daily_stats(self):
         """
@@ -98,6 +127,12 @@ class VideoDataAdapter:
         daily_agg.columns = ['Date', 'Views', 'Avg_Views_Per_Video', 'Videos_Published', 
                               'Likes', 'Comments', 'Avg_Engagement_Rate']
         
+        return self._finalize_daily_stats(daily_agg)
+    
+    def _finalize_daily_stats(self, daily_agg):
+        """
+        Cumulative metrics and a gap-free daily index from per-day aggregates
+        """
         # Calculate cumulative metrics
         daily_agg = daily_agg.sort_values('Date')
         daily_agg['Cumulative_Views'] = daily_agg['Views'].cumsum()
@@ -128,35 +163,22 @@ class VideoDataAdapter:
         self.daily_stats = daily_stats
         return daily_stats
     
-    def detect_suspicious_videos(self):
+    def detect_suspicious_videos(self, threshold=3.5, log_space=True, period='M'):
         """
-        Identify videos with suspicious view patterns
+        Identify videos with suspicious view patterns (robust z-scores, highest first)
         """
         if self.video_data is None:
             return []
         
-        suspicious = []
-        
-        # Calculate average views
-        avg_views = self.video_data['VIEWS'].mean()
-        std_views = self.video_data['VIEWS'].std()
-        
-        # Find videos with unusually high views
-        for idx, row in self.video_data.iterrows():
-            views = row['VIEWS']
-            
-            # Check if views are > 3 standard deviations above mean
-            if views > avg_views + (3 * std_views):
-                suspicious.append({
-                    'title': row['TITLE'],
-                    'date': row['DATE PUBLISHED'],
-                    'views': views,
-                    'deviation': (views - avg_views) / std_views,
-                    'engagement_rate': row.get('ENGAGEMENT RATE', 0),
-                    'suspicion_level': 'HIGH' if views > avg_views + (5 * std_views) else 'MEDIUM'
-                })
-        
-        return suspicious
+        scores = robust_video_scores(self.video_data, threshold=threshold, log_space=log_space, period=period)
+        return [{
+            'title': row.title,
+            'date': row.date,
+            'views': row.views,
+            'deviation': row.robust_z,
+            'engagement_rate': row.engagement_rate,
+            'suspicion_level': row.suspicion_level
+        } for row in scores.itertuples()]
     
     def create_bot_detection_format(self):
         """
@@ -177,6 +199,68 @@ class VideoDataAdapter:
         return detection_data
 
 
+def robust_video_scores(videos, threshold=3.5, log_space=True, period='M', channel_col=None,
+                        min_videos=10, high_threshold=5.0):
+    """
+    Vectorized suspicious-video detection over a whole per-video frame
+    
+    Each video's views are compared to the median of its channel (`channel_col`)
+    and upload period (`period`, a pandas frequency such as 'M'; None for all
+    time) with the modified z-score 0.6745 * (x - median) / MAD, in log1p space
+    by default since view counts are heavy-tailed. Groups with fewer than
+    `min_videos` videos use their channel's all-time statistics instead.
+    
+    Returns the videos scoring above `threshold`, highest first, with columns
+    channel (if given), title, date, views, median_views, robust_z,
+    engagement_rate and suspicion_level (MEDIUM, or HIGH above `high_threshold`)
+    """
+    views = videos['VIEWS'].astype(float)
+    x = np.log1p(views.clip(lower=0)) if log_space else views
+    dates = pd.to_datetime(videos['DATE PUBLISHED'], errors='coerce')
+    
+    channel_keys = [videos[channel_col]] if channel_col else [pd.Series(0, index=videos.index)]
+    period_keys = channel_keys + ([dates.dt.to_period(period)] if period else [])
+    
+    def _center_scale(keys):
+        grouped = x.groupby(keys, sort=False, dropna=False)
+        median = grouped.transform('median')
+        deviation = (x - median).abs()
+        by_deviation = deviation.groupby(keys, sort=False, dropna=False)
+        mad = by_deviation.transform('median')
+        # MAD is 0 when over half the group shares one value; fall back to the mean absolute deviation
+        mean_ad = by_deviation.transform('mean')
+        scale = np.where(mad > 0, mad / 0.6745, mean_ad * 1.2533)
+        return median, scale, grouped.transform('size')
+    
+    median, scale, size = _center_scale(period_keys)
+    if period:
+        all_time_median, all_time_scale, _ = _center_scale(channel_keys)
+        small = size < min_videos
+        median = median.where(~small, all_time_median)
+        scale = np.where(small, all_time_scale, scale)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        robust_z = np.where(scale > 0, (x - median) / scale, 0.0)
+    
+    flagged = np.flatnonzero(robust_z > threshold)
+    flagged = flagged[np.argsort(-robust_z[flagged], kind='stable')]
+    
+    result = pd.DataFrame(index=videos.index[flagged])
+    if channel_col:
+        result['channel'] = videos[channel_col].to_numpy()[flagged]
+    result['title'] = videos['TITLE'].to_numpy()[flagged] if 'TITLE' in videos.columns else None
+    result['date'] = dates.to_numpy()[flagged]
+    result['views'] = views.to_numpy()[flagged]
+    center = median.to_numpy()[flagged]
+    result['median_views'] = np.expm1(center) if log_space else center
+    result['robust_z'] = robust_z[flagged]
+    engagement = videos['ENGAGEMENT RATE'] if 'ENGAGEMENT RATE' in videos.columns else pd.Series(np.nan, index=videos.index)
+    result['engagement_rate'] = engagement.to_numpy(dtype=float)[flagged]
+    result['suspicion_level'] = pd.Categorical(
+        np.where(result['robust_z'] > high_threshold, 'HIGH', 'MEDIUM'), categories=['MEDIUM', 'HIGH'])
+    return result
+
+
 def convert_video_data_for_analysis(video_csv_path, channel_name):
     """
     Main function to convert video data for bot analysis
@@ -198,7 +282,7 @@ def convert_video_data_for_analysis(video_csv_path, channel_name):
             print(f"\n⚠️ Found {len(suspicious)} suspicious videos:")
             for video in suspicious[:5]:  # Show top 5
                 print(f"  • {video['title'][:50]}...")
-                print(f"    Views: {video['views']:,.0f} (Deviation: {video['deviation']:.1f}σ)")
+                print(f"    Views: {video['views']:,.0f} (Robust z: {video['deviation']:.1f})")
         
         # Return formatted data for bot detection
         return adapter.create_bot_detection_format()